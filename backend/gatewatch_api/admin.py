@@ -22,8 +22,8 @@ class DetectionLogAdmin(admin.ModelAdmin):
 
 @admin.register(Camera)
 class CameraAdmin(admin.ModelAdmin):
-    list_display = ('name', 'location', 'is_active', 'is_streaming', 'last_streamed_at')
-    list_filter = ('is_active', 'is_streaming')
+    list_display = ('name', 'location', 'is_active', 'is_streaming', 'motion_gate_enabled', 'tiled_inference', 'cascade_enabled', 'input_size', 'last_streamed_at')
+    list_filter = ('is_active', 'is_streaming', 'motion_gate_enabled', 'tiled_inference', 'cascade_enabled', 'auto_input_size', 'decode_mode')
     search_fields = ('name', 'location')
 
 @admin.register(ViolationSnapshot)
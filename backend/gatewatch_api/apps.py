@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class GatewatchApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gatewatch_api'
+
+    def ready(self):
+        # Running camera pipelines reload a camera's config only when it is saved or deleted
+        from django.db.models.signals import post_delete, post_save
+        from .camera_config import camera_changed
+        from .models import Camera
+        post_save.connect(camera_changed, sender=Camera, dispatch_uid='camera-config-saved')
+        post_delete.connect(camera_changed, sender=Camera, dispatch_uid='camera-config-deleted')
+
+        # Load and warm up the detection model at startup (YOLO_PRELOAD setting)
+        from .warmup import start_warmup
+        start_warmup()
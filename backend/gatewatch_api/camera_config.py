@@ -0,0 +1,71 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+
+_notifier = None
+_notifier_lock = threading.Lock()
+
+
+def get_camera_notifier():
+    """Process-wide ChangeNotifier for camera configs (its watcher starts on first use)"""
+    global _notifier
+    if _notifier is None:
+        with _notifier_lock:
+            if _notifier is None:
+                from ml_models.change_notify import ChangeNotifier
+                directory = getattr(settings, 'CAMERA_CONFIG_DIR', None) or str(Path(tempfile.gettempdir()) / 'gatewatch-camera-config')
+                notifier = ChangeNotifier(directory, poll_interval=getattr(settings, 'CAMERA_CONFIG_POLL_SECONDS', 1.0))
+                notifier.start()
+                _notifier = notifier
+    return _notifier
+
+
+def camera_changed(sender, instance, using=None, **kwargs):
+    """
+    post_save/post_delete receiver: running pipelines reload the camera's
+    config. Notified once the transaction commits, so a pipeline in another
+    process never reloads the row before the change is visible.
+    """
+    camera_id = instance.pk  # Cleared on the instance once a delete finishes
+    transaction.on_commit(lambda: get_camera_notifier().notify(camera_id), using=using)
+
+
+class CachedCamera:
+    """
+    A Camera kept current for a long-running loop without querying per frame:
+    refresh() reloads it only when its version changed (a save or delete in
+    any process) or, as a fallback for writes that skip signals such as
+    queryset.update(), every max_age seconds.
+    """
+    def __init__(self, camera, notifier=None, max_age=None, clock=time.monotonic):
+        self.camera = camera
+        self.notifier = notifier or get_camera_notifier()
+        self.max_age = getattr(settings, 'CAMERA_CONFIG_REFRESH_SECONDS', 60.0) if max_age is None else max_age
+        self.clock = clock
+        self.deleted = False
+        self.refreshes = 0
+        self._version = self.notifier.version(camera.pk)
+        self._loaded_at = clock()
+
+    def refresh(self):
+        """Reload the camera if it changed; returns True if it was reloaded"""
+        version = self.notifier.version(self.camera.pk)
+        if version == self._version and (not self.max_age or self.clock() - self._loaded_at < self.max_age):
+            return False
+        # Version read first: a change during the reload triggers another one
+        self._version = version
+        self._loaded_at = self.clock()
+        try:
+            self.camera.refresh_from_db()
+        except self.camera.DoesNotExist:
+            self.deleted = True
+        self.refreshes += 1
+        return True
+
+    @property
+    def is_active(self):
+        return not self.deleted and self.camera.is_active
@@ -0,0 +1,117 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from pathlib import Path
+import time
+import cv2
+import numpy as np
+
+
+class Command(BaseCommand):
+    help = 'Compare the eager PyTorch detector with its ahead-of-time compiled CPU variant on the same frames'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weights', default=str(settings.BASE_DIR / 'best.pt'), help='Detector weights')
+        parser.add_argument('--mode', default=getattr(settings, 'YOLO_COMPILE', 'none'), choices=['torchscript', 'inductor'],
+                            help='Compiled variant to benchmark (default: YOLO_COMPILE)')
+        parser.add_argument('--bf16', action='store_true', help='Add bf16 autocast (only used on CPUs with native bf16)')
+        parser.add_argument('--images', default=str(Path(settings.MEDIA_ROOT) / 'violations'), help='Folder of real gate frames')
+        parser.add_argument('--max-images', type=int, default=64, help='Max number of frames to use')
+        parser.add_argument('--imgsz', type=int, default=416, help='Model input size')
+        parser.add_argument('--batch', type=int, default=getattr(settings, 'YOLO_BATCH_MAX_SIZE', 8), help='Frames per predict call')
+        parser.add_argument('--runs', type=int, default=3, help='Timed passes over the frames')
+
+    def handle(self, *args, **options):
+        from ml_models.backends import load_detector
+        from ml_models.quantization import mean_average_precision
+
+        weights = Path(options['weights'])
+        if not weights.exists():
+            self.stdout.write(self.style.ERROR(f"❌ Weights not found: {weights}"))
+            return
+        if options['mode'] not in ('torchscript', 'inductor'):
+            self.stdout.write(self.style.ERROR("❌ Pass --mode torchscript or --mode inductor (or set YOLO_COMPILE)"))
+            return
+
+        frames = self.load_frames(options)
+        self.stdout.write(f"{len(frames)} frames at {options['imgsz']}x{options['imgsz']}, batch {options['batch']}, "
+                          f"{options['runs']} timed passes\n")
+
+        try:
+            eager = load_detector(weights, backend='torch')
+            started = time.perf_counter()
+            compiled = load_detector(weights, backend='torch', compile_mode=options['mode'],
+                                     precision='bf16' if options['bf16'] else 'fp32')
+            # First calls trace/compile (or load the cached artifact) for each batch shape used below
+            self.run(compiled, frames, options, runs=1)
+            startup_s = time.perf_counter() - started
+            self.stdout.write(f"Compiled variant ready in {startup_s:.1f}s (fast when the on-disk cache was reused)")
+
+            self.run(eager, frames, options, runs=1)
+            eager_run = self.run(eager, frames, options, runs=options['runs'])
+            compiled_run = self.run(compiled, frames, options, runs=options['runs'])
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"❌ Error: {str(e)}"))
+            import traceback
+            traceback.print_exc()
+            return
+
+        self.stdout.write("")
+        self.stdout.write(f"{'':<14}{'frames/s':>10}{'batch p50 ms':>14}{'batch p95 ms':>14}")
+        for name, run in (('eager', eager_run), (options['mode'], compiled_run)):
+            self.stdout.write(f"{name:<14}{run['fps']:>10.1f}{run['p50_ms']:>14.1f}{run['p95_ms']:>14.1f}")
+
+        # Same frames, so the eager detections serve as reference for the compiled ones
+        references = [(boxes, classes) for boxes, _, classes in eager_run['detections']]
+        if any(len(classes) for _, classes in references):
+            agreement = mean_average_precision(compiled_run['detections'], references)
+            self.stdout.write(f"\nAgreement with eager (mAP@0.5): {agreement}")
+
+        if eager_run['fps'] > 0:
+            speedup = compiled_run['fps'] / eager_run['fps']
+            style = self.style.SUCCESS if speedup >= 1.0 else self.style.WARNING
+            self.stdout.write(style(f"Throughput of {options['mode']} variant: {speedup:.2f}x"))
+            if speedup >= 1.0:
+                self.stdout.write(f"\nTo use it set YOLO_COMPILE={options['mode']}" + (" and YOLO_PRECISION=bf16" if options['bf16'] else ""))
+
+    def load_frames(self, options):
+        """Real gate frames if available (so detections can be compared), random frames otherwise"""
+        from ml_models.quantization import list_calibration_images
+
+        size = (options['imgsz'], options['imgsz'])
+        frames = []
+        for path in list_calibration_images(options['images'], limit=options['max_images']):
+            image = cv2.imread(str(path))
+            if image is not None:
+                frames.append(cv2.resize(image, size))
+        if not frames:
+            self.stdout.write(self.style.WARNING(f"No frames found in {options['images']}, using random frames"))
+            rng = np.random.default_rng(0)
+            frames = [rng.integers(0, 256, size + (3,), dtype=np.uint8) for _ in range(options['max_images'])]
+        return frames
+
+    def run(self, model, frames, options, runs):
+        batch = max(1, options['batch'])
+        latencies = []
+        detections = []
+        started = time.perf_counter()
+        for _ in range(runs):
+            detections = []
+            for i in range(0, len(frames), batch):
+                call_started = time.perf_counter()
+                results = model(frames[i:i + batch], imgsz=options['imgsz'], conf=0.4, verbose=False)
+                latencies.append(time.perf_counter() - call_started)
+                for result in results:
+                    detections.append((
+                        result.boxes.xyxy.cpu().numpy(),
+                        result.boxes.conf.cpu().numpy(),
+                        result.boxes.cls.cpu().numpy().astype(int),
+                    ))
+        elapsed = time.perf_counter() - started
+
+        latencies_ms = np.array(latencies) * 1000.0
+        return {
+            'fps': len(frames) * runs / elapsed,
+            'p50_ms': float(np.percentile(latencies_ms, 50)),
+            'p95_ms': float(np.percentile(latencies_ms, 95)),
+            'detections': detections,
+        }
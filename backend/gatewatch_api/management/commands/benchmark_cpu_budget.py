@@ -0,0 +1,112 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from pathlib import Path
+import threading
+import time
+import cv2
+import numpy as np
+
+
+class Command(BaseCommand):
+    help = 'Measure multi-camera detection throughput with default thread pools vs the CPU core budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weights', default=str(settings.BASE_DIR / 'best.pt'), help='Detector weights')
+        parser.add_argument('--cameras', type=int, default=6, help='Number of simulated camera streams')
+        parser.add_argument('--seconds', type=float, default=20.0, help='Duration of each run')
+        parser.add_argument('--width', type=int, default=1280, help='Simulated camera frame width')
+        parser.add_argument('--height', type=int, default=720, help='Simulated camera frame height')
+
+    def handle(self, *args, **options):
+        from ml_models.backends import load_detector
+        from ml_models.cpu_budget import CoreBudget, limit_library_threads
+
+        weights = Path(options['weights'])
+        if not weights.exists():
+            self.stdout.write(self.style.ERROR(f"❌ Weights not found: {weights}"))
+            return
+
+        model = load_detector(weights, backend=getattr(settings, 'YOLO_BACKEND', 'torch'))
+        model(np.zeros((416, 416, 3), dtype=np.uint8), verbose=False)
+
+        self.stdout.write(f"Simulating {options['cameras']} cameras at {options['width']}x{options['height']} "
+                          f"for {options['seconds']:.0f}s per run\n")
+
+        # 1. Library defaults: every pool sized to the whole machine, nothing pinned
+        default_run = self.run_streams(model, None, options)
+
+        # 2. Core budget from the current settings
+        budget = CoreBudget(
+            inference_pools=1,
+            camera_slots=getattr(settings, 'CPU_BUDGET_CAMERAS', 4),
+            reserved=getattr(settings, 'CPU_BUDGET_RESERVED_CORES', 1),
+            inference_share=getattr(settings, 'CPU_BUDGET_INFERENCE_SHARE', 0.5),
+        )
+        for line in budget.report():
+            self.stdout.write(f"  {line}")
+        limit_library_threads(len(budget.inference_cores(0)))
+        budget_run = self.run_streams(model, budget, options)
+
+        self.stdout.write("")
+        self.stdout.write(f"{'':<10}{'frames/s':>10}{'det p50 ms':>12}{'det p95 ms':>12}")
+        for name, run in (('default', default_run), ('budget', budget_run)):
+            self.stdout.write(f"{name:<10}{run['fps']:>10.1f}{run['p50_ms']:>12.1f}{run['p95_ms']:>12.1f}")
+
+        if default_run['fps'] > 0:
+            speedup = budget_run['fps'] / default_run['fps']
+            style = self.style.SUCCESS if speedup >= 1.0 else self.style.WARNING
+            self.stdout.write(style(f"\nThroughput with core budget: {speedup:.2f}x"))
+
+    def run_streams(self, model, budget, options):
+        """Run the per-stream work (resize, batched detection, JPEG encode) on N threads"""
+        from ml_models.batching import BatchInferenceScheduler
+        from ml_models.cpu_budget import pin_current_thread
+        from ml_models.preprocess import FramePreprocessor
+
+        scheduler = BatchInferenceScheduler(
+            model,
+            max_batch_size=getattr(settings, 'YOLO_BATCH_MAX_SIZE', 8),
+            max_wait=getattr(settings, 'YOLO_BATCH_MAX_WAIT_MS', 15) / 1000.0,
+            thread_initializer=(lambda index: pin_current_thread(budget.inference_cores(0))) if budget else None,
+            conf=0.4,
+            verbose=False,
+        )
+        deadline = time.monotonic() + options['seconds']
+        frames = [0] * options['cameras']
+        latencies = []
+        latencies_lock = threading.Lock()
+
+        def stream(index):
+            if budget is not None:
+                pin_current_thread(budget.next_stream_cores())
+            rng = np.random.default_rng(index)
+            frame = rng.integers(0, 256, (options['height'], options['width'], 3), dtype=np.uint8)
+            preprocessor = FramePreprocessor(display_size=(800, 450), detection_size=(416, 416))
+            scheduler.register(index)
+            while time.monotonic() < deadline:
+                display_frame = preprocessor.display(frame)
+                detection_frame, _ = preprocessor.detection(frame)
+                started = time.perf_counter()
+                scheduler.predict(index, detection_frame)
+                elapsed = time.perf_counter() - started
+                cv2.imencode('.jpg', display_frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                frames[index] += 1
+                with latencies_lock:
+                    latencies.append(elapsed)
+            scheduler.unregister(index)
+
+        threads = [threading.Thread(target=stream, args=(i,), daemon=True) for i in range(options['cameras'])]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        scheduler.stop()
+
+        latencies_ms = np.array(latencies) * 1000.0 if latencies else np.zeros(1)
+        return {
+            'fps': sum(frames) / elapsed,
+            'p50_ms': float(np.percentile(latencies_ms, 50)),
+            'p95_ms': float(np.percentile(latencies_ms, 95)),
+        }
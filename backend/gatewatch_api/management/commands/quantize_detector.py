@@ -0,0 +1,110 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from pathlib import Path
+import json
+import cv2
+
+
+class Command(BaseCommand):
+    help = ('Build an INT8-quantized uniform detector calibrated on gate footage and compare it with FP32 '
+            '(requires the onnx and onnxruntime packages)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weights', default=str(settings.BASE_DIR / 'best.pt'), help='FP32 weights to quantize')
+        parser.add_argument('--images', default=str(Path(settings.MEDIA_ROOT) / 'violations'), help='Folder of real gate frames used for calibration')
+        parser.add_argument('--max-images', type=int, default=300, help='Max number of frames to use')
+        parser.add_argument('--imgsz', type=int, default=416, help='Inference size the detector is served at (export, calibration and scoring)')
+        parser.add_argument('--data', default=None, help='Optional labelled dataset YAML; enables true mAP via ultralytics val')
+        parser.add_argument('--force', action='store_true', help='Rebuild even if the INT8 model already exists')
+
+    def handle(self, *args, **options):
+        from ml_models.backends import export_weights, load_detector, measure_latency, quantized_artifact_path
+        from ml_models.quantization import list_calibration_images, mean_average_precision, quantize_onnx_model
+
+        weights = Path(options['weights'])
+        if not weights.exists():
+            raise CommandError(f"Weights not found: {weights}")
+
+        images = list_calibration_images(options['images'], limit=options['max_images'])
+        if not images:
+            raise CommandError(f"No calibration images found in {options['images']}")
+
+        imgsz = options['imgsz']
+        # Hold out every 4th frame for evaluation so calibration and scoring don't share frames
+        eval_images = images[::4] if len(images) >= 8 else images
+        calib_images = [p for p in images if p not in eval_images] or images
+        self.stdout.write(f"Calibration frames: {len(calib_images)} | Evaluation frames: {len(eval_images)}")
+
+        try:
+            fp32_path = export_weights(weights, 'onnxruntime', imgsz=imgsz)
+            int8_path = quantized_artifact_path(weights)
+
+            if int8_path.exists() and not options['force']:
+                self.stdout.write(f"INT8 model already exists: {int8_path} (use --force to rebuild)")
+            else:
+                self.stdout.write("Quantizing to INT8 (static, per-channel QDQ)...")
+                quantize_onnx_model(fp32_path, int8_path, calib_images, frame_size=416, imgsz=imgsz)
+                self.stdout.write(self.style.SUCCESS(f"✅ INT8 model written to: {int8_path}"))
+
+            fp32_model = load_detector(weights, backend='onnxruntime', imgsz=imgsz)
+            int8_model = load_detector(weights, backend='onnxruntime', imgsz=imgsz, precision='int8')
+
+            report = {
+                'weights': str(weights),
+                'fp32_model': str(fp32_path),
+                'int8_model': str(int8_path),
+                'calibration_images': len(calib_images),
+                'evaluation_images': len(eval_images),
+                'imgsz': imgsz,
+                'fp32_latency_ms': round(measure_latency(fp32_model, runs=20, imgsz=imgsz), 2),
+                'int8_latency_ms': round(measure_latency(int8_model, runs=20, imgsz=imgsz), 2),
+            }
+            report['speedup'] = round(report['fp32_latency_ms'] / max(report['int8_latency_ms'], 1e-6), 2)
+
+            if options['data']:
+                # Ground-truth mAP on a labelled dataset
+                for name, model in (('fp32', fp32_model), ('int8', int8_model)):
+                    metrics = model.val(data=options['data'], imgsz=imgsz, verbose=False)
+                    report[f'{name}_map50'] = round(float(metrics.box.map50), 4)
+                    report[f'{name}_map50_95'] = round(float(metrics.box.map), 4)
+                report['map_reference'] = options['data']
+            else:
+                # Violation frames are unlabelled: there is no true mAP, only how well
+                # INT8 reproduces the FP32 detections (mAP@0.5 with FP32 as reference)
+                fp32_detections = self._detect(fp32_model, eval_images, imgsz)
+                int8_detections = self._detect(int8_model, eval_images, imgsz)
+                references = [(boxes, classes) for boxes, _, classes in fp32_detections]
+                report['int8_fp32_agreement_map50'] = mean_average_precision(int8_detections, references)
+
+            report_path = int8_path.with_name(f"{int8_path.stem}.report.json")
+            report_path.write_text(json.dumps(report, indent=2))
+
+            self.stdout.write(self.style.SUCCESS(f"\n🎉 Quantization report ({report_path})"))
+            self.stdout.write(f"FP32 latency: {report['fp32_latency_ms']} ms/frame")
+            self.stdout.write(f"INT8 latency: {report['int8_latency_ms']} ms/frame ({report['speedup']}x)")
+            if options['data']:
+                self.stdout.write(f"FP32 mAP@0.5: {report['fp32_map50']} | INT8 mAP@0.5: {report['int8_map50']} "
+                                  f"({report['map_reference']})")
+            else:
+                self.stdout.write(f"INT8 vs FP32 agreement (mAP@0.5 against FP32 detections, not ground truth): "
+                                  f"{report['int8_fp32_agreement_map50']}")
+                self.stdout.write("Pass --data with a labelled dataset YAML for true mAP")
+            self.stdout.write("\nTo use it set YOLO_BACKEND=onnxruntime and YOLO_PRECISION=int8")
+
+        except Exception as e:
+            raise CommandError(f"Quantization failed: {str(e)}") from e
+
+    def _detect(self, model, image_paths, imgsz):
+        """Run the model the way the stream does (416x416 frame at imgsz) and collect boxes/scores/classes"""
+        detections = []
+        for path in image_paths:
+            image = cv2.imread(str(path))
+            if image is None:
+                continue
+            result = model(cv2.resize(image, (416, 416)), conf=0.4, imgsz=imgsz, verbose=False)[0]
+            detections.append((
+                result.boxes.xyxy.cpu().numpy(),
+                result.boxes.conf.cpu().numpy(),
+                result.boxes.cls.cpu().numpy().astype(int),
+            ))
+        return detections
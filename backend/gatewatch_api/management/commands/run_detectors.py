@@ -0,0 +1,101 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+import signal
+import threading
+import time
+
+
+class Command(BaseCommand):
+    help = 'Run detection for every active camera continuously, whether or not anyone is watching'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cameras', type=int, nargs='*', help='Only these camera ids (default: every active camera)')
+        parser.add_argument('--refresh', type=float, default=30.0, help='Seconds between checks for added/deactivated cameras')
+        parser.add_argument('--restart-delay', type=float, default=5.0, help='Seconds before restarting a pipeline that ended')
+
+    def handle(self, *args, **options):
+        from ml_models.frame_exchange import FrameFileWriter
+        from ml_models.camera_health import write_health_file
+        from gatewatch_api.models import Camera
+        from gatewatch_api.views import (_camera_health, _capture_hubs, detection_pipeline, detector_health_path,
+                                         detector_output_dir)
+
+        output_dir = detector_output_dir()
+        health_path = detector_health_path()
+        health_path.parent.mkdir(parents=True, exist_ok=True)
+        stop = threading.Event()
+        workers = {}      # camera id -> thread publishing that camera's frames
+        restart_at = {}   # camera id -> earliest restart time after the pipeline ended
+
+        def publish(camera):
+            """Keep the camera's pipeline subscribed and hand its frames to the web server"""
+            writer = FrameFileWriter(output_dir, camera.id)
+            try:
+                subscription = _capture_hubs.subscribe(camera.id, lambda: detection_pipeline(camera))
+                for part in subscription:
+                    writer.publish(part)
+                    if stop.is_set():
+                        break
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"[DETECTORS] Camera {camera.id} pipeline error: {str(e)}"))
+            finally:
+                writer.close()
+                close_old_connections()
+
+        def on_signal(signum, frame):
+            stop.set()
+
+        signal.signal(signal.SIGTERM, on_signal)
+        signal.signal(signal.SIGINT, on_signal)
+
+        self.stdout.write(f"[DETECTORS] Publishing frames to {output_dir}")
+        cameras = {}
+        next_refresh = 0.0
+        try:
+            while not stop.is_set():
+                now = time.monotonic()
+                if now >= next_refresh:
+                    queryset = Camera.objects.filter(is_active=True)
+                    if options['cameras']:
+                        queryset = queryset.filter(id__in=options['cameras'])
+                    cameras = {camera.id: camera for camera in queryset}
+                    close_old_connections()
+                    next_refresh = now + options['refresh']
+
+                for camera_id, camera in cameras.items():
+                    worker = workers.get(camera_id)
+                    if worker is not None and worker.is_alive():
+                        continue
+                    if worker is not None:
+                        # Pipeline ended (camera unreachable, read timeout, error): retry later
+                        self.stdout.write(self.style.WARNING(f"[DETECTORS] Camera {camera_id} pipeline ended, restarting in {options['restart_delay']:.0f}s"))
+                        restart_at[camera_id] = now + options['restart_delay']
+                        workers.pop(camera_id)
+                        # It may have ended because the camera was deactivated: re-read the list first
+                        next_refresh = 0.0
+                    if now < restart_at.get(camera_id, 0):
+                        continue
+                    self.stdout.write(f"[DETECTORS] Starting camera {camera_id}: {camera.name}")
+                    worker = threading.Thread(target=publish, args=(camera,), name=f"detector-{camera_id}", daemon=True)
+                    workers[camera_id] = worker
+                    worker.start()
+
+                for camera_id in list(workers):
+                    if camera_id not in cameras:
+                        self.stdout.write(f"[DETECTORS] Camera {camera_id} deactivated, stopping")
+                        _capture_hubs.stop(camera_id)
+                        workers.pop(camera_id)
+
+                # Connection health (connecting/live/degraded/down) for the web server's API
+                write_health_file(health_path, _camera_health.status())
+                
+                # Pipelines are checked every second; the camera list every refresh period
+                stop.wait(1.0)
+        finally:
+            self.stdout.write("[DETECTORS] Stopping all pipelines...")
+            for camera_id in list(workers):
+                _capture_hubs.stop(camera_id)
+            for worker in workers.values():
+                worker.join(timeout=5)
+            health_path.unlink(missing_ok=True)
+            self.stdout.write(self.style.SUCCESS("[DETECTORS] Stopped"))
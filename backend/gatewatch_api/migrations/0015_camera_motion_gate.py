@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatewatch_api', '0014_warning'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='camera',
+            name='motion_gate_enabled',
+            field=models.BooleanField(default=True, help_text='Skip detection while the scene is static'),
+        ),
+        migrations.AddField(
+            model_name='camera',
+            name='motion_sensitivity',
+            field=models.FloatField(default=0.5, help_text='Motion gate sensitivity (0-1, higher wakes detection on smaller movements)'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatewatch_api', '0015_camera_motion_gate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='camera',
+            name='roi_polygon',
+            field=models.JSONField(blank=True, help_text='Region of interest as [[x, y], ...] in normalized 0-1 frame coordinates', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatewatch_api', '0016_camera_roi_polygon'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='camera',
+            name='tiled_inference',
+            field=models.BooleanField(default=False, help_text='Detect on overlapping high-resolution tiles (for distant subjects on high-resolution cameras)'),
+        ),
+    ]
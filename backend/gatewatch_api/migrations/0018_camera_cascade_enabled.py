@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatewatch_api', '0017_camera_tiled_inference'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='camera',
+            name='cascade_enabled',
+            field=models.BooleanField(default=False, help_text='Detect people with a small person model and classify compliance only on new tracks'),
+        ),
+    ]
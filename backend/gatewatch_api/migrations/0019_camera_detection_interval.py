@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatewatch_api', '0018_camera_cascade_enabled'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='camera',
+            name='detection_interval',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Run detection on 1 of every N frames (tracks are predicted in between); empty adapts to load', null=True),
+        ),
+    ]
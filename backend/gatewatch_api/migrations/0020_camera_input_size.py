@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-17 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatewatch_api', '0019_camera_detection_interval'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='camera',
+            name='input_size',
+            field=models.PositiveSmallIntegerField(choices=[(320, '320x320'), (416, '416x416'), (512, '512x512'), (640, '640x640')], default=416, help_text='Model input size for this camera (set by the auto-tuner when auto_input_size is on)'),
+        ),
+        migrations.AddField(
+            model_name='camera',
+            name='auto_input_size',
+            field=models.BooleanField(default=True, help_text='Periodically pick the smallest input size that keeps people detectable'),
+        ),
+        migrations.AddField(
+            model_name='camera',
+            name='input_size_tuned_at',
+            field=models.DateTimeField(blank=True, help_text='When the auto-tuner last chose the input size', null=True),
+        ),
+    ]
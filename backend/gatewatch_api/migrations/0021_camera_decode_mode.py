@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatewatch_api', '0020_camera_input_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='camera',
+            name='decode_mode',
+            field=models.CharField(choices=[('full', 'Full (every frame)'), ('auto', 'Auto (keyframes only while idle)'), ('low_power', 'Low power (keyframes only)')], default='full', help_text='Decode every frame, only keyframes, or only keyframes while nothing moves (auto)', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='camera',
+            name='decode_schedule',
+            field=models.JSONField(blank=True, help_text='Windows that force a decode mode, e.g. [{"start": "18:00", "end": "06:00", "mode": "low_power", "days": [0, 1, 2, 3, 4]}]', null=True),
+        ),
+    ]
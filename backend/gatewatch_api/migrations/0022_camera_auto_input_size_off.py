@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+
+def disable_untuned_auto_input_size(apps, schema_editor):
+    # 0020 turned tuning on for every existing camera; keep it only where a round already finished
+    Camera = apps.get_model('gatewatch_api', 'Camera')
+    Camera.objects.filter(auto_input_size=True, input_size_tuned_at__isnull=True).update(auto_input_size=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatewatch_api', '0021_camera_decode_mode'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='camera',
+            name='auto_input_size',
+            field=models.BooleanField(default=False, help_text='Periodically pick the smallest input size that keeps people detectable'),
+        ),
+        migrations.RunPython(disable_untuned_auto_input_size, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:15
+
+from django.db import migrations, models
+
+
+def disable_motion_gate(apps, schema_editor):
+    # 0015 turned gating on for every existing camera; people who stand still get
+    # missed under it, so cameras keep detecting until an operator opts in
+    Camera = apps.get_model('gatewatch_api', 'Camera')
+    Camera.objects.filter(motion_gate_enabled=True).update(motion_gate_enabled=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatewatch_api', '0022_camera_auto_input_size_off'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='camera',
+            name='motion_gate_enabled',
+            field=models.BooleanField(default=False, help_text='Skip detection while the scene is static (people standing still are missed once the hold runs out)'),
+        ),
+        migrations.RunPython(disable_motion_gate, migrations.RunPython.noop),
+    ]
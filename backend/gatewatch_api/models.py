@@ -53,6 +53,18 @@ class Camera(models.Model):
     """
     Model to store camera information for the surveillance system
     """
+    INPUT_SIZE_CHOICES = (
+        (320, '320x320'),
+        (416, '416x416'),
+        (512, '512x512'),
+        (640, '640x640'),
+    )
+    DECODE_MODE_CHOICES = (
+        ('full', 'Full (every frame)'),
+        ('auto', 'Auto (keyframes only while idle)'),
+        ('low_power', 'Low power (keyframes only)'),
+    )
+    
     name = models.CharField(max_length=100, help_text="Name for the camera")
     location = models.CharField(max_length=200, blank=True, null=True, help_text="Physical location of the camera")
     stream_url = models.CharField(max_length=500, help_text="RTSP URL or device index (e.g., rtsp://... or 0, 1, 2)")
@@ -60,6 +72,17 @@ class Camera(models.Model):
     is_streaming = models.BooleanField(default=False, help_text="Whether the camera is currently being streamed by security")
     last_streamed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='streamed_cameras', help_text="User who last started this stream")
     last_streamed_at = models.DateTimeField(null=True, blank=True, help_text="When the stream was last started")
+    motion_gate_enabled = models.BooleanField(default=False, help_text="Skip detection while the scene is static (people standing still are missed once the hold runs out)")
+    motion_sensitivity = models.FloatField(default=0.5, help_text="Motion gate sensitivity (0-1, higher wakes detection on smaller movements)")
+    roi_polygon = models.JSONField(blank=True, null=True, help_text="Region of interest as [[x, y], ...] in normalized 0-1 frame coordinates")
+    tiled_inference = models.BooleanField(default=False, help_text="Detect on overlapping high-resolution tiles (for distant subjects on high-resolution cameras)")
+    detection_interval = models.PositiveSmallIntegerField(blank=True, null=True, help_text="Run detection on 1 of every N frames (tracks are predicted in between); empty adapts to load")
+    cascade_enabled = models.BooleanField(default=False, help_text="Detect people with a small person model and classify compliance only on new tracks")
+    input_size = models.PositiveSmallIntegerField(choices=INPUT_SIZE_CHOICES, default=416, help_text="Model input size for this camera (set by the auto-tuner when auto_input_size is on)")
+    auto_input_size = models.BooleanField(default=False, help_text="Periodically pick the smallest input size that keeps people detectable")
+    input_size_tuned_at = models.DateTimeField(null=True, blank=True, help_text="When the auto-tuner last chose the input size")
+    decode_mode = models.CharField(max_length=10, choices=DECODE_MODE_CHOICES, default='full', help_text="Decode every frame, only keyframes, or only keyframes while nothing moves (auto)")
+    decode_schedule = models.JSONField(blank=True, null=True, help_text='Windows that force a decode mode, e.g. [{"start": "18:00", "end": "06:00", "mode": "low_power", "days": [0, 1, 2, 3, 4]}]')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -57,8 +57,8 @@ class CameraSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Camera
-        fields = ('id', 'name', 'location', 'stream_url', 'is_active', 'is_streaming', 'last_streamed_by', 'last_streamed_by_username', 'last_streamed_at', 'created_at', 'updated_at')
-        read_only_fields = ('id', 'is_streaming', 'last_streamed_by', 'last_streamed_at', 'created_at', 'updated_at')
+        fields = ('id', 'name', 'location', 'stream_url', 'is_active', 'is_streaming', 'last_streamed_by', 'last_streamed_by_username', 'last_streamed_at', 'motion_gate_enabled', 'motion_sensitivity', 'roi_polygon', 'tiled_inference', 'cascade_enabled', 'detection_interval', 'input_size', 'auto_input_size', 'input_size_tuned_at', 'decode_mode', 'decode_schedule', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'is_streaming', 'last_streamed_by', 'last_streamed_at', 'input_size_tuned_at', 'created_at', 'updated_at')
     
     def get_last_streamed_by_username(self, obj):
         if obj.last_streamed_by:
@@ -114,6 +114,44 @@ class CameraSerializer(serializers.ModelSerializer):
 
         return value
 
+    def validate_motion_sensitivity(self, value):
+        if not 0.0 <= value <= 1.0:
+            raise serializers.ValidationError("Motion sensitivity must be between 0 and 1.")
+        return value
+
+    def validate_detection_interval(self, value):
+        if value is not None and not 1 <= value <= 60:
+            raise serializers.ValidationError("Detection interval must be between 1 and 60 frames.")
+        return value
+
+    def validate_roi_polygon(self, value):
+        """
+        Validate ROI polygon: at least 3 [x, y] points normalized to 0-1
+        """
+        if not value:
+            return None
+
+        from ml_models.roi import RegionOfInterest
+        try:
+            roi = RegionOfInterest(value)
+        except (TypeError, ValueError) as e:
+            raise serializers.ValidationError(str(e))
+        return roi.points.tolist()
+
+    def validate_decode_schedule(self, value):
+        """
+        Validate decode schedule windows: start/end as HH:MM, mode full or low_power, optional weekdays 0-6
+        """
+        if not value:
+            return None
+
+        from ml_models.power_mode import parse_schedule
+        try:
+            parse_schedule(value)
+        except (TypeError, ValueError) as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
 class ViolationSnapshotSerializer(serializers.ModelSerializer):
     camera_name = serializers.CharField(source='camera.name', read_only=True)
     camera_location = serializers.CharField(source='camera.location', read_only=True)
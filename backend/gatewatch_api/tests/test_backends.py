@@ -0,0 +1,31 @@
+import tempfile
+from pathlib import Path
+from django.test import SimpleTestCase
+from ml_models.backends import exported_artifact_path, weights_hash
+
+
+class InferenceBackendTests(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.weights = Path(self.tmpdir.name) / 'best.pt'
+        self.weights.write_bytes(b'weights-v1')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_artifact_is_keyed_by_weights_hash(self):
+        onnx_path = exported_artifact_path(self.weights, 'onnxruntime')
+        self.assertEqual(onnx_path.parent, self.weights.parent)
+        self.assertEqual(onnx_path.name, f"best.{weights_hash(self.weights)}.onnx")
+
+        # New weights must not reuse the previous export
+        self.weights.write_bytes(b'weights-v2')
+        self.assertNotEqual(exported_artifact_path(self.weights, 'onnxruntime'), onnx_path)
+
+    def test_openvino_artifact_is_a_model_directory(self):
+        path = exported_artifact_path(self.weights, 'openvino')
+        self.assertTrue(path.name.endswith('_openvino_model'))
+
+    def test_unknown_backend_rejected(self):
+        with self.assertRaises(ValueError):
+            exported_artifact_path(self.weights, 'tensorrt')
@@ -0,0 +1,109 @@
+import threading
+from django.test import SimpleTestCase
+from ml_models.batching import BatchInferenceScheduler
+
+
+class FakeModel:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, frames, **kwargs):
+        self.batch_sizes.append(len(frames))
+        return [f"result-{frame}" for frame in frames]
+
+
+class BatchInferenceSchedulerTests(SimpleTestCase):
+    def test_frames_from_registered_streams_share_one_batch(self):
+        model = FakeModel()
+        scheduler = BatchInferenceScheduler(model, max_batch_size=8, max_wait=1.0)
+        scheduler.register(1)
+        scheduler.register(2)
+
+        first = scheduler.submit(1, 'a')
+        second = scheduler.submit(2, 'b')
+
+        self.assertEqual(first.result(timeout=2), 'result-a')
+        self.assertEqual(second.result(timeout=2), 'result-b')
+        self.assertEqual(model.batch_sizes, [2])
+        scheduler.stop()
+
+    def test_resubmit_keeps_latest_frame(self):
+        model = FakeModel()
+        scheduler = BatchInferenceScheduler(model, max_batch_size=8, max_wait=1.0)
+        scheduler.register(1)
+        scheduler.register(2)
+
+        # Camera 1 submits twice before camera 2 completes the batch
+        first = scheduler.submit(1, 'old')
+        again = scheduler.submit(1, 'new')
+        scheduler.submit(2, 'b')
+
+        self.assertIs(first, again)
+        self.assertEqual(first.result(timeout=2), 'result-new')
+        scheduler.stop()
+
+    def test_partial_batch_runs_after_max_wait(self):
+        model = FakeModel()
+        scheduler = BatchInferenceScheduler(model, max_batch_size=8, max_wait=0.01)
+        scheduler.register(1)
+        scheduler.register(2)
+
+        self.assertEqual(scheduler.predict(1, 'a', timeout=2), 'result-a')
+        self.assertEqual(model.batch_sizes, [1])
+        scheduler.stop()
+
+    def test_concurrent_dispatchers_run_batches_in_parallel(self):
+        # Both batches must be inside the model at once to pass the barrier
+        barrier = threading.Barrier(2, timeout=2)
+
+        def model(frames, **kwargs):
+            barrier.wait()
+            return [f"result-{frame}" for frame in frames]
+
+        scheduler = BatchInferenceScheduler(model, max_batch_size=1, max_wait=0.0, concurrency=2)
+        first = scheduler.submit(1, 'a')
+        second = scheduler.submit(2, 'b')
+
+        self.assertEqual(first.result(timeout=3), 'result-a')
+        self.assertEqual(second.result(timeout=3), 'result-b')
+        scheduler.stop()
+
+    def test_submit_many_runs_frames_in_one_batch(self):
+        model = FakeModel()
+        scheduler = BatchInferenceScheduler(model, max_batch_size=8, max_wait=1.0)
+        scheduler.register(1)
+        scheduler.register(2)
+
+        tiles = scheduler.submit_many(1, ['t1', 't2', 't3'])
+        single = scheduler.submit(2, 'b')
+
+        self.assertEqual(tiles.result(timeout=2), ['result-t1', 'result-t2', 'result-t3'])
+        self.assertEqual(single.result(timeout=2), 'result-b')
+        self.assertEqual(model.batch_sizes, [4])
+        scheduler.stop()
+
+    def test_swap_model_waits_for_in_flight_batch(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def old_model(frames, **kwargs):
+            started.set()
+            release.wait(timeout=2)
+            return ['old' for _ in frames]
+
+        scheduler = BatchInferenceScheduler(old_model, max_batch_size=1, max_wait=0.0)
+        in_flight = scheduler.submit(1, 'a')
+        started.wait(timeout=2)
+
+        swapped = []
+        swapper = threading.Thread(target=lambda: swapped.append(scheduler.swap_model(FakeModel())))
+        swapper.start()
+        swapper.join(timeout=0.1)
+        self.assertEqual(swapped, [])  # old model still busy
+
+        release.set()
+        swapper.join(timeout=2)
+        self.assertEqual(swapped, [old_model])
+        self.assertEqual(in_flight.result(timeout=2), 'old')
+        self.assertEqual(scheduler.predict(2, 'b', timeout=2), 'result-b')
+        scheduler.stop()
@@ -1,5 +1,6 @@
 from django.test import TestCase
 from gatewatch_api.models import Camera
+from gatewatch_api.camera_config import get_camera_notifier
 
 
 class CameraModelTests(TestCase):
@@ -11,3 +12,20 @@ class CameraModelTests(TestCase):
 
         cameras = Camera.objects.filter(name=name)
         self.assertEqual(cameras.count(), 2)
+
+    def test_saving_or_deleting_a_camera_bumps_its_config_version_on_commit(self):
+        camera = Camera.objects.create(name="Side Gate Camera", stream_url='rtsp://example.com/stream3')
+        notifier = get_camera_notifier()
+        version = notifier.version(camera.pk)
+
+        camera.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            camera.save()
+            # Not before the transaction commits: other processes would reload the old row
+            self.assertEqual(notifier.version(camera.pk), version)
+        self.assertEqual(notifier.version(camera.pk), version + 1)
+
+        camera_id = camera.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            camera.delete()
+        self.assertEqual(notifier.version(camera_id), version + 2)
@@ -0,0 +1,106 @@
+import tempfile
+from django.test import SimpleTestCase
+from ml_models.change_notify import ChangeNotifier
+from gatewatch_api.camera_config import CachedCamera
+
+
+class FakeCamera:
+    class DoesNotExist(Exception):
+        pass
+
+    def __init__(self, pk=1):
+        self.pk = pk
+        self.is_active = True
+        self.stored_active = True
+        self.exists = True
+        self.queries = 0
+
+    def refresh_from_db(self):
+        self.queries += 1
+        if not self.exists:
+            raise self.DoesNotExist()
+        self.is_active = self.stored_active
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ChangeNotifierTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_notify_bumps_the_version_in_this_process(self):
+        notifier = ChangeNotifier(self.directory.name)
+        self.assertEqual(notifier.version(3), 0)
+        notifier.notify(3)
+        self.assertEqual(notifier.version(3), 1)
+        self.assertEqual(notifier.version(4), 0)
+        # Our own marker isn't picked up a second time
+        self.assertEqual(notifier.poll(), [])
+        self.assertEqual(notifier.version(3), 1)
+
+    def test_other_processes_see_the_change_on_their_next_poll(self):
+        web = ChangeNotifier(self.directory.name)
+        daemon = ChangeNotifier(self.directory.name)
+
+        web.notify(3)
+        self.assertEqual(daemon.version(3), 0)
+        self.assertEqual(daemon.poll(), ['3'])
+        self.assertEqual(daemon.version(3), 1)
+
+        web.notify(3)
+        web.notify(3)
+        daemon.poll()
+        self.assertEqual(daemon.version(3), 2)  # Changed since the last poll; how often doesn't matter
+
+    def test_markers_existing_at_startup_are_not_changes(self):
+        ChangeNotifier(self.directory.name).notify(5)
+        notifier = ChangeNotifier(self.directory.name)
+        self.assertEqual(notifier.poll(), [])
+        self.assertEqual(notifier.version(5), 0)
+
+
+class CachedCameraTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.notifier = ChangeNotifier(directory.name)
+        self.clock = FakeClock()
+
+    def test_camera_is_only_reloaded_when_it_changed(self):
+        camera = FakeCamera()
+        cached = CachedCamera(camera, notifier=self.notifier, max_age=60, clock=self.clock)
+        for _ in range(100):
+            self.assertFalse(cached.refresh())
+        self.assertEqual(camera.queries, 0)
+
+        camera.stored_active = False
+        self.notifier.notify(camera.pk)
+        self.assertTrue(cached.refresh())
+        self.assertFalse(cached.is_active)
+        self.assertFalse(cached.refresh())
+        self.assertEqual(camera.queries, 1)
+
+    def test_camera_is_reloaded_after_max_age_anyway(self):
+        camera = FakeCamera()
+        cached = CachedCamera(camera, notifier=self.notifier, max_age=60, clock=self.clock)
+        self.clock.now += 59
+        self.assertFalse(cached.refresh())
+        self.clock.now += 1
+        self.assertTrue(cached.refresh())
+        self.assertEqual(camera.queries, 1)
+
+    def test_deleted_camera_is_inactive(self):
+        camera = FakeCamera()
+        cached = CachedCamera(camera, notifier=self.notifier, max_age=60, clock=self.clock)
+        camera.exists = False
+        self.notifier.notify(camera.pk)
+        cached.refresh()
+        self.assertTrue(cached.deleted)
+        self.assertFalse(cached.is_active)
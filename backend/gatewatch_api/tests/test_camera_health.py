@@ -0,0 +1,142 @@
+import tempfile
+from pathlib import Path
+from django.test import SimpleTestCase
+from ml_models.camera_health import (
+    CONNECTING, DEGRADED, DOWN, LIVE, Backoff, CameraHealthRegistry, CameraSupervisor, read_health_file,
+    write_health_file,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCapture:
+    def __init__(self, opened=True):
+        self.opened = opened
+        self.released = False
+
+    def isOpened(self):
+        return self.opened
+
+    def release(self):
+        self.released = True
+
+
+class BackoffTests(SimpleTestCase):
+    def test_delays_grow_exponentially_up_to_the_cap(self):
+        backoff = Backoff(base=1.0, maximum=10.0, jitter=0.0)
+        self.assertEqual([backoff.next_delay() for _ in range(6)], [1.0, 2.0, 4.0, 8.0, 10.0, 10.0])
+        backoff.reset()
+        self.assertEqual(backoff.next_delay(), 1.0)
+
+    def test_jitter_shortens_each_delay(self):
+        backoff = Backoff(base=4.0, jitter=0.5, rng=lambda: 1.0)
+        self.assertEqual(backoff.next_delay(), 2.0)
+        backoff = Backoff(base=4.0, jitter=0.5, rng=lambda: 0.0)
+        self.assertEqual(backoff.next_delay(), 4.0)
+
+
+class CameraSupervisorTests(SimpleTestCase):
+    def supervisor(self, **kwargs):
+        clock = FakeClock()
+        kwargs.setdefault('backoff', Backoff(base=1.0, maximum=8.0, jitter=0.0))
+        return CameraSupervisor(1, clock=clock, **kwargs), clock
+
+    def test_failed_attempts_back_off_then_go_down(self):
+        supervisor, clock = self.supervisor(down_after_failures=3)
+        capture = FakeCapture(opened=False)
+        delays = []
+        for _ in range(3):
+            self.assertIsNone(supervisor.connect(lambda: capture))
+            delays.append(supervisor.retry_in())
+        self.assertEqual(delays, [1.0, 2.0, 4.0])
+        self.assertTrue(capture.released)
+        self.assertEqual(supervisor.state, DOWN)
+        self.assertEqual(supervisor.failures, 3)
+
+        clock.now += 3.0
+        self.assertEqual(supervisor.retry_in(), 1.0)
+
+    def test_open_errors_are_failed_attempts(self):
+        supervisor, _ = self.supervisor()
+
+        def broken():
+            raise OSError("Connection refused")
+
+        self.assertIsNone(supervisor.connect(broken))
+        self.assertEqual(supervisor.last_error, "Connection refused")
+        self.assertEqual(supervisor.state, CONNECTING)
+
+    def test_first_frame_makes_the_camera_live_and_resets_backoff(self):
+        supervisor, clock = self.supervisor(down_after_failures=2)
+        for _ in range(2):
+            supervisor.connect(lambda: FakeCapture(opened=False))
+        self.assertEqual(supervisor.state, DOWN)
+
+        self.assertIsNotNone(supervisor.connect(lambda: FakeCapture()))
+        self.assertEqual(supervisor.state, DOWN)  # Still down until frames actually arrive
+        supervisor.frame_received(clock.now)
+        self.assertEqual(supervisor.state, LIVE)
+        self.assertEqual(supervisor.last_frame_at, clock.now)
+        self.assertEqual(supervisor.failures, 0)
+        self.assertEqual(supervisor.backoff.attempts, 0)
+
+    def test_late_frames_degrade_then_drop_the_connection(self):
+        supervisor, clock = self.supervisor(degraded_after=3.0, lost_after=10.0)
+        supervisor.connect(lambda: FakeCapture())
+        supervisor.frame_received(clock.now)
+
+        clock.now += 3.0
+        self.assertFalse(supervisor.check_stalled())
+        self.assertEqual(supervisor.state, DEGRADED)
+        clock.now += 7.0
+        self.assertTrue(supervisor.check_stalled())
+
+        supervisor.frame_received(clock.now)
+        self.assertEqual(supervisor.state, LIVE)
+
+    def test_lost_connection_that_delivered_frames_reconnects_at_once(self):
+        supervisor, clock = self.supervisor()
+        supervisor.connect(lambda: FakeCapture())
+        clock.now += 1.0
+        supervisor.frame_received(clock.now)
+
+        supervisor.connection_lost("Failed to read frame")
+        self.assertEqual(supervisor.state, CONNECTING)
+        self.assertEqual(supervisor.retry_in(), 0.0)
+        self.assertEqual(supervisor.reconnects, 1)
+
+    def test_connection_without_frames_counts_as_a_failure(self):
+        supervisor, _ = self.supervisor()
+        supervisor.connect(lambda: FakeCapture())
+        supervisor.connection_lost("Failed to read frame")
+        self.assertEqual(supervisor.failures, 1)
+        self.assertEqual(supervisor.retry_in(), 1.0)
+
+
+class CameraHealthRegistryTests(SimpleTestCase):
+    def test_newer_supervisor_is_not_removed_by_the_old_stream(self):
+        registry = CameraHealthRegistry()
+        old = registry.add(CameraSupervisor(1))
+        new = registry.add(CameraSupervisor(1))
+        registry.remove(old)
+        self.assertIs(registry.get(1), new)
+        self.assertEqual(registry.status()[1]['state'], CONNECTING)
+        registry.remove(new)
+        self.assertEqual(registry.status(), {})
+
+    def test_health_file_round_trip(self):
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'health.json'
+            self.assertEqual(read_health_file(path), {})
+
+            write_health_file(path, {3: {'state': LIVE, 'last_frame_at': 999.5}}, clock=clock)
+            self.assertEqual(read_health_file(path, max_age=5, clock=clock), {3: {'state': LIVE, 'last_frame_at': 999.5}})
+            clock.now += 10
+            self.assertEqual(read_health_file(path, max_age=5, clock=clock), {})
@@ -0,0 +1,141 @@
+import threading
+import numpy as np
+from django.test import SimpleTestCase
+from ml_models.capture import LatestFrameReader
+
+
+class FakeCapture:
+    """Capture that delivers one frame per step(); fails once the frames run out"""
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.released = False
+        self.delivered = 0
+        self._steps = threading.Semaphore(0)
+
+    def step(self, n=1):
+        for _ in range(n):
+            self._steps.release()
+
+    def read(self):
+        self._steps.acquire()
+        if not self.frames:
+            return False, None
+        self.delivered += 1
+        return True, self.frames.pop(0)
+
+    def release(self):
+        self.released = True
+
+
+class BufferedCapture(FakeCapture):
+    """Capture that decodes into the buffer it's given, like cv2.VideoCapture.read(image)"""
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.buffers_given = []
+
+    def read(self, image=None):
+        ok, frame = super().read()
+        if not ok or image is None:
+            return ok, frame
+        self.buffers_given.append(image)
+        image[:] = frame
+        return True, image
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def wait_until(condition):
+    for _ in range(200):
+        if condition():
+            return
+        threading.Event().wait(0.005)
+
+
+class LatestFrameReaderTests(SimpleTestCase):
+    def frames(self, n):
+        return [np.full((2, 2, 3), i, dtype=np.uint8) for i in range(n)]
+
+    def release(self, reader, capture):
+        # Let the blocked read() return so the reader thread can exit
+        capture.step()
+        reader.release()
+
+    def test_read_returns_newest_frame_with_timestamp(self):
+        capture = FakeCapture(self.frames(3))
+        clock = FakeClock()
+        reader = LatestFrameReader(capture, clock=clock)
+
+        capture.step()
+        ok, frame, timestamp = reader.read(timeout=1)
+        self.assertTrue(ok)
+        self.assertEqual(frame[0, 0, 0], 0)
+        self.assertEqual(timestamp, 100.0)
+
+        clock.now = 101.5
+        capture.step()
+        ok, frame, timestamp = reader.read(timeout=1)
+        self.assertEqual(frame[0, 0, 0], 1)
+        self.assertEqual(timestamp, 101.5)
+        self.release(reader, capture)
+        self.assertTrue(capture.released)
+
+    def test_slow_consumer_drops_old_frames(self):
+        capture = FakeCapture(self.frames(4))
+        reader = LatestFrameReader(capture)
+
+        capture.step(4)
+        wait_until(lambda: reader.frames_captured == 4)
+        ok, frame, _ = reader.read(timeout=1)
+        self.assertEqual(frame[0, 0, 0], 3)
+        self.assertEqual(reader.frames_dropped, 3)
+        self.assertEqual(reader.frames_read, 1)
+        self.release(reader, capture)
+
+    def test_same_frame_is_never_returned_twice(self):
+        capture = FakeCapture(self.frames(2))
+        reader = LatestFrameReader(capture)
+
+        capture.step()
+        self.assertTrue(reader.read(timeout=1)[0])
+        self.assertEqual(reader.read(timeout=0.05), (False, None, None))
+        self.assertFalse(reader.failed)
+        self.release(reader, capture)
+
+    def test_capture_failure_ends_reads(self):
+        capture = FakeCapture(self.frames(1))
+        reader = LatestFrameReader(capture)
+
+        capture.step(2)
+        # The last good frame is still delivered, then reads fail
+        self.assertTrue(reader.read(timeout=1)[0])
+        ok, frame, _ = reader.read(timeout=1)
+        self.assertFalse(ok)
+        self.assertTrue(reader.failed)
+        self.assertFalse(reader.running)
+        self.release(reader, capture)
+
+    def test_buffers_are_reused_but_never_the_one_being_read(self):
+        capture = BufferedCapture(self.frames(8))
+        reader = LatestFrameReader(capture, reuse_buffers=True)
+
+        held = []
+        capture.step()
+        while capture.delivered < 7:
+            ok, frame, _ = reader.read(timeout=1)
+            value = frame[0, 0, 0]
+            held.append(frame)
+            # Two more frames are decoded while the consumer still works on this one
+            delivered = capture.delivered
+            capture.step(2)
+            wait_until(lambda: reader.frames_captured == delivered + 2)
+            self.assertEqual(frame[0, 0, 0], value)
+        # Steady state: a small pool of buffers
+        self.assertLessEqual(len({id(frame) for frame in held}), 3)
+        self.assertTrue(capture.buffers_given)
+        self.release(reader, capture)
@@ -0,0 +1,164 @@
+import threading
+from django.test import SimpleTestCase
+from ml_models.capture_hub import CaptureHub, CaptureHubRegistry
+
+
+class SteppedSource:
+    """Frame source that yields one frame each time step() is called"""
+    def __init__(self):
+        self.started = 0
+        self.closed = threading.Event()
+        self._steps = threading.Semaphore(0)
+
+    def step(self, n=1):
+        for _ in range(n):
+            self._steps.release()
+
+    def __call__(self):
+        self.started += 1
+        return self._frames()
+
+    def _frames(self):
+        try:
+            frame = 0
+            while True:
+                self._steps.acquire()
+                frame += 1
+                yield frame
+        finally:
+            self.closed.set()
+
+
+class CaptureHubTests(SimpleTestCase):
+    def test_every_subscriber_gets_the_same_frames(self):
+        source = SteppedSource()
+        hub = CaptureHub(source)
+        first, second = hub.subscribe(), hub.subscribe()
+        hub.start()
+
+        source.step()
+        self.assertEqual(first.get(timeout=1), 1)
+        self.assertEqual(second.get(timeout=1), 1)
+        source.step()
+        self.assertEqual(first.get(timeout=1), 2)
+        self.assertEqual(second.get(timeout=1), 2)
+        self.assertEqual(source.started, 1)
+
+        first.close()
+        second.close()
+        source.step()
+        hub.join(timeout=1)
+
+    def test_slow_subscriber_skips_to_newest_frame(self):
+        source = SteppedSource()
+        hub = CaptureHub(source)
+        subscription = hub.subscribe()
+        hub.start()
+
+        source.step(3)
+        while hub.frames_published < 3:
+            threading.Event().wait(0.01)
+        self.assertEqual(subscription.get(timeout=1), 3)
+        self.assertEqual(subscription.frames_dropped, 2)
+        self.assertIsNone(subscription.get(timeout=0.05))
+
+        subscription.close()
+        source.step()
+        hub.join(timeout=1)
+
+    def test_last_unsubscribe_closes_source(self):
+        source = SteppedSource()
+        hub = CaptureHub(source)
+        first, second = hub.subscribe(), hub.subscribe()
+        hub.start()
+
+        first.close()
+        self.assertTrue(hub.alive)
+        second.close()
+        self.assertFalse(hub.alive)
+        source.step()
+        self.assertTrue(source.closed.wait(timeout=1))
+        hub.join(timeout=1)
+        self.assertTrue(hub.finished)
+        with self.assertRaises(RuntimeError):
+            hub.subscribe()
+
+    def test_source_end_closes_subscriptions(self):
+        hub = CaptureHub(lambda: iter(['error frame']))
+        subscription = hub.subscribe()
+        hub.start()
+        hub.join(timeout=1)
+
+        # The last frame is still delivered before the stream ends
+        self.assertEqual(list(subscription), ['error frame'])
+        self.assertTrue(subscription.closed)
+
+
+class CaptureHubRegistryTests(SimpleTestCase):
+    def test_viewers_share_one_running_hub(self):
+        registry = CaptureHubRegistry()
+        source = SteppedSource()
+        first = registry.subscribe(1, source)
+        second = registry.subscribe(1, source)
+
+        self.assertIs(first.hub, second.hub)
+        self.assertEqual(source.started, 1)
+        self.assertEqual(registry.status(), {1: {'subscribers': 2, 'frames_published': 0}})
+
+        first.close()
+        second.close()
+        source.step()
+        first.hub.join(timeout=1)
+        self.assertEqual(registry.status(), {})
+
+    def test_new_viewer_after_stop_waits_for_the_old_source(self):
+        registry = CaptureHubRegistry()
+        old_source, new_source = SteppedSource(), SteppedSource()
+        first = registry.subscribe(1, old_source)
+        registry.stop(1)
+        self.assertIsNone(registry.get(1))
+
+        subscribed = []
+        viewer = threading.Thread(target=lambda: subscribed.append(registry.subscribe(1, new_source)))
+        viewer.start()
+        # The old source is still busy: no second source for the camera yet
+        viewer.join(timeout=0.1)
+        self.assertTrue(viewer.is_alive())
+        self.assertEqual(new_source.started, 0)
+
+        old_source.step()
+        viewer.join(timeout=1)
+        second = subscribed[0]
+        self.assertIsNot(first.hub, second.hub)
+        self.assertTrue(old_source.closed.is_set())
+        self.assertTrue(first.closed)
+        self.assertFalse(second.closed)
+        new_source.step()
+        self.assertEqual(second.get(timeout=1), 1)
+        self.assertEqual(new_source.started, 1)
+
+        second.close()
+        new_source.step()
+        second.hub.join(timeout=1)
+
+    def test_viewer_returning_while_source_is_blocked_revives_the_hub(self):
+        registry = CaptureHubRegistry()
+        source = SteppedSource()
+        first = registry.subscribe(1, source)
+        source.step()
+        self.assertEqual(first.get(timeout=1), 1)
+
+        # Last viewer leaves while the source is blocked (e.g. in inference)
+        first.close()
+        second = registry.subscribe(1, source)
+
+        self.assertIs(second.hub, first.hub)
+        source.step()
+        self.assertEqual(second.get(timeout=1), 2)
+        self.assertEqual(source.started, 1)
+        self.assertFalse(source.closed.is_set())
+
+        second.close()
+        source.step()
+        second.hub.join(timeout=1)
+        self.assertTrue(source.closed.is_set())
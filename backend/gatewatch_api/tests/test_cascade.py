@@ -0,0 +1,56 @@
+import numpy as np
+from django.test import SimpleTestCase
+from ml_models.cascade import ComplianceCascade, use_cascade
+
+
+class ComplianceCascadeTests(SimpleTestCase):
+    def test_confident_verdict_resolves_track(self):
+        cascade = ComplianceCascade(min_confidence=0.6)
+        self.assertEqual(cascade.pending([1, 2]), [1, 2])
+
+        cascade.update(1, np.array([[0, 0, 10, 10, 0.3, 1], [0, 0, 10, 10, 0.9, 0]]))
+        self.assertEqual(cascade.get(1), (0, 0.9))
+
+        # Resolved tracks are never classified again
+        self.assertNotIn(1, cascade.pending([1, 2]))
+
+    def test_unresolved_track_is_retried_after_interval(self):
+        cascade = ComplianceCascade(min_confidence=0.6, retry_interval=3, max_attempts=10)
+        cascade.pending([1])
+        cascade.update(1, np.array([[0, 0, 10, 10, 0.4, 1]]))
+        self.assertIsNone(cascade.get(1))
+
+        self.assertEqual(cascade.pending([1]), [])
+        self.assertEqual(cascade.pending([1]), [])
+        self.assertEqual(cascade.pending([1]), [1])
+
+    def test_best_guess_accepted_after_max_attempts(self):
+        cascade = ComplianceCascade(min_confidence=0.9, retry_interval=1, max_attempts=2)
+        cascade.pending([1])
+        cascade.update(1, np.array([[0, 0, 10, 10, 0.5, 1]]))
+        cascade.pending([1])
+        cascade.update(1, np.zeros((0, 6)))
+        self.assertEqual(cascade.get(1), (1, 0.5))
+
+    def test_crops_are_clamped_and_resized(self):
+        cascade = ComplianceCascade(crop_size=(64, 64), max_crops=2)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        crops = cascade.crops(frame, [(-20, -20, 100, 200), (600, 400, 700, 500), (0, 0, 10, 10)])
+        self.assertEqual(len(crops), 2)
+        self.assertTrue(all(crop.shape == (64, 64, 3) for crop in crops))
+
+    def test_prune_forgets_lost_tracks(self):
+        cascade = ComplianceCascade()
+        cascade.pending([1, 2])
+        cascade.update(1, np.array([[0, 0, 10, 10, 0.9, 0]]))
+        cascade.prune([2])
+        self.assertIsNone(cascade.get(1))
+        self.assertEqual(cascade.pending([1]), [1])
+
+
+class UseCascadeTests(SimpleTestCase):
+    def test_cascade_needs_a_tracker(self):
+        self.assertTrue(use_cascade(True, object()))
+        # DeepSort failed to start: the frame goes to the compliance model, never the person detector
+        self.assertFalse(use_cascade(True, None))
+        self.assertFalse(use_cascade(False, object()))
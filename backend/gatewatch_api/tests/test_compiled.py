@@ -0,0 +1,42 @@
+import tempfile
+from pathlib import Path
+from django.test import SimpleTestCase
+from ml_models.backends import weights_hash
+from ml_models.compiled import compiled_cache_dir, cpu_supports_bf16
+
+
+class CompiledVariantTests(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.weights = Path(self.tmpdir.name) / 'best.pt'
+        self.weights.write_bytes(b'weights-v1')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_cpuinfo(self, flags):
+        path = Path(self.tmpdir.name) / 'cpuinfo'
+        path.write_text(f"processor\t: 0\nmodel name\t: Test CPU\nflags\t\t: {flags}\n\n")
+        return path
+
+    def test_cache_dir_is_keyed_by_weights_hash_and_precision(self):
+        path = compiled_cache_dir(self.weights, 'torchscript')
+        self.assertEqual(path.parent, self.weights.parent)
+        self.assertEqual(path.name, f"best.{weights_hash(self.weights)}.torchscript")
+        self.assertEqual(compiled_cache_dir(self.weights, 'inductor', bf16=True).name,
+                         f"best.{weights_hash(self.weights)}.inductor-bf16")
+
+        # New weights must not reuse previously compiled modules
+        self.weights.write_bytes(b'weights-v2')
+        self.assertNotEqual(compiled_cache_dir(self.weights, 'torchscript'), path)
+
+    def test_eager_and_unknown_modes_have_no_cache(self):
+        for mode in ('none', 'tensorrt'):
+            with self.assertRaises(ValueError):
+                compiled_cache_dir(self.weights, mode)
+
+    def test_bf16_needs_native_cpu_support(self):
+        self.assertTrue(cpu_supports_bf16(self.write_cpuinfo('fpu sse avx2 avx512f avx512_bf16')))
+        self.assertTrue(cpu_supports_bf16(self.write_cpuinfo('fpu avx512f amx_bf16 amx_tile')))
+        self.assertFalse(cpu_supports_bf16(self.write_cpuinfo('fpu sse avx2 avx512f')))
+        self.assertFalse(cpu_supports_bf16(Path(self.tmpdir.name) / 'missing'))
@@ -0,0 +1,27 @@
+from django.test import SimpleTestCase
+from ml_models.cpu_budget import CoreBudget
+
+
+class CoreBudgetTests(SimpleTestCase):
+    def test_partition_has_no_overlap(self):
+        budget = CoreBudget(cores=range(16), inference_pools=2, camera_slots=4, reserved=1, inference_share=0.5)
+        self.assertEqual(budget.reserved, [0])
+        self.assertEqual(len(budget.inference), 2)
+        self.assertEqual(len(budget.streams), 4)
+
+        groups = [budget.reserved] + budget.inference + budget.streams
+        assigned = [core for group in groups for core in group]
+        self.assertEqual(sorted(assigned), list(range(16)))
+
+    def test_streams_round_robin_over_slots(self):
+        budget = CoreBudget(cores=range(8), camera_slots=2, reserved=0)
+        first, second, third = (budget.next_stream_cores() for _ in range(3))
+        self.assertNotEqual(first, second)
+        self.assertEqual(first, third)
+
+    def test_small_machines_still_get_every_group(self):
+        budget = CoreBudget(cores=[0, 1], inference_pools=3, camera_slots=4, reserved=1)
+        self.assertEqual(budget.reserved, [])
+        self.assertEqual(len(budget.inference), 3)
+        self.assertTrue(all(budget.inference))
+        self.assertTrue(all(budget.streams))
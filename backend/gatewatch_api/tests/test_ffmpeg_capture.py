@@ -0,0 +1,82 @@
+import io
+import collections
+import numpy as np
+from django.test import SimpleTestCase
+from ml_models.ffmpeg_capture import FFmpegCapture, ffmpeg_command, output_size
+
+
+class FakeProcess:
+    """Stands in for the ffmpeg subprocess: stdout yields raw frames in small chunks"""
+    class ChunkedStream(io.BytesIO):
+        def readinto(self, buffer):
+            return super().readinto(buffer[:7])
+
+    def __init__(self, data):
+        self.stdout = self.ChunkedStream(data)
+
+    def poll(self):
+        return None
+
+
+def capture_from(data, shape):
+    capture = FFmpegCapture.__new__(FFmpegCapture)
+    capture.height, capture.width = shape[:2]
+    capture.shape = shape
+    capture.frame_bytes = int(np.prod(shape))
+    capture._process = FakeProcess(data)
+    capture._first = None
+    capture._stderr = collections.deque()
+    return capture
+
+
+class FFmpegCaptureTests(SimpleTestCase):
+    def test_output_size_keeps_aspect_ratio(self):
+        self.assertEqual(output_size((1920, 1080), width=1280), (1280, 720))
+        self.assertEqual(output_size((2560, 1440), height=450), (800, 450))
+        self.assertEqual(output_size((1280, 960), width=641), (641, 480))
+        self.assertEqual(output_size((1920, 1080), 640, 640), (640, 640))
+        self.assertEqual(output_size((1920, 1080)), (1920, 1080))
+
+    def test_command_scales_and_drops_frames_in_ffmpeg(self):
+        command = ffmpeg_command('rtsp://cam/stream', (1280, 720), fps=15)
+        self.assertEqual(command[command.index('-rtsp_transport') + 1], 'tcp')
+        self.assertEqual(command[command.index('-vf') + 1], 'fps=15,scale=1280:720')
+        self.assertEqual(command[command.index('-pix_fmt') + 1], 'bgr24')
+        self.assertEqual(command[-1], 'pipe:1')
+
+    def test_keyframe_only_decode(self):
+        command = ffmpeg_command('rtsp://cam/stream', (1280, 720), skip_frame='nokey')
+        # A decoder option: it goes before the input
+        self.assertLess(command.index('-skip_frame'), command.index('-i'))
+        self.assertEqual(command[command.index('-skip_frame') + 1], 'nokey')
+        self.assertEqual(command[command.index('-vsync') + 1], 'passthrough')
+        self.assertNotIn('-skip_frame', ffmpeg_command('rtsp://cam/stream', (1280, 720)))
+
+    def test_http_source_without_fps_filter(self):
+        command = ffmpeg_command('http://cam/video.mjpg', (800, 450))
+        self.assertNotIn('-rtsp_transport', command)
+        self.assertEqual(command[command.index('-vf') + 1], 'scale=800:450')
+
+    def test_frames_are_read_into_preallocated_buffer(self):
+        shape = (2, 4, 3)
+        frames = [np.full(shape, i, dtype=np.uint8) for i in (1, 2)]
+        capture = capture_from(b''.join(f.tobytes() for f in frames), shape)
+
+        buffer = np.zeros(shape, dtype=np.uint8)
+        ok, frame = capture.read(buffer)
+        self.assertTrue(ok)
+        self.assertIs(frame, buffer)
+        self.assertTrue((frame == 1).all())
+
+        ok, frame = capture.read()
+        self.assertTrue((frame == 2).all())
+        # A partial frame means the stream ended
+        self.assertEqual(capture.read(buffer), (False, None))
+
+    def test_mismatched_buffer_is_not_used(self):
+        shape = (2, 4, 3)
+        capture = capture_from(np.full(shape, 5, dtype=np.uint8).tobytes(), shape)
+        wrong = np.zeros((4, 4, 3), dtype=np.uint8)
+        ok, frame = capture.read(wrong)
+        self.assertIsNot(frame, wrong)
+        self.assertTrue((frame == 5).all())
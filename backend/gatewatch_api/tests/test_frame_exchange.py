@@ -0,0 +1,58 @@
+import tempfile
+from django.test import SimpleTestCase
+from ml_models.frame_exchange import FrameFileReader, FrameFileWriter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 500.0
+
+    def __call__(self):
+        return self.now
+
+
+class FrameExchangeTests(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.writer = FrameFileWriter(self.tmpdir.name, 7, clock=self.clock)
+        self.reader = FrameFileReader(self.tmpdir.name, 7, poll_interval=0.001, clock=self.clock)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_nothing_published_yet(self):
+        self.assertEqual(self.reader.read(timeout=0.01), (None, None))
+        self.assertIsNone(self.reader.age())
+
+    def test_each_frame_is_read_once(self):
+        self.writer.publish(b'frame-1')
+        self.assertEqual(self.reader.read(timeout=0.1), (b'frame-1', 500.0))
+        self.assertEqual(self.reader.read(timeout=0.01), (None, None))
+
+        self.clock.now = 500.5
+        self.writer.publish(b'frame-2')
+        self.assertEqual(self.reader.read(timeout=0.1), (b'frame-2', 500.5))
+
+    def test_reader_skips_to_latest_frame(self):
+        for i in range(3):
+            self.writer.publish(f"frame-{i}".encode())
+        data, _ = self.reader.read(timeout=0.1)
+        self.assertEqual(data, b'frame-2')
+        self.assertEqual(self.reader.seq, 3)
+
+    def test_age_of_last_frame(self):
+        self.writer.publish(b'frame')
+        self.reader.read(timeout=0.1)
+        self.clock.now = 503.0
+        self.assertEqual(self.reader.age(), 3.0)
+
+    def test_restarted_writer_is_picked_up(self):
+        self.writer.publish(b'old')
+        self.reader.read(timeout=0.1)
+        self.writer.close()
+
+        self.clock.now = 600.0
+        restarted = FrameFileWriter(self.tmpdir.name, 7, clock=self.clock)
+        restarted.publish(b'new')
+        self.assertEqual(self.reader.read(timeout=0.1), (b'new', 600.0))
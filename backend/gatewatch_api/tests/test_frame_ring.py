@@ -0,0 +1,71 @@
+import os
+import numpy as np
+from django.test import SimpleTestCase
+from ml_models.frame_ring import FrameRing
+
+
+class FrameRingTests(SimpleTestCase):
+    def setUp(self):
+        self.name = f"gw-test-ring-{os.getpid()}"
+        self.writer = FrameRing.create(self.name, (4, 6, 3), slots=4, max_readers=2)
+        self.reader = FrameRing.attach(self.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+
+    def frame(self, value):
+        return np.full((4, 6, 3), value, dtype=np.uint8)
+
+    def test_reader_sees_ring_geometry(self):
+        self.assertEqual(self.reader.frame_shape, (4, 6, 3))
+        self.assertEqual(self.reader.slots, 4)
+        self.assertEqual(self.reader.max_readers, 2)
+
+    def test_slots_carry_sequence_and_timestamp(self):
+        self.assertIsNone(self.reader.acquire_latest(0))
+        self.writer.write(self.frame(1), timestamp=10.0)
+        self.writer.write(self.frame(2), timestamp=10.5)
+
+        slot = self.reader.acquire_latest(0)
+        self.assertEqual((slot.seq, slot.timestamp), (2, 10.5))
+        self.assertTrue((slot.frame == 2).all())
+        self.assertEqual(self.reader.latest_seq, 2)
+        # Nothing newer than what this reader already has
+        self.assertIsNone(self.reader.acquire_latest(0, after_seq=2))
+
+    def test_reader_view_is_shared_not_copied(self):
+        target = self.writer.begin_write()
+        target[:] = 7
+        self.writer.commit(timestamp=1.0)
+        slot = self.reader.acquire_latest(0)
+        self.assertTrue((slot.frame == 7).all())
+        self.assertFalse(slot.frame.flags.owndata)
+
+    def test_pinned_frame_is_never_overwritten(self):
+        self.writer.write(self.frame(1))
+        pinned = self.reader.acquire_latest(1)
+        for value in range(2, 20):
+            self.writer.write(self.frame(value))
+        self.assertTrue((pinned.frame == 1).all())
+
+        self.reader.release(1)
+        for value in range(20, 30):
+            self.writer.write(self.frame(value))
+        self.assertFalse((pinned.frame == 1).all())
+
+    def test_slot_count_covers_every_reader(self):
+        ring = FrameRing.create(f"{self.name}-small", (2, 2, 3), slots=1, max_readers=3)
+        try:
+            self.assertEqual(ring.slots, 5)
+        finally:
+            ring.close()
+
+    def test_retired_ring_stops_waiting_readers(self):
+        self.writer.retire()
+        self.assertTrue(self.reader.retired)
+        self.assertIsNone(self.reader.wait_latest(0, timeout=5))
+
+    def test_attach_to_missing_ring_fails(self):
+        with self.assertRaises(FileNotFoundError):
+            FrameRing.attach(f"{self.name}-missing")
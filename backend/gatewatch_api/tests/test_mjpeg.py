@@ -0,0 +1,140 @@
+import threading
+import cv2
+import numpy as np
+from django.test import SimpleTestCase
+from ml_models.mjpeg import (
+    MJPEGCapture, MJPEGParser, boundary_from_content_type, decode_jpeg, jpeg_size, reduction_factor,
+)
+
+
+def jpeg(value, size=(64, 48)):
+    frame = np.full((size[1], size[0], 3), value, dtype=np.uint8)
+    return cv2.imencode('.jpg', frame)[1].tobytes()
+
+
+def multipart(frames, boundary='frame', content_length=True):
+    body = b''
+    for data in frames:
+        body += f"--{boundary}\r\nContent-Type: image/jpeg\r\n".encode()
+        if content_length:
+            body += f"Content-Length: {len(data)}\r\n".encode()
+        body += b"\r\n" + data + b"\r\n"
+    return body
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class SteppedChunks:
+    """Body chunks handed out one step() at a time, like a camera sending frames"""
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.sent = 0
+        self._steps = threading.Semaphore(0)
+
+    def step(self, n=1):
+        for _ in range(n):
+            self._steps.release()
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self._steps.acquire()
+            self.sent += 1
+            yield chunk
+
+
+class MJPEGParserTests(SimpleTestCase):
+    def test_boundary_from_content_type(self):
+        self.assertEqual(boundary_from_content_type('multipart/x-mixed-replace;boundary=Ba4oTvQMY8ew04N8dcnM'), 'Ba4oTvQMY8ew04N8dcnM')
+        self.assertEqual(boundary_from_content_type('multipart/x-mixed-replace; boundary="--myboundary"'), '--myboundary')
+        self.assertIsNone(boundary_from_content_type('image/jpeg'))
+
+    def test_parts_split_across_any_chunking(self):
+        frames = [jpeg(value) for value in (10, 120, 240)]
+        for content_length in (True, False):
+            body = multipart(frames, content_length=content_length)
+            for size in (1, 7, 500, len(body)):
+                parser = MJPEGParser('frame')
+                parsed = [frame for chunk in chunked(body, size) for frame in parser.feed(chunk)]
+                self.assertEqual(parsed, frames, (content_length, size))
+
+    def test_boundary_with_dashes_in_the_header(self):
+        frames = [jpeg(50), jpeg(60)]
+        # Header says "--myboundary", body uses "--myboundary" (no extra dashes)
+        body = multipart(frames, boundary='myboundary', content_length=False)
+        self.assertEqual(MJPEGParser('--myboundary').feed(body), frames)
+
+    def test_only_the_unfinished_part_is_buffered(self):
+        frames = [jpeg(value) for value in range(0, 250, 10)]
+        parser = MJPEGParser('frame')
+        largest = 0
+        for chunk in chunked(multipart(frames), 1024):
+            parser.feed(chunk)
+            largest = max(largest, len(parser._buffer))
+        self.assertLess(largest, max(len(f) for f in frames) + 1024 + 200)
+
+    def test_non_jpeg_parts_are_skipped(self):
+        body = multipart([b'not a jpeg', jpeg(80)])
+        parser = MJPEGParser('frame')
+        self.assertEqual(parser.feed(body), [jpeg(80)])
+        self.assertEqual(parser.parts_skipped, 1)
+
+    def test_without_boundary_jpegs_are_cut_at_markers(self):
+        frames = [jpeg(30), jpeg(90)]
+        parser = MJPEGParser(None)
+        parsed = [frame for chunk in chunked(b'junk' + b''.join(frames), 13) for frame in parser.feed(chunk)]
+        self.assertEqual(parsed, frames)
+
+
+class JPEGDecodeTests(SimpleTestCase):
+    def test_size_is_read_from_the_header(self):
+        self.assertEqual(jpeg_size(jpeg(0, size=(1920, 1080))), (1920, 1080))
+        self.assertIsNone(jpeg_size(b'\xff\xd8garbage'))
+
+    def test_reduction_keeps_the_minimum_width(self):
+        self.assertEqual(reduction_factor((1920, 1080), 800), 2)
+        self.assertEqual(reduction_factor((3840, 2160), 800), 4)
+        self.assertEqual(reduction_factor((1280, 720), 800), 1)
+        self.assertEqual(reduction_factor((1920, 1080), 0), 1)
+
+    def test_reduced_decode(self):
+        frame = decode_jpeg(jpeg(100, size=(1920, 1080)), min_width=800)
+        self.assertEqual(frame.shape, (540, 960, 3))
+        self.assertEqual(decode_jpeg(jpeg(100, size=(640, 360))).shape, (360, 640, 3))
+        self.assertIsNone(decode_jpeg(b'\xff\xd8\xff\xd9'))
+
+
+class MJPEGCaptureTests(SimpleTestCase):
+    def test_only_the_newest_frame_is_decoded(self):
+        frames = [jpeg(value) for value in (10, 100, 200)]
+        # One chunk with all three frames; the camera keeps the connection open after it
+        chunks = SteppedChunks([multipart(frames), b''])
+        capture = MJPEGCapture(iter(chunks), 'multipart/x-mixed-replace; boundary=frame')
+        self.assertTrue(capture.isOpened())
+
+        chunks.step()
+        ok, frame, timestamp = capture.read(timeout=1)
+        self.assertTrue(ok)
+        self.assertAlmostEqual(int(frame[0, 0, 0]), 200, delta=2)
+        self.assertIsNotNone(timestamp)
+        self.assertEqual(capture.frames_captured, 3)
+        self.assertEqual(capture.frames_read, 1)
+        self.assertEqual(capture.frames_dropped, 2)
+
+        ok, _, _ = capture.read(timeout=0.05)
+        self.assertFalse(ok)
+        self.assertFalse(capture.failed)
+        chunks.step()  # Let the demux thread finish
+        capture.release()
+
+    def test_end_of_stream_fails_the_capture(self):
+        capture = MJPEGCapture(iter([multipart([jpeg(10)])]), 'multipart/x-mixed-replace; boundary=frame')
+        ok, frame, _ = capture.read(timeout=1)
+        self.assertTrue(ok)
+        ok, _, _ = capture.read(timeout=1)
+        self.assertFalse(ok)
+        self.assertTrue(capture.failed)
+        self.assertFalse(capture.isOpened())
+        self.assertEqual(capture.error, "Stream ended")
+        capture.release()
@@ -0,0 +1,36 @@
+import numpy as np
+from django.test import SimpleTestCase
+from ml_models.motion import MotionGate
+
+
+class MotionGateTests(SimpleTestCase):
+    def setUp(self):
+        self.empty = np.zeros((450, 800, 3), dtype=np.uint8)
+        self.person = self.empty.copy()
+        self.person[100:400, 300:400] = 255
+
+    def test_static_scene_is_gated_after_hold(self):
+        gate = MotionGate(hold_frames=2)
+        results = [gate.check(self.empty) for _ in range(5)]
+
+        # First frame has no reference, then two hold frames, then gated
+        self.assertEqual(results, [True, True, True, False, False])
+        self.assertEqual(gate.stats(), {'frames_gated': 2, 'frames_processed': 3})
+
+    def test_motion_wakes_detection(self):
+        gate = MotionGate(hold_frames=0)
+        gate.check(self.empty)
+        self.assertFalse(gate.check(self.empty))
+        self.assertTrue(gate.check(self.person))
+
+    def test_low_sensitivity_ignores_small_changes(self):
+        flicker = self.empty.copy()
+        flicker[0:20, 0:20] = 255
+
+        insensitive = MotionGate(sensitivity=0.0, hold_frames=0)
+        insensitive.check(self.empty)
+        self.assertFalse(insensitive.check(flicker))
+
+        sensitive = MotionGate(sensitivity=1.0, hold_frames=0)
+        sensitive.check(self.empty)
+        self.assertTrue(sensitive.check(flicker))
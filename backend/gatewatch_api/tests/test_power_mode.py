@@ -0,0 +1,71 @@
+from datetime import datetime
+from django.test import SimpleTestCase
+from ml_models.power_mode import AUTO, FULL, LOW_POWER, DecodeModeController, parse_schedule, scheduled_mode
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+NIGHTS = [{'start': '18:00', 'end': '06:00', 'mode': LOW_POWER, 'days': [0, 1, 2, 3, 4]}]
+
+
+class DecodeScheduleTests(SimpleTestCase):
+    def test_invalid_schedules_are_rejected(self):
+        for entries in (
+            {'start': '18:00'},
+            [{'start': '18:00', 'end': '06:00'}],
+            [{'start': '25:00', 'end': '06:00', 'mode': LOW_POWER}],
+            [{'start': '18:00', 'end': '06:00', 'mode': 'off'}],
+            [{'start': '18:00', 'end': '06:00', 'mode': FULL, 'days': [7]}],
+        ):
+            with self.assertRaises(ValueError, msg=entries):
+                parse_schedule(entries)
+        self.assertEqual(parse_schedule(None), [])
+
+    def test_window_within_a_day(self):
+        entries = [{'start': '07:00', 'end': '08:30', 'mode': FULL}]
+        self.assertEqual(scheduled_mode(entries, datetime(2026, 10, 14, 7, 0)), FULL)
+        self.assertEqual(scheduled_mode(entries, datetime(2026, 10, 14, 8, 29)), FULL)
+        self.assertIsNone(scheduled_mode(entries, datetime(2026, 10, 14, 8, 30)))
+
+    def test_overnight_window_belongs_to_the_day_it_starts(self):
+        # 2026-10-16 is a Friday, 2026-10-17 a Saturday
+        self.assertEqual(scheduled_mode(NIGHTS, datetime(2026, 10, 16, 22, 0)), LOW_POWER)
+        self.assertEqual(scheduled_mode(NIGHTS, datetime(2026, 10, 17, 5, 59)), LOW_POWER)  # Friday night
+        self.assertIsNone(scheduled_mode(NIGHTS, datetime(2026, 10, 17, 22, 0)))             # Saturday night
+        self.assertIsNone(scheduled_mode(NIGHTS, datetime(2026, 10, 16, 12, 0)))
+        self.assertIsNone(scheduled_mode(None, datetime(2026, 10, 16, 22, 0)))
+
+
+class DecodeModeControllerTests(SimpleTestCase):
+    def test_auto_goes_low_power_when_idle_and_back_on_activity(self):
+        clock = FakeClock()
+        controller = DecodeModeController(idle_after=60, clock=clock)
+        self.assertEqual(controller.update(AUTO), FULL)
+
+        clock.now += 59
+        self.assertEqual(controller.update(AUTO), FULL)
+        clock.now += 1
+        self.assertEqual(controller.update(AUTO), LOW_POWER)
+
+        controller.activity()
+        self.assertEqual(controller.update(AUTO), FULL)
+        self.assertEqual(controller.switches, 2)
+
+    def test_setting_and_schedule_force_the_mode(self):
+        clock = FakeClock()
+        controller = DecodeModeController(idle_after=60, clock=clock)
+        self.assertEqual(controller.update(LOW_POWER), LOW_POWER)
+        controller.activity()
+        self.assertEqual(controller.update(LOW_POWER), LOW_POWER)
+
+        clock.now += 600
+        # The schedule wins over the camera's setting
+        self.assertEqual(controller.update(AUTO, scheduled=FULL), FULL)
+        # Leaving a forced full window doesn't drop straight to low power
+        self.assertEqual(controller.update(AUTO), FULL)
@@ -0,0 +1,35 @@
+import numpy as np
+from django.test import SimpleTestCase
+from ml_models.preprocess import CoordinateTransform, FramePreprocessor
+
+
+class FramePreprocessorTests(SimpleTestCase):
+    def setUp(self):
+        self.preprocessor = FramePreprocessor(display_size=(800, 450), detection_size=(416, 416))
+        self.frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+
+    def test_buffers_are_reused(self):
+        first = self.preprocessor.display(self.frame)
+        second = self.preprocessor.display(self.frame)
+        self.assertIs(first, second)
+
+        det_a, _ = self.preprocessor.detection(self.frame)
+        det_b, _ = self.preprocessor.detection(self.frame, (0, 0, 960, 540))
+        self.assertIs(det_a, det_b)
+        self.assertEqual(det_a.shape, (416, 416, 3))
+
+    def test_full_frame_transform(self):
+        _, to_display = self.preprocessor.detection(self.frame)
+        self.assertEqual(to_display.map_box(0, 0, 416, 416), (0, 0, 800, 450))
+        self.assertEqual(to_display.map_box(208, 208, 416, 416), (400, 225, 800, 450))
+
+    def test_cropped_transform(self):
+        # Right half of the frame
+        _, to_display = self.preprocessor.detection(self.frame, (960, 0, 1920, 1080))
+        self.assertEqual(to_display.map_box(0, 0, 416, 416), (400, 0, 800, 450))
+
+    def test_inverse(self):
+        transform = CoordinateTransform(2.0, 0.5, 10, 20)
+        x, y = transform.inverse().map_point(*transform.map_point(33, 44))
+        self.assertAlmostEqual(x, 33)
+        self.assertAlmostEqual(y, 44)
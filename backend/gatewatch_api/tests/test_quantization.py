@@ -0,0 +1,28 @@
+from django.test import SimpleTestCase
+from ml_models.quantization import box_iou, mean_average_precision
+
+
+class DetectionMapTests(SimpleTestCase):
+    def setUp(self):
+        self.references = [
+            ([[0, 0, 10, 10], [20, 20, 40, 40]], [0, 1]),
+            ([[5, 5, 15, 15]], [0]),
+        ]
+
+    def test_identical_predictions_score_perfect_map(self):
+        predictions = [(boxes, [0.9] * len(boxes), classes) for boxes, classes in self.references]
+        self.assertAlmostEqual(mean_average_precision(predictions, self.references), 1.0)
+
+    def test_missed_and_wrong_boxes_lower_map(self):
+        predictions = [
+            ([[0, 0, 10, 10], [100, 100, 120, 120]], [0.9, 0.8], [0, 1]),
+            ([], [], []),
+        ]
+        score = mean_average_precision(predictions, self.references)
+        # Class 0: 1 of 2 found at full precision -> 0.5; class 1: nothing matched -> 0.0
+        self.assertAlmostEqual(score, 0.25)
+
+    def test_box_iou(self):
+        iou = box_iou([[0, 0, 10, 10]], [[0, 0, 10, 10], [5, 0, 15, 10]])
+        self.assertAlmostEqual(float(iou[0, 0]), 1.0)
+        self.assertAlmostEqual(float(iou[0, 1]), 50 / 150)
@@ -0,0 +1,53 @@
+from django.test import SimpleTestCase
+from ml_models.rate_control import AdaptiveRateController
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class AdaptiveRateControllerTests(SimpleTestCase):
+    def run_seconds(self, controller, clock, seconds, fps=30, latency=0.01):
+        for _ in range(int(seconds * fps)):
+            clock.now += 1.0 / fps
+            controller.on_frame()
+            if controller.should_detect():
+                controller.record_latency(latency)
+
+    def test_interval_converges_to_fps_budget(self):
+        clock = FakeClock()
+        controller = AdaptiveRateController(target_fps=10, cpu_reader=None, clock=clock)
+        self.run_seconds(controller, clock, 10)
+        # 30 FPS feed / 10 FPS budget
+        self.assertEqual(controller.interval, 3)
+
+    def test_interval_changes_one_step_per_period(self):
+        clock = FakeClock()
+        controller = AdaptiveRateController(target_fps=2, cpu_reader=None, clock=clock)
+        self.run_seconds(controller, clock, 3.5)
+        self.assertEqual(controller.interval, 4)
+
+    def test_slow_inference_backs_off_to_keep_up_with_feed(self):
+        clock = FakeClock()
+        controller = AdaptiveRateController(target_fps=30, cpu_reader=None, clock=clock)
+        self.run_seconds(controller, clock, 10, latency=0.2)
+        # 0.2s per detection at 30 FPS -> at least 6 frames (+20% headroom)
+        self.assertEqual(controller.interval, 8)
+
+    def test_high_cpu_slows_detection(self):
+        clock = FakeClock()
+        controller = AdaptiveRateController(target_fps=30, cpu_reader=lambda: 95.0, clock=clock)
+        self.run_seconds(controller, clock, 5)
+        self.assertGreater(controller.interval, 1)
+        self.assertLessEqual(controller.interval, controller.max_interval)
+
+    def test_fixed_interval_pins_the_rate(self):
+        clock = FakeClock()
+        controller = AdaptiveRateController(target_fps=30, cpu_reader=None, clock=clock)
+        controller.set_interval_bounds(5, 5)
+        self.run_seconds(controller, clock, 5)
+        self.assertEqual(controller.interval, 5)
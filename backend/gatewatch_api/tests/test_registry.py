@@ -0,0 +1,55 @@
+import tempfile
+from pathlib import Path
+from django.test import SimpleTestCase
+from ml_models.registry import DEFAULT_VERSION, ModelRegistry
+
+
+class ModelRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.default = root / 'best.pt'
+        self.default.write_bytes(b'default')
+        self.models_dir = root / 'models'
+        (self.models_dir / 'run_a' / 'weights').mkdir(parents=True)
+        (self.models_dir / 'run_a' / 'weights' / 'best.pt').write_bytes(b'a')
+        (self.models_dir / 'no_weights').mkdir()
+        self.swapped = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_registry(self, load=lambda weights: f"model:{Path(weights).read_text()}"):
+        return ModelRegistry(self.models_dir, self.default, load=load,
+                             swap=lambda model, version: self.swapped.append((model, version)))
+
+    def test_lists_versions_with_weights(self):
+        registry = self.make_registry()
+        self.assertEqual([v['version'] for v in registry.versions()], ['run_a', DEFAULT_VERSION])
+        self.assertEqual(registry.active_weights(), self.default)
+
+    def test_activate_swaps_and_persists(self):
+        registry = self.make_registry()
+        registry.activate('run_a').join(timeout=2)
+
+        self.assertEqual(self.swapped, [('model:a', 'run_a')])
+        self.assertEqual(registry.active_version, 'run_a')
+        # A new registry (e.g. after a restart) comes back on the same version
+        self.assertEqual(self.make_registry().active_version, 'run_a')
+
+    def test_failed_load_keeps_current_version(self):
+        def broken(weights):
+            raise RuntimeError("corrupt weights")
+
+        registry = self.make_registry(load=broken)
+        registry.activate('run_a').join(timeout=2)
+        self.assertEqual(registry.active_version, DEFAULT_VERSION)
+        self.assertEqual(registry.last_error, "corrupt weights")
+        self.assertEqual(self.swapped, [])
+
+    def test_unknown_or_unsafe_versions_rejected(self):
+        registry = self.make_registry()
+        with self.assertRaises(FileNotFoundError):
+            registry.activate('no_weights')
+        with self.assertRaises(ValueError):
+            registry.activate('../secrets')
@@ -0,0 +1,70 @@
+import numpy as np
+from django.test import SimpleTestCase
+from ml_models.resolution import ResolutionTuner
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def people(heights, size=640, conf=0.9):
+    """One frame of detections at `size` with the given box heights (pixels)"""
+    return np.array([[10, 10, 40, 10 + h, conf, 0] for h in heights], dtype=np.float64).reshape(-1, 6)
+
+
+class ResolutionTunerTests(SimpleTestCase):
+    def test_samples_at_largest_size_until_tuned(self):
+        tuner = ResolutionTuner(min_samples=4, clock=FakeClock())
+        self.assertTrue(tuner.sampling)
+        self.assertEqual(tuner.input_size, 640)
+
+    def test_tall_people_pick_smallest_size(self):
+        tuner = ResolutionTuner(min_samples=4, clock=FakeClock())
+        self.assertIsNone(tuner.record(people([300, 320]), 640))
+        self.assertEqual(tuner.record(people([280, 310]), 640), 320)
+        self.assertFalse(tuner.sampling)
+        self.assertEqual(tuner.input_size, 320)
+        self.assertEqual(tuner.recall[320], 1.0)
+
+    def test_small_people_keep_largest_size(self):
+        tuner = ResolutionTuner(min_samples=4, clock=FakeClock())
+        # 40 px at 640 is 20 px at 320 and 26 px at 416: only 512 and up keep them
+        self.assertEqual(tuner.record(people([40, 40, 40, 40]), 640), 512)
+        tuner = ResolutionTuner(min_samples=4, clock=FakeClock())
+        self.assertEqual(tuner.record(people([34, 34, 34, 34]), 640), 640)
+
+    def test_low_confidence_detections_are_ignored(self):
+        tuner = ResolutionTuner(min_samples=2, clock=FakeClock())
+        self.assertIsNone(tuner.record(people([20, 20], conf=0.3), 640))
+        self.assertEqual(tuner.record(people([300, 300]), 640), 320)
+
+    def test_frames_at_other_sizes_are_not_sampled(self):
+        tuner = ResolutionTuner(min_samples=2, clock=FakeClock())
+        self.assertIsNone(tuner.record(people([300, 300]), 416))
+        self.assertTrue(tuner.sampling)
+
+    def test_too_few_people_keeps_current_size(self):
+        tuner = ResolutionTuner(min_samples=10, max_sample_frames=3, initial_size=416, clock=FakeClock())
+        for _ in range(2):
+            self.assertIsNone(tuner.record(people([]), 640))
+        # The round ends without a decision: the kept size is returned so it gets stored
+        self.assertEqual(tuner.record(people([]), 640), 416)
+        self.assertEqual(tuner.recall, {})
+        self.assertFalse(tuner.sampling)
+        self.assertEqual(tuner.input_size, 416)
+
+    def test_stored_result_is_reused_until_retune_interval(self):
+        clock = FakeClock()
+        tuner = ResolutionTuner(min_samples=2, retune_interval=100, initial_size=320, tuned_at=950.0, clock=clock)
+        self.assertFalse(tuner.sampling)
+        self.assertEqual(tuner.input_size, 320)
+
+        clock.now = 1060.0
+        self.assertIsNone(tuner.record(people([300]), 320))
+        self.assertTrue(tuner.sampling)
+        self.assertEqual(tuner.input_size, 640)
+        self.assertEqual(tuner.record(people([40, 40]), 640), 512)
@@ -0,0 +1,21 @@
+from django.test import SimpleTestCase
+from ml_models.roi import RegionOfInterest
+
+
+class RegionOfInterestTests(SimpleTestCase):
+    def setUp(self):
+        # Triangle over the lower-left half of the frame
+        self.roi = RegionOfInterest([[0.0, 0.5], [0.5, 0.5], [0.0, 1.0]])
+
+    def test_bounding_rect_in_pixels(self):
+        self.assertEqual(self.roi.bounding_rect(1920, 1080), (0, 540, 960, 1080))
+
+    def test_contains(self):
+        self.assertTrue(self.roi.contains(0.1, 0.6))
+        self.assertFalse(self.roi.contains(0.4, 0.9))
+        self.assertFalse(self.roi.contains(0.1, 0.1))
+
+    def test_invalid_polygons(self):
+        self.assertIsNone(RegionOfInterest.from_points(None))
+        self.assertIsNone(RegionOfInterest.from_points([[0, 0], [1, 1]]))
+        self.assertIsNone(RegionOfInterest.from_points([[0, 0], [2, 0], [0, 1]]))
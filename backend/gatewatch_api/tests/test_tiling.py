@@ -0,0 +1,41 @@
+import numpy as np
+from django.test import SimpleTestCase
+from ml_models.tiling import FrameTiler, choose_grid, merge_detections, tile_rects
+
+
+class TilingTests(SimpleTestCase):
+    def test_grid_follows_resolution(self):
+        self.assertEqual(choose_grid(640, 480), (1, 1))
+        self.assertEqual(choose_grid(1920, 1080), (2, 1))
+        self.assertEqual(choose_grid(3840, 2160), (4, 2))
+        cols, rows = choose_grid(7680, 4320, max_tiles=6)
+        self.assertLessEqual(cols * rows, 6)
+
+    def test_tiles_overlap_and_cover_frame(self):
+        rects = tile_rects(1920, 1080, 2, 1, overlap=0.2)
+        (ax1, _, ax2, _), (bx1, _, bx2, _) = rects
+        self.assertEqual(ax1, 0)
+        self.assertEqual(bx2, 1920)
+        self.assertLess(bx1, ax2)
+
+    def test_duplicates_across_tiles_are_merged(self):
+        boxes = np.array([
+            [100, 100, 200, 300, 0.9, 0],
+            [102, 98, 201, 302, 0.7, 0],    # same person seen by the neighbouring tile
+            [100, 100, 150, 300, 0.6, 0],   # partial body cut by a tile border
+            [100, 100, 200, 300, 0.8, 1],   # other class is kept
+        ])
+        merged = merge_detections(boxes)
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(sorted(merged[:, 5].tolist()), [0.0, 1.0])
+
+    def test_merge_maps_tile_boxes_to_crop_coordinates(self):
+        tiler = FrameTiler(tile_size=(416, 416), overlap=0.0)
+        frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        tiles, crop = tiler.tile(frame)
+        self.assertEqual(len(tiles), 2)
+        self.assertEqual(crop.shape, frame.shape)
+
+        # Box covering the whole second tile -> right half of the frame
+        merged = tiler.merge([np.zeros((0, 6)), np.array([[0, 0, 416, 416, 0.9, 0]])])
+        np.testing.assert_allclose(merged[0, :4], [960, 0, 1920, 1080])
@@ -0,0 +1,38 @@
+import numpy as np
+from django.test import SimpleTestCase
+from ml_models.track_motion import TrackExtrapolator, predicted_ltrb
+
+
+class FakeTrack:
+    """DeepSort-style track: Kalman state [x, y, a, h, vx, vy, va, vh]"""
+    def __init__(self, mean):
+        self.mean = np.array(mean, dtype=np.float64)
+
+    def to_ltrb(self):
+        x, y, a, h = self.mean[:4]
+        w = a * h
+        return x - w / 2, y - h / 2, x + w / 2, y + h / 2
+
+
+class TrackMotionTests(SimpleTestCase):
+    def test_zero_steps_matches_track_box(self):
+        track = FakeTrack([100, 200, 0.5, 80, 10, 0, 0, 0])
+        np.testing.assert_allclose(predicted_ltrb(track, 0), track.to_ltrb())
+
+    def test_boxes_move_a_fraction_of_a_step_per_frame(self):
+        track = FakeTrack([100, 200, 0.5, 80, 30, -15, 0, 0])
+        motion = TrackExtrapolator()
+        motion.reset([(track, 'payload')], interval=3)
+
+        (ltrb, payload), = motion.advance()
+        self.assertEqual(payload, 'payload')
+        # 1/3 of a step: x += 10, y -= 5
+        np.testing.assert_allclose(ltrb, [90, 155, 130, 235])
+
+    def test_extrapolation_is_capped(self):
+        track = FakeTrack([100, 200, 0.5, 80, 30, 0, 0, 0])
+        motion = TrackExtrapolator(max_steps=1.0)
+        motion.reset([(track, None)], interval=2)
+        for _ in range(10):
+            (ltrb, _), = motion.advance()
+        np.testing.assert_allclose(ltrb[0], 110)
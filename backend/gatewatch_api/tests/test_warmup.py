@@ -0,0 +1,19 @@
+from django.test import SimpleTestCase, override_settings
+from gatewatch_api.warmup import warm_up_model
+
+
+class RecordingModel:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, frames, **kwargs):
+        self.calls.append((len(frames), kwargs.get('imgsz')))
+        return []
+
+
+class WarmUpModelTests(SimpleTestCase):
+    @override_settings(YOLO_BATCH_MAX_SIZE=4, YOLO_WARMUP_RUNS=2)
+    def test_warms_single_frames_and_full_batch_at_the_served_size(self):
+        model = RecordingModel()
+        warm_up_model(model, imgsz=320)
+        self.assertEqual(model.calls, [(1, 320), (1, 320), (4, 320)])
@@ -0,0 +1,65 @@
+import os
+import signal
+import time
+import numpy as np
+from django.test import SimpleTestCase
+from ml_models.worker_pool import InferenceWorkerPool
+
+
+class StubModel:
+    """
+    Finds one box per frame, with the frame's first pixel value as its
+    confidence. A frame of 255 crashes the process, one of 254 hangs it.
+    """
+    names = {0: 'Compliant'}
+
+    def __call__(self, frames, **kwargs):
+        if not isinstance(frames, list):
+            return []
+        if frames[0][0, 0, 0] == 255:
+            os._exit(1)
+        if frames[0][0, 0, 0] == 254:
+            time.sleep(60)
+        return [np.array([[0, 0, 10, 10, float(frame[0, 0, 0]), 0]], dtype=np.float32) for frame in frames]
+
+
+def stub_loader(weights_path, **kwargs):
+    return StubModel()
+
+
+class InferenceWorkerPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = InferenceWorkerPool('stub.pt', num_workers=1, max_batch=2, frame_shape=(8, 8, 3),
+                                        timeout=2.0, start_timeout=60.0, loader=stub_loader)
+        self.addCleanup(self.pool.close)
+
+    def frames(self, *values):
+        return [np.full((8, 8, 3), value, dtype=np.uint8) for value in values]
+
+    def test_batch_runs_in_a_worker(self):
+        self.assertEqual(self.pool.names, {0: 'Compliant'})
+        boxes = self.pool(self.frames(3, 7))
+        self.assertEqual([float(b[0, 4]) for b in boxes], [3.0, 7.0])
+
+    def test_killed_worker_fails_its_batch_and_is_restarted(self):
+        worker = self.pool._workers[0]
+        os.kill(worker.process.pid, signal.SIGKILL)
+        worker.process.join(timeout=10)
+
+        with self.assertRaises(RuntimeError):
+            self.pool(self.frames(1))
+        self.assertEqual(self.pool.restarts, 1)
+        # The replacement serves the next batches
+        boxes = self.pool(self.frames(5))
+        self.assertEqual(float(boxes[0][0, 4]), 5.0)
+
+    def test_worker_dying_mid_batch_is_restarted(self):
+        with self.assertRaises(RuntimeError):
+            self.pool(self.frames(255))
+        self.assertEqual(float(self.pool(self.frames(4))[0][0, 4]), 4.0)
+
+    def test_hung_worker_times_out_and_is_restarted(self):
+        with self.assertRaises(RuntimeError):
+            self.pool(self.frames(254))
+        self.assertEqual(self.pool.restarts, 1)
+        self.assertEqual(float(self.pool(self.frames(6))[0][0, 4]), 6.0)
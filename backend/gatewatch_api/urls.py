@@ -5,7 +5,8 @@ from .views import (
     DashboardStatsView, RecentLogsView, SecurityStatsView, RecentAlertsView, 
     CameraDetectionsView, ComplianceLogListView, ComplianceDetectionListView, UserViewSet, GetUserProfileView, 
     CameraViewSet, CameraStreamWithDetection, CameraConnectionTestView, 
-    StartCameraStreamView, StopCameraStreamView, ActiveCamerasView,
+    StartCameraStreamView, StopCameraStreamView, ActiveCamerasView, CameraHealthView, PipelineReadyView,
+    ActiveModelView, ActivateModelView,
     unidentified_violations, identify_violation, violations_for_review,
     review_violation, student_violation_history, violation_analytics
 )
@@ -47,8 +48,16 @@ urlpatterns = [
     path('camera/<int:camera_id>/start-stream/', StartCameraStreamView.as_view(), name='camera-start-stream'),
     path('camera/<int:camera_id>/stop-stream/', StopCameraStreamView.as_view(), name='camera-stop-stream'),
     path('camera/active/', ActiveCamerasView.as_view(), name='active-cameras'),
+    path('camera/<int:camera_id>/health/', CameraHealthView.as_view(), name='camera-health'),
     path('camera/test-connection/', CameraConnectionTestView.as_view(), name='camera-test'),
     
+    # Health endpoints
+    path('health/ready/', PipelineReadyView.as_view(), name='health-ready'),
+    
+    # Detection model versions (hot swap)
+    path('models/active/', ActiveModelView.as_view(), name='models-active'),
+    path('models/activate/', ActivateModelView.as_view(), name='models-activate'),
+    
     # Violation Management endpoints
     path('violations/unidentified/', unidentified_violations, name='unidentified-violations'),
     path('violations/<int:violation_id>/identify/', identify_violation, name='identify-violation'),
@@ -11,10 +11,14 @@ from django.db.models import Count
 from django.db.models import Max
 from datetime import date, datetime, timedelta
 from django.utils import timezone
+from django.conf import settings
 from pathlib import Path
 import sys
+import threading
 import time
 from collections import defaultdict
+from ml_models.capture_hub import CaptureHubRegistry
+from ml_models.camera_health import CameraHealthRegistry
 
 # Import DeepSort for person tracking
 try:
@@ -30,11 +34,72 @@ _yolo_model_lock = None
 
 _deepsort_trackers = {}
 _deepsort_lock = None
+_deepsort_embedder = None
+_deepsort_embedder_lock = threading.Lock()
 _tracked_violations = {}
 
+_inference_schedulers = {}  # model input size -> BatchInferenceScheduler
+_inference_scheduler_lock = threading.Lock()
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+_person_scheduler = None
+_person_scheduler_lock = threading.Lock()
+
+_core_budget = None
+_core_budget_lock = threading.Lock()
+
+_model_registry = None
+_model_registry_lock = threading.Lock()
+
 active_streams = {}
 
-def get_yolo_model():
+# One capture + detection pipeline per camera, shared by everyone watching it
+_capture_hubs = CaptureHubRegistry()
+
+# Connection supervisor (health state, reconnect backoff) of each running camera pipeline
+_camera_health = CameraHealthRegistry()
+
+# Seconds without a camera frame before the connection is dropped and reopened
+CAMERA_READ_TIMEOUT = 10.0
+
+# Model input size used unless a camera's input size has been tuned (see ml_models/resolution.py)
+DEFAULT_INPUT_SIZE = 416
+
+def load_yolo_weights(model_path, input_sizes=(DEFAULT_INPUT_SIZE,)):
+    """
+    Load a YOLO model in this process with the configured backend/precision (and GPU if available).
+    Latency is measured at each input size the model will serve.
+    """
+    from ml_models.backends import load_detector, measure_latency
+    backend = getattr(settings, 'YOLO_BACKEND', 'torch')
+    precision = getattr(settings, 'YOLO_PRECISION', 'fp32')
+    compile_mode = getattr(settings, 'YOLO_COMPILE', 'none')
+    print(f"[YOLO] Loading model from: {model_path} (backend: {backend}, precision: {precision}, compile: {compile_mode})", flush=True)
+
+    model = load_detector(model_path, backend=backend, imgsz=416, precision=precision, compile_mode=compile_mode)
+
+    # Check if CUDA is available and move model to GPU (PyTorch backend only)
+    if backend == 'torch':
+        try:
+            import torch
+            if torch.cuda.is_available():
+                model.to('cuda')
+                print(f"[YOLO] ✅ Model moved to GPU (CUDA available)", flush=True)
+            else:
+                print(f"[YOLO] ⚠️ CUDA not available, using CPU", flush=True)
+        except ImportError:
+            print(f"[YOLO] ⚠️ PyTorch not available for GPU check, using default device", flush=True)
+
+    print(f"[YOLO] Model loaded successfully", flush=True)
+    print(f"[YOLO] Model classes: {model.names}", flush=True)
+    for input_size in input_sizes:
+        latency_ms = measure_latency(model, frame_size=416, imgsz=input_size)
+        print(f"[YOLO] {backend} backend latency at input {input_size}: {latency_ms:.1f} ms/frame", flush=True)
+    return model
+
+def get_yolo_model(input_size=DEFAULT_INPUT_SIZE):
     global _yolo_model, _yolo_model_lock
 
     # Initialize lock on first call
@@ -47,32 +112,252 @@ def get_yolo_model():
             # Double-check after acquiring lock
             if _yolo_model is None:
                 try:
-                    from ultralytics import YOLO
-                    # best.pt is in the root of gatewatch-backend
-                    model_path = Path(__file__).resolve().parent.parent / 'best.pt'
-                    print(f"[YOLO] Loading model from: {model_path}", flush=True)
-
-                    # Load YOLO model with GPU support if available
-                    _yolo_model = YOLO(str(model_path))
-
-                    # Check if CUDA is available and move model to GPU
-                    try:
-                        import torch
-                        if torch.cuda.is_available():
-                            _yolo_model.to('cuda')
-                            print(f"[YOLO] ✅ Model moved to GPU (CUDA available)", flush=True)
-                        else:
-                            print(f"[YOLO] ⚠️ CUDA not available, using CPU", flush=True)
-                    except ImportError:
-                        print(f"[YOLO] ⚠️ PyTorch not available for GPU check, using default device", flush=True)
-
-                    print(f"[YOLO] Model loaded successfully", flush=True)
-                    print(f"[YOLO] Model classes: {_yolo_model.names}", flush=True)
+                    # Active version from the model registry (best.pt in the backend root by default)
+                    _yolo_model = load_yolo_weights(get_model_registry().active_weights(), input_sizes=(input_size,))
                 except Exception as e:
                     print(f"[YOLO] Error loading model: {str(e)}", flush=True)
                     raise
     return _yolo_model
 
+def create_worker_pool(model_path):
+    """Inference worker processes (INFERENCE_WORKERS) for the given weights; stands in for the model"""
+    from ml_models.worker_pool import InferenceWorkerPool
+    num_workers = getattr(settings, 'INFERENCE_WORKERS', 0)
+    budget = get_core_budget()
+    print(f"[YOLO] Starting {num_workers} inference worker process(es) for {model_path}...", flush=True)
+    pool = InferenceWorkerPool(
+        model_path,
+        num_workers=num_workers,
+        backend=getattr(settings, 'YOLO_BACKEND', 'torch'),
+        precision=getattr(settings, 'YOLO_PRECISION', 'fp32'),
+        compile_mode=getattr(settings, 'YOLO_COMPILE', 'none'),
+        max_batch=getattr(settings, 'YOLO_BATCH_MAX_SIZE', 8),
+        core_sets=budget.inference if budget else None,
+        timeout=getattr(settings, 'INFERENCE_WORKER_TIMEOUT_SECONDS', 30.0),
+        conf=0.4,
+        verbose=False,
+    )
+    print(f"[YOLO] ✅ Inference workers ready (classes: {pool.names})", flush=True)
+    return pool
+
+def get_model_registry():
+    """
+    Model versions under MODEL_REGISTRY_DIR (see ml_models/registry.py).
+    Activating a version loads and warms it up in the background, then swaps
+    it into the batch scheduler between batches; live streams keep running.
+    """
+    global _model_registry
+
+    if _model_registry is None:
+        with _model_registry_lock:
+            if _model_registry is None:
+                from ml_models.registry import ModelRegistry
+                _model_registry = ModelRegistry(
+                    models_dir=getattr(settings, 'MODEL_REGISTRY_DIR', Path(__file__).resolve().parent.parent / 'models'),
+                    default_weights=Path(__file__).resolve().parent.parent / 'best.pt',
+                    load=_load_model_version,
+                    swap=_swap_model_version,
+                )
+    return _model_registry
+
+def _load_model_version(model_path):
+    """Registry loader: build and warm up the next model while the current one keeps serving"""
+    from .warmup import warm_up_model
+    # The new model serves every scheduler that exists now
+    input_sizes = sorted(_inference_schedulers) or [DEFAULT_INPUT_SIZE]
+    if getattr(settings, 'INFERENCE_WORKERS', 0) > 0:
+        model = create_worker_pool(model_path)
+    else:
+        model = load_yolo_weights(model_path, input_sizes=input_sizes)
+    for input_size in input_sizes:
+        warm_up_model(model, imgsz=input_size)
+    return model
+
+def _swap_model_version(model, version):
+    """Registry swap: install the new model between batches, then free the old one"""
+    global _yolo_model, _worker_pool
+    import gc
+    from ml_models.worker_pool import InferenceWorkerPool
+
+    with _inference_scheduler_lock:
+        old = _worker_pool if isinstance(model, InferenceWorkerPool) else _yolo_model
+        if isinstance(model, InferenceWorkerPool):
+            _worker_pool = model
+        else:
+            _yolo_model = model
+        schedulers = list(_inference_schedulers.values())
+
+    # swap_model only returns once no batch is running on the old model
+    for scheduler in schedulers:
+        scheduler.swap_model(model)
+    if isinstance(old, InferenceWorkerPool):
+        old.close()
+    del old
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+def get_core_budget():
+    """
+    CPU partition between inference and camera streams (see ml_models/cpu_budget.py),
+    or None when CPU_BUDGET_ENABLED is off. Caps this process's torch/OpenCV
+    thread pools on first use and prints the partition.
+    """
+    global _core_budget
+
+    if not getattr(settings, 'CPU_BUDGET_ENABLED', False):
+        return None
+
+    if _core_budget is None:
+        with _core_budget_lock:
+            if _core_budget is None:
+                from ml_models.cpu_budget import CoreBudget, limit_library_threads
+                num_workers = getattr(settings, 'INFERENCE_WORKERS', 0)
+                budget = CoreBudget(
+                    inference_pools=max(1, num_workers),
+                    camera_slots=getattr(settings, 'CPU_BUDGET_CAMERAS', 4),
+                    reserved=getattr(settings, 'CPU_BUDGET_RESERVED_CORES', 1),
+                    inference_share=getattr(settings, 'CPU_BUDGET_INFERENCE_SHARE', 0.5),
+                )
+                # In-process inference owns this process's torch pool; with worker
+                # processes only the DeepSort embedder uses it here
+                limit_library_threads(len(budget.inference_cores(0)) if num_workers == 0 else len(budget.streams[0]))
+
+                print("[CPU] Core partition:", flush=True)
+                for line in budget.report():
+                    print(f"[CPU]   {line}", flush=True)
+                _core_budget = budget
+    return _core_budget
+
+def get_detection_model(input_size=DEFAULT_INPUT_SIZE):
+    """
+    The model behind every inference scheduler: the in-process YOLO model,
+    or the worker pool when INFERENCE_WORKERS is set. input_size is the
+    size of the scheduler asking, which a first load measures latency at.
+    """
+    global _worker_pool
+
+    if getattr(settings, 'INFERENCE_WORKERS', 0) <= 0:
+        return get_yolo_model(input_size)
+
+    if _worker_pool is None:
+        with _worker_pool_lock:
+            if _worker_pool is None:
+                # Inference in separate processes; the pool stands in for the model
+                _worker_pool = create_worker_pool(get_model_registry().active_weights())
+    return _worker_pool
+
+def get_inference_scheduler(input_size=DEFAULT_INPUT_SIZE):
+    """
+    Shared scheduler that batches detection frames from all active streams
+    into one YOLO predict call per tick (see ml_models/batching.py). One
+    scheduler per model input size, since a batch runs at a single size;
+    they all share the same model.
+    """
+    scheduler = _inference_schedulers.get(input_size)
+    if scheduler is None:
+        get_detection_model(input_size)  # load outside the lock
+        with _inference_scheduler_lock:
+            scheduler = _inference_schedulers.get(input_size)
+            if scheduler is None:
+                from ml_models.batching import BatchInferenceScheduler
+                from ml_models.cpu_budget import pin_current_thread
+                max_batch_size = getattr(settings, 'YOLO_BATCH_MAX_SIZE', 8)
+                max_wait_ms = getattr(settings, 'YOLO_BATCH_MAX_WAIT_MS', 15)
+                num_workers = getattr(settings, 'INFERENCE_WORKERS', 0)
+                budget = get_core_budget()
+
+                # Re-read under the lock: a hot swap may have replaced the model meanwhile
+                model = _worker_pool if num_workers > 0 else _yolo_model
+                scheduler = BatchInferenceScheduler(
+                    model,
+                    max_batch_size=max_batch_size,
+                    max_wait=max_wait_ms / 1000.0,
+                    concurrency=max(1, num_workers),
+                    # In-process inference runs on the dispatcher thread: keep it on the inference cores
+                    thread_initializer=(lambda index: pin_current_thread(budget.inference_cores(0)))
+                    if budget and num_workers == 0 else None,
+                    imgsz=input_size,
+                    conf=0.4,
+                    verbose=False,
+                )
+                _inference_schedulers[input_size] = scheduler
+                print(f"[YOLO] Batch scheduler ready (input: {input_size}, max batch: {max_batch_size}, max wait: {max_wait_ms}ms, workers: {num_workers})", flush=True)
+    return scheduler
+
+def get_person_scheduler():
+    """
+    Batch scheduler for the tiny person detector that is the first stage of
+    the compliance cascade (Camera.cascade_enabled). Runs in-process.
+    """
+    global _person_scheduler
+
+    if _person_scheduler is None:
+        with _person_scheduler_lock:
+            if _person_scheduler is None:
+                from ml_models.backends import load_detector, measure_latency
+                from ml_models.batching import BatchInferenceScheduler
+                from ml_models.cpu_budget import pin_current_thread
+                budget = get_core_budget()
+                weights = getattr(settings, 'CASCADE_PERSON_WEIGHTS', 'yolov8n.pt')
+                imgsz = getattr(settings, 'CASCADE_PERSON_IMGSZ', 320)
+                # Weights that are not on disk yet are downloaded by ultralytics (PyTorch only)
+                backend = getattr(settings, 'YOLO_BACKEND', 'torch') if Path(weights).exists() else 'torch'
+                print(f"[CASCADE] Loading person detector: {weights} (backend: {backend}, imgsz: {imgsz})", flush=True)
+
+                person_model = load_detector(weights, backend=backend, imgsz=imgsz)
+                latency_ms = measure_latency(person_model, frame_size=imgsz)
+                print(f"[CASCADE] Person detector latency: {latency_ms:.1f} ms/frame", flush=True)
+
+                _person_scheduler = BatchInferenceScheduler(
+                    person_model,
+                    max_batch_size=getattr(settings, 'YOLO_BATCH_MAX_SIZE', 8),
+                    max_wait=getattr(settings, 'YOLO_BATCH_MAX_WAIT_MS', 15) / 1000.0,
+                    thread_initializer=(lambda index: pin_current_thread(budget.inference_cores(0))) if budget else None,
+                    classes=[0],  # COCO 'person'
+                    imgsz=imgsz,
+                    conf=0.35,
+                    verbose=False,
+                )
+    return _person_scheduler
+
+def get_deepsort_embedder():
+    """
+    Appearance embedder shared by every camera's DeepSort tracker, so it is
+    loaded (and warmed) once per process instead of once per camera
+    """
+    global _deepsort_embedder
+
+    if _deepsort_embedder is None:
+        with _deepsort_embedder_lock:
+            if _deepsort_embedder is None:
+                # DeepSort builds the embedder from these options; only the embedder is kept
+                _deepsort_embedder = DeepSort(
+                    embedder="mobilenet",    # Feature extractor (fast)
+                    half=True,               # Use FP16 for speed
+                    bgr=True,                # OpenCV uses BGR
+                    embedder_gpu=True        # Use GPU if available
+                ).embedder
+                print("[DEEPSORT] Embedder loaded", flush=True)
+    return _deepsort_embedder
+
+def create_deepsort_tracker():
+    """DeepSort instance with the parameters used for every camera, using the shared embedder"""
+    tracker = DeepSort(
+        max_age=30,              # Frames to keep alive lost tracks
+        n_init=3,                # Frames to confirm a track
+        nms_max_overlap=1.0,     # NMS threshold
+        max_cosine_distance=0.3, # Appearance similarity threshold
+        nn_budget=None,          # No limit on appearance samples
+        embedder=None,           # Set below: one embedder for all cameras
+    )
+    tracker.embedder = get_deepsort_embedder()
+    return tracker
+
 def get_deepsort_tracker(camera_id):
     global _deepsort_trackers, _deepsort_lock
     
@@ -89,17 +374,7 @@ def get_deepsort_tracker(camera_id):
             if camera_id not in _deepsort_trackers:
                 try:
                     # Initialize DeepSort with optimized parameters
-                    _deepsort_trackers[camera_id] = DeepSort(
-                        max_age=30,              # Frames to keep alive lost tracks
-                        n_init=3,                # Frames to confirm a track
-                        nms_max_overlap=1.0,     # NMS threshold
-                        max_cosine_distance=0.3, # Appearance similarity threshold
-                        nn_budget=None,          # No limit on appearance samples
-                        embedder="mobilenet",    # Feature extractor (fast)
-                        half=True,               # Use FP16 for speed
-                        bgr=True,                # OpenCV uses BGR
-                        embedder_gpu=True        # Use GPU if available
-                    )
+                    _deepsort_trackers[camera_id] = create_deepsort_tracker()
                     _tracked_violations[camera_id] = {}  # Track recorded violations
                     print(f"[DEEPSORT] ✅ Initialized tracker for Camera {camera_id}", flush=True)
                 except Exception as e:
@@ -424,6 +699,8 @@ class StopCameraStreamView(APIView):
                     print(f"[CAMERA {camera_id}] Stop signal sent to stream thread", flush=True)
                 # Remove from active streams
                 active_streams.pop(camera_id, None)
+            # Ends the shared pipeline for every viewer of this camera
+            _capture_hubs.stop(camera_id)
             
             try:
                 # Clean up DeepSort tracker for this camera
@@ -442,6 +719,61 @@ class StopCameraStreamView(APIView):
             return Response({'error': 'Camera not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+class PipelineReadyView(APIView):
+    """
+    Readiness probe for the detection pipeline: 200 once the model (and
+    optionally the DeepSort embedder) is loaded and warmed up, 503 before that
+    """
+    permission_classes = []
+    authentication_classes = []
+
+    def get(self, request):
+        from .warmup import pipeline_status
+        state = pipeline_status()
+        http_status = status.HTTP_200_OK if state['ready'] else status.HTTP_503_SERVICE_UNAVAILABLE
+        return Response(state, status=http_status)
+
+
+class ActiveModelView(APIView):
+    """
+    Active uniform detector version, the versions available under models/,
+    and the state of any hot swap in progress
+    """
+    permission_classes = []
+    authentication_classes = []
+
+    def get(self, request):
+        return Response(get_model_registry().status(), status=status.HTTP_200_OK)
+
+
+class ActivateModelView(APIView):
+    """
+    Hot-swap the uniform detector to another version without restarting
+    Django or dropping live streams (admin only). Loading and warm-up run in
+    the background; poll the active model endpoint for the result.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def post(self, request):
+        version = request.data.get('version')
+        if not version:
+            return Response({'error': 'version is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        registry = get_model_registry()
+        try:
+            if not _inference_schedulers and _yolo_model is None and _worker_pool is None:
+                # Nothing loaded yet: the next load simply picks up the new version
+                registry.select(version)
+                return Response(registry.status(), status=status.HTTP_200_OK)
+            registry.activate(version)
+        except (ValueError, FileNotFoundError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except RuntimeError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+        return Response(registry.status(), status=status.HTTP_202_ACCEPTED)
+
+
 class ActiveCamerasView(APIView):
     """
     Get all currently streaming cameras (for Admin monitoring)
@@ -454,10 +786,30 @@ class ActiveCamerasView(APIView):
         serializer = CameraSerializer(active_cameras, many=True)
         return Response({
             'count': active_cameras.count(),
-            'cameras': serializer.data
+            'cameras': serializer.data,
+            # Viewers per running detection pipeline (camera id -> count)
+            'viewers': {camera_id: hub['subscribers'] for camera_id, hub in _capture_hubs.status().items()},
+            # Connection health per running camera (connecting/live/degraded/down)
+            'health': camera_health_status(),
         }, status=status.HTTP_200_OK)
 
 
+class CameraHealthView(APIView):
+    """
+    Connection health of one camera's stream: state (connecting, live,
+    degraded, down), last_frame_at, failed attempts and reconnects.
+    The state is 'stopped' while no pipeline runs for the camera.
+    """
+    permission_classes = []  # Temporarily allow unauthenticated for testing
+    authentication_classes = []
+
+    def get(self, request, camera_id):
+        if not Camera.objects.filter(id=camera_id).exists():
+            return Response({'error': 'Camera not found'}, status=status.HTTP_404_NOT_FOUND)
+        health = camera_health_status().get(camera_id) or {'state': 'stopped', 'last_frame_at': None}
+        return Response({'camera_id': camera_id, **health}, status=status.HTTP_200_OK)
+
+
 class CameraConnectionTestView(APIView):
     """
     Test view to check if a camera URL is accessible
@@ -559,7 +911,7 @@ class CameraStreamProxyView(APIView):
                 from django.urls import reverse
                 
                 # Redirect to the CameraStreamWithDetection endpoint which handles RTSP properly with OpenCV
-                detection_url = reverse('camera-stream-detection', kwargs={'camera_id': camera_id})
+                detection_url = reverse('camera-stream', kwargs={'camera_id': camera_id})
                 return HttpResponseRedirect(detection_url)
 
             # Fetch the stream from the camera's URL (HTTP/HTTPS only)
@@ -599,11 +951,7 @@ class CameraStreamProxyView(APIView):
                         print(f"[CAMERA] Error parsing credentials: {str(e)}")
 
                 # Try multiple common Android IP Webcam endpoints
-                possible_urls = [
-                    camera_url,  # Original URL
-                    camera_url.rstrip('/') + '/video',  # /video endpoint
-                    camera_url.rstrip('/') + '/stream',  # /stream endpoint
-                ]
+                possible_urls = http_stream_urls(camera_url)
 
                 for url in possible_urls:
                     try:
@@ -732,6 +1080,12 @@ class CameraStreamProxyView(APIView):
             # For MJPEG streams, we need to handle them differently
             if 'multipart/x-mixed-replace' in content_type or 'image/jpeg' in content_type:
                 print("[CAMERA] Detected MJPEG stream")
+                if getattr(settings, 'HTTP_CAMERA_DETECTION', True):
+                    # Same detection pipeline as RTSP cameras (which demuxes the MJPEG itself)
+                    response.close()
+                    from django.http import HttpResponseRedirect
+                    from django.urls import reverse
+                    return HttpResponseRedirect(reverse('camera-stream', kwargs={'camera_id': camera_id}))
                 # For MJPEG, we might need to serve it as an image stream
                 content_type = 'multipart/x-mixed-replace; boundary=frame'
 
@@ -802,455 +1156,893 @@ class CameraStreamProxyView(APIView):
             )
 
 
+def http_stream_urls(stream_url):
+    """URLs to try for an HTTP camera: Android IP Webcam serves its MJPEG stream under /video (or /stream)"""
+    if '8080' in stream_url:
+        base = stream_url.rstrip('/')
+        return [stream_url, base + '/video', base + '/stream']
+    return [stream_url]
+
+
+def detector_output_dir():
+    """Where `manage.py run_detectors` publishes each camera's latest frame"""
+    import tempfile
+    return getattr(settings, 'DETECTOR_OUTPUT_DIR', None) or str(Path(tempfile.gettempdir()) / 'gatewatch-detectors')
+
+
+def detector_health_path():
+    """Where `manage.py run_detectors` publishes the connection health of its cameras"""
+    return Path(detector_output_dir()) / 'health.json'
+
+
+def camera_health_status():
+    """Connection health per camera id, from this process's pipelines or the detection daemon's"""
+    if getattr(settings, 'DETECTION_DAEMON', False):
+        from ml_models.camera_health import read_health_file
+        return read_health_file(detector_health_path(), max_age=getattr(settings, 'DETECTOR_STALE_SECONDS', 5.0))
+    return _camera_health.status()
+
+
+def detector_frames(camera):
+    """
+    MJPEG frames of a camera as published by the detection daemon. Shows a
+    placeholder while the daemon hasn't produced a recent frame for it.
+    """
+    import cv2
+    import numpy as np
+    from ml_models.frame_exchange import FrameFileReader
+    
+    reader = FrameFileReader(detector_output_dir(), camera.id)
+    stale_after = getattr(settings, 'DETECTOR_STALE_SECONDS', 5.0)
+    placeholder = None
+    while True:
+        part, _ = reader.read(timeout=stale_after)
+        if part is not None and reader.age() < stale_after:
+            yield part
+            continue
+        
+        if placeholder is None:
+            waiting_frame = np.zeros((450, 800, 3), dtype=np.uint8)
+            cv2.putText(waiting_frame, f"Camera: {camera.name} | Waiting for detector...", (10, 30),
+                      cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 200), 2)
+            _, buffer = cv2.imencode('.jpg', waiting_frame)
+            placeholder = (b'--frame\r\n'
+                           b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+        yield placeholder
+        if part is None:
+            continue
+        time.sleep(1.0)
+
+
 # New RTSP Camera Stream with YOLO Detection
-class CameraStreamWithDetection(APIView):
+def detection_pipeline(camera):
     """
-    Stream RTSP cameras with real-time YOLO uniform detection and violation capture
+    MJPEG frames of one camera with YOLO detection, tracking and violation capture.
+    Runs once per camera on its capture hub thread: started by the first viewer,
+    or kept running headless by `manage.py run_detectors`.
     """
-    permission_classes = []
-    authentication_classes = []
+    import cv2
+    import numpy as np
+    from django.db import connection
+    from ml_models.backends import boxes_to_array
+    from ml_models.motion import MotionGate
+    from ml_models.rate_control import AdaptiveRateController
+    from ml_models.roi import RegionOfInterest
+    from ml_models.preprocess import FramePreprocessor
+    from ml_models.tiling import FrameTiler
+    from ml_models.cascade import ComplianceCascade, use_cascade
+    from ml_models.track_motion import TrackExtrapolator
+    from ml_models.cpu_budget import pin_current_thread
+    from ml_models.preprocess import crop_transform
+    from ml_models.resolution import INPUT_SIZES, ResolutionTuner
+    from ml_models.capture import LatestFrameReader
+    from ml_models.ffmpeg_capture import FFmpegCapture
+    from ml_models.mjpeg import MJPEGCapture
+    from ml_models.power_mode import LOW_POWER, DecodeModeController, scheduled_mode
+    from ml_models.camera_health import Backoff, CameraSupervisor
+    from .camera_config import CachedCamera
     
-    def get(self, request, camera_id):
-        """Stream camera with YOLO detection"""
-        import cv2
-        import numpy as np
-        from django.http import StreamingHttpResponse, HttpResponse
-        from django.core.files.base import ContentFile
-        import uuid
+    camera_id = camera.id
+    cap = None
+    reader = None
+    supervisor = None
+    frame_count = 0
+    
+    def render_frame(display_frame):
+        """Add the status overlay and wrap the frame as an MJPEG part"""
+        status_text = f"Camera: {camera.name} | Location: {camera.location}"
+        cv2.putText(display_frame, status_text, (10, 30),
+                  cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
         
-        try:
-            camera = Camera.objects.get(id=camera_id, is_active=True)
-        except Camera.DoesNotExist:
-            return HttpResponse("Camera not found or inactive", status=404)
+        # Encode frame to JPEG with high quality for clear visuals
+        _, buffer = cv2.imencode('.jpg', display_frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        return (b'--frame\r\n'
+                b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+    
+    # Preallocated display (800x450) and detection (416x416) buffers for this camera
+    preprocessor = FramePreprocessor(display_size=(800, 450), detection_size=(416, 416))
+    
+    def in_roi(roi, x1, y1, x2, y2):
+        """Whether a box's centroid (display frame coordinates) lies inside the camera ROI"""
+        display_w, display_h = preprocessor.display_size
+        return roi is None or roi.contains((x1 + x2) / 2 / display_w, (y1 + y2) / 2 / display_h)
+    
+    def draw_overlays(display_frame, overlays):
+        """Redraw boxes and labels kept from the last detection frame"""
+        for x1, y1, x2, y2, color, label_text in overlays:
+            cv2.rectangle(display_frame, (x1, y1), (x2, y2), color, 2)
+            (text_width, text_height), baseline = cv2.getTextSize(label_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+            cv2.putText(display_frame, label_text, (x1 + 2, y1 - baseline - 2), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    
+    # Create a stop event for this stream
+    import threading
+    stop_event = threading.Event()
+    active_streams[camera_id] = {'stop_event': stop_event}
+    print(f"[CAMERA {camera_id}] Stream registered with stop event", flush=True)
+    
+    # Stagger camera connections to avoid simultaneous RTSP requests
+    stagger_delay = (camera_id % 4) * 0.5
+    if stagger_delay > 0:
+        print(f"[CAMERA {camera_id}] Staggering connection by {stagger_delay}s", flush=True)
+        time.sleep(stagger_delay)
+    
+    previous_affinity = None
+    try:
+        # Load YOLO model (singleton, loaded once) and join the shared batch scheduler
+        scheduler = get_inference_scheduler()
+        model = scheduler.model
+        scheduler.register(camera_id)
         
-        print(f"[CAMERA {camera_id}] Starting stream for: {camera.name}", flush=True)
+        # Keep this stream's decode/preprocess/tracking work on its own camera cores
+        budget = get_core_budget()
+        if budget is not None:
+            stream_cores = budget.next_stream_cores()
+            previous_affinity = pin_current_thread(stream_cores)
+            print(f"[CAMERA {camera_id}] Pinned to cores {stream_cores}", flush=True)
         
-        def generate_frames_with_detection():
-            """Generator that yields MJPEG frames with YOLO detection and violation capture"""
-            cap = None
-            frame_count = 0
+        # Motion gate: skip YOLO and DeepSort entirely while the scene is static
+        motion_gate = MotionGate(sensitivity=camera.motion_sensitivity) if camera.motion_gate_enabled else None
+        active_streams[camera_id]['motion_gate'] = motion_gate
+        
+        # Adaptive detection rate: run detection on 1 of every N frames, with N
+        # adjusted from measured latency and CPU load to hit the FPS budget
+        rate_controller = AdaptiveRateController(
+            target_fps=getattr(settings, 'DETECTION_TARGET_FPS', 8),
+            max_interval=getattr(settings, 'DETECTION_MAX_INTERVAL', 15),
+            cpu_high=getattr(settings, 'DETECTION_CPU_HIGH', 85),
+        )
+        active_streams[camera_id]['rate_controller'] = rate_controller
+        last_overlays = []  # Boxes from the last detection, redrawn on skipped frames
+        
+        # DeepSort tracks keep moving on skipped frames with their Kalman motion model
+        track_motion = TrackExtrapolator()
+        last_to_display = None
+        
+        # Region of interest (rebuilt whenever the stored polygon changes)
+        roi_points = None
+        roi = None
+        
+        # Tiled inference for distant subjects (camera.tiled_inference); all tiles go in one batch
+        tiler = FrameTiler(
+            tile_size=(416, 416),
+            overlap=getattr(settings, 'TILED_INFERENCE_OVERLAP', 0.2),
+            max_tiles=min(getattr(settings, 'TILED_INFERENCE_MAX_TILES', 8), scheduler.max_batch_size),
+        )
+        
+        # Compliance cascade (camera.cascade_enabled, needs DeepSort): created on first use
+        cascade = None
+        person_scheduler = None
+        cascade_fallback_logged = False
+        
+        # Model input size: tuned from the camera's own detections (camera.auto_input_size)
+        # or fixed (camera.input_size); each size has its own batch scheduler
+        resolution_tuner = ResolutionTuner(
+            initial_size=camera.input_size,
+            tuned_at=camera.input_size_tuned_at.timestamp() if camera.input_size_tuned_at else None,
+            target_recall=getattr(settings, 'INPUT_SIZE_TARGET_RECALL', 0.95),
+            retune_interval=getattr(settings, 'INPUT_SIZE_RETUNE_SECONDS', 1800),
+        )
+        active_streams[camera_id]['resolution_tuner'] = resolution_tuner
+        active_detector = scheduler  # The scheduler this camera is registered with
+        
+        # Camera settings are edited while the stream runs: reload them when a save or delete
+        # (in any process) bumps the camera's version instead of querying every frame
+        camera_config = CachedCamera(camera)
+        
+        # Decode mode: keyframes only while the camera is idle (camera.decode_mode 'auto') or when its
+        # setting or schedule forces it; switching reopens the stream with the other decoder options
+        decode_modes = DecodeModeController(idle_after=getattr(settings, 'LOW_POWER_IDLE_SECONDS', 60.0))
+        active_streams[camera_id]['decode_mode'] = decode_modes
+        reader_mode = None  # Mode the open stream decodes in
+        low_power_next = 0.0
+        
+        # Connection supervisor: reopens the stream with exponential backoff and jitter
+        # whenever it breaks, and keeps the camera's health state for the API
+        supervisor = _camera_health.add(CameraSupervisor(
+            camera_id,
+            backoff=Backoff(
+                base=getattr(settings, 'CAMERA_RECONNECT_BASE_SECONDS', 1.0),
+                maximum=getattr(settings, 'CAMERA_RECONNECT_MAX_SECONDS', 30.0),
+            ),
+            degraded_after=getattr(settings, 'CAMERA_DEGRADED_SECONDS', 3.0),
+            lost_after=CAMERA_READ_TIMEOUT,
+        ))
+        decoder = getattr(settings, 'CAMERA_DECODER', 'opencv')
+        
+        def open_capture(low_power=False):
+            if camera.stream_url.startswith(('http://', 'https://')) and getattr(settings, 'MJPEG_NATIVE_DEMUX', False):
+                # MJPEG over HTTP: split the multipart body ourselves and decode only the frames
+                # the loop takes, at reduced size when the camera's resolution allows. ROI crops and
+                # tiles need the camera's full resolution.
+                min_width = 0 if camera.tiled_inference or camera.roi_polygon else getattr(settings, 'MJPEG_DECODE_MIN_WIDTH', 800)
+                errors = []
+                for url in http_stream_urls(camera.stream_url):
+                    # Every endpoint gets its chance: the bare URL often 404s where /video serves the stream
+                    capture = MJPEGCapture.open(url, min_width=min_width)
+                    if capture.isOpened():
+                        print(f"[CAMERA {camera_id}] MJPEG stream at {url}", flush=True)
+                        return capture
+                    errors.append(f"{url}: {capture.error}")
+                # No MJPEG anywhere (e.g. HLS or MP4 over HTTP, or all endpoints failed): let the decoder try
+                print(f"[CAMERA {camera_id}] No MJPEG stream ({'; '.join(errors)}), falling back to the decoder", flush=True)
+            if low_power:
+                # Idle: ffmpeg skips decoding everything but keyframes, whatever CAMERA_DECODER says
+                capture = FFmpegCapture(
+                    camera.stream_url,
+                    width=getattr(settings, 'FFMPEG_DECODE_WIDTH', 1280) or None,
+                    rtsp_transport=getattr(settings, 'FFMPEG_RTSP_TRANSPORT', 'tcp'),
+                    skip_frame=getattr(settings, 'LOW_POWER_SKIP_FRAME', 'nokey'),
+                )
+                if capture.isOpened():
+                    return capture
+                print(f"[CAMERA {camera_id}] Low-power decode unavailable ({capture.error or 'ffmpeg failed'}), "
+                      f"decoding every frame", flush=True)
+            if decoder == 'ffmpeg':
+                # ffmpeg subprocess decodes, scales and drops frames natively; we only read raw BGR
+                capture = FFmpegCapture(
+                    camera.stream_url,
+                    width=getattr(settings, 'FFMPEG_DECODE_WIDTH', 1280) or None,
+                    fps=getattr(settings, 'FFMPEG_DECODE_FPS', 15) or None,
+                    rtsp_transport=getattr(settings, 'FFMPEG_RTSP_TRANSPORT', 'tcp'),
+                )
+                return capture
+            capture = cv2.VideoCapture(camera.stream_url, cv2.CAP_FFMPEG)
+            capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            return capture
+        
+        def reconnect_frame():
+            """Placeholder shown while waiting for the next connection attempt"""
+            health = supervisor.status()
+            waiting_frame = np.zeros((450, 800, 3), dtype=np.uint8)
+            cv2.putText(waiting_frame, f"Camera {health['state']}: reconnecting in {supervisor.retry_in():.0f}s "
+                      f"(attempt {health['failures'] + 1})", (10, 225), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
+            return render_frame(waiting_frame)
+        
+        print(f"[CAMERA {camera_id}] Starting detection loop", flush=True)
+        
+        while True:
+            # Check if stop was requested
+            if stop_event.is_set():
+                print(f"[CAMERA {camera_id}] Stop requested, ending stream", flush=True)
+                break
             
-            # Create a stop event for this stream
-            import threading
-            stop_event = threading.Event()
-            active_streams[camera_id] = {'stop_event': stop_event}
-            print(f"[CAMERA {camera_id}] Stream registered with stop event", flush=True)
+            # Check if camera is still active (reloaded from the database only when it changed)
+            camera_config.refresh()
+            if not camera_config.is_active:
+                print(f"[CAMERA {camera_id}] Camera deactivated, ending stream", flush=True)
+                break
             
-            # Stagger camera connections to avoid simultaneous RTSP requests
-            stagger_delay = (camera_id % 4) * 0.5
-            if stagger_delay > 0:
-                print(f"[CAMERA {camera_id}] Staggering connection by {stagger_delay}s", flush=True)
-                import time
-                time.sleep(stagger_delay)
+            # Motion gate switched on or off since the stream started
+            if camera.motion_gate_enabled != (motion_gate is not None):
+                motion_gate = MotionGate(sensitivity=camera.motion_sensitivity) if camera.motion_gate_enabled else None
+                active_streams[camera_id]['motion_gate'] = motion_gate
+                print(f"[CAMERA {camera_id}] Motion gate {'enabled' if motion_gate is not None else 'disabled'}", flush=True)
             
-            try:
-                # Load YOLO model (singleton, loaded once)
-                model = get_yolo_model()
+            decode_mode = decode_modes.update(camera.decode_mode, scheduled_mode(camera.decode_schedule, timezone.localtime()))
+            if reader is not None and decode_mode != reader_mode:
+                print(f"[CAMERA {camera_id}] Switching to {decode_mode} decode (idle for {decode_modes.idle_for:.0f}s)", flush=True)
+                if isinstance(reader, MJPEGCapture):
+                    # Every MJPEG frame is a keyframe: low power only processes fewer of them
+                    reader_mode = decode_mode
+                else:
+                    active_streams[camera_id].pop('reader', None)
+                    reader.release()
+                    reader = cap = None
+            
+            if reader is None:
+                retry_in = supervisor.retry_in()
+                if retry_in > 0:
+                    # Keep viewers connected (and the checks above running) until the next attempt
+                    yield reconnect_frame()
+                    stop_event.wait(min(retry_in, 1.0))
+                    continue
                 
-                # Try connecting with retries
-                max_retries = 3
-                for attempt in range(max_retries):
-                    print(f"[CAMERA {camera_id}] Connection attempt {attempt + 1}/{max_retries}", flush=True)
-                    cap = cv2.VideoCapture(camera.stream_url, cv2.CAP_FFMPEG)
-                    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-                    
-                    if cap.isOpened():
-                        print(f"[CAMERA {camera_id}] Connected successfully", flush=True)
-                        break
-                    
-                    print(f"[CAMERA {camera_id}] Connection failed, retrying...", flush=True)
-                    if cap:
-                        cap.release()
-                    import time
-                    time.sleep(2)
+                print(f"[CAMERA {camera_id}] Connecting ({decoder} decoder, {supervisor.state})", flush=True)
+                cap = supervisor.connect(lambda: open_capture(low_power=decode_mode == LOW_POWER))
+                if cap is None:
+                    print(f"[CAMERA {camera_id}] Connection failed ({supervisor.last_error}), "
+                          f"retrying in {supervisor.retry_in():.1f}s", flush=True)
+                    continue
+                print(f"[CAMERA {camera_id}] Connected successfully", flush=True)
+                reader_mode = decode_mode
+                if isinstance(cap, MJPEGCapture):
+                    # Already keeps only the newest (still compressed) frame
+                    reader = cap
+                else:
+                    # Decode on a background thread that keeps only the newest frame, so slow
+                    # detection never leaves us reading stale buffered frames
+                    reader = LatestFrameReader(
+                        cap,
+                        name=f"camera-{camera_id}-reader",
+                        reuse_buffers=True,
+                    )
+                active_streams[camera_id]['reader'] = reader
+            
+            frame_count += 1
+            
+            if motion_gate is not None and frame_count % 300 == 0:
+                print(f"[CAMERA {camera_id}] Motion gate: {motion_gate.frames_gated} gated, {motion_gate.frames_processed} processed", flush=True)
+            
+            if frame_count % 300 == 0:
+                print(f"[CAMERA {camera_id}] Detection rate: 1/{rate_controller.interval} frames ({rate_controller.detection_fps:.1f} FPS)", flush=True)
+            
+            if decode_mode == LOW_POWER:
+                # Keyframes come seconds apart anyway; this also limits MJPEG cameras and the fallback decoder
+                delay = low_power_next - time.monotonic()
+                if delay > 0 and stop_event.wait(delay):
+                    continue
+                low_power_next = time.monotonic() + 1.0 / max(getattr(settings, 'LOW_POWER_MAX_FPS', 1.0), 0.01)
+            
+            # Keyframe gaps aren't late frames: in low power only a stall drops the connection
+            read_timeout = CAMERA_READ_TIMEOUT if decode_mode == LOW_POWER else supervisor.degraded_after
+            ret, frame, captured_at = reader.read(timeout=read_timeout)
+            if not ret:
+                # Late frames make the camera degraded; a failed read or a long stall drops the connection
+                if reader.failed or supervisor.check_stalled():
+                    reason = "Failed to read frame" if reader.failed else f"No frame for {CAMERA_READ_TIMEOUT:.0f}s"
+                    print(f"[CAMERA {camera_id}] {reason}, reconnecting", flush=True)
+                    supervisor.connection_lost(reason)
+                    active_streams[camera_id].pop('reader', None)
+                    reader.release()
+                    reader = cap = None
+                continue
+            supervisor.frame_received(captured_at)
+            
+            if frame_count % 300 == 0:
+                # Lag stays within one frame plus processing time, however slow detection is
+                print(f"[CAMERA {camera_id}] Capture: {reader.frames_captured} decoded, {reader.frames_dropped} dropped, "
+                      f"frame lag {(time.time() - captured_at) * 1000:.0f} ms", flush=True)
+            rate_controller.on_frame()
+            
+            # Higher resolution for better quality (800x450, written into a reused buffer)
+            display_frame = preprocessor.display(frame)
+            
+            # Static scene: show the live frame without running detection
+            if motion_gate is not None:
+                motion_gate.sensitivity = camera.motion_sensitivity
+                if not motion_gate.check(display_frame):
+                    # Don't hold up other cameras' batches while this one is idle
+                    active_detector.unregister(camera_id)
+                    last_overlays = []
+                    track_motion.clear()
+                    cv2.putText(display_frame, "Mode: Idle (no motion)", (10, display_frame.shape[0] - 50),
+                              cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 200), 2)
+                    yield render_frame(display_frame)
+                    continue
+                # Motion: keep (or go back to) full decode
+                decode_modes.activity()
+            
+            # Per-camera fixed detection interval, or adaptive when not set
+            if camera.detection_interval:
+                rate_controller.set_interval_bounds(camera.detection_interval, camera.detection_interval)
+            else:
+                rate_controller.set_interval_bounds(1, getattr(settings, 'DETECTION_MAX_INTERVAL', 15))
+            
+            # Skipped frame: predict where the tracks moved instead of running detection
+            if not rate_controller.should_detect():
+                if track_motion.active:
+                    draw_overlays(display_frame, [
+                        (*last_to_display.map_box(*ltrb), color, label_text)
+                        for ltrb, (color, label_text) in track_motion.advance()
+                    ])
                 else:
-                    raise Exception("Failed to connect after retries")
+                    draw_overlays(display_frame, last_overlays)
+                cv2.putText(display_frame, f"Detection: 1/{rate_controller.interval} frames", (10, display_frame.shape[0] - 20),
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+                yield render_frame(display_frame)
+                continue
+
+            # Crop to the ROI's bounding rectangle so the model input only covers the gate area
+            if camera.roi_polygon != roi_points:
+                roi_points = camera.roi_polygon
+                roi = RegionOfInterest.from_points(roi_points)
+            frame_h, frame_w = frame.shape[:2]
+            roi_rect = roi.bounding_rect(frame_w, frame_h) if roi else None
+            
+            detect_started = time.perf_counter()
+            
+            # Get or initialize DeepSort tracker (None if unavailable: no cascade then)
+            tracker = get_deepsort_tracker(camera_id)
+            
+            # Cascade mode: the tiny person detector runs here, the compliance model
+            # only on crops of new/unresolved tracks (see below)
+            if use_cascade(camera.cascade_enabled, tracker):
+                if cascade is None:
+                    person_scheduler = get_person_scheduler()
+                    cascade = ComplianceCascade(
+                        min_confidence=getattr(settings, 'CASCADE_MIN_CONFIDENCE', 0.6),
+                        max_crops=scheduler.max_batch_size,
+                    )
+                    print(f"[CAMERA {camera_id}] Compliance cascade enabled", flush=True)
+                detector = person_scheduler
+                input_size = DEFAULT_INPUT_SIZE
+            else:
+                if camera.cascade_enabled and not cascade_fallback_logged:
+                    print(f"[CAMERA {camera_id}] ⚠️ Cascade needs DeepSort; using the compliance model without tracking", flush=True)
+                    cascade_fallback_logged = True
+                cascade = None
+                if camera.tiled_inference:
+                    input_size = DEFAULT_INPUT_SIZE
+                elif camera.auto_input_size:
+                    input_size = resolution_tuner.input_size
+                else:
+                    input_size = camera.input_size if camera.input_size in INPUT_SIZES else DEFAULT_INPUT_SIZE
+                detector = get_inference_scheduler(input_size)
+            
+            # Stay registered only with the scheduler this frame goes to (cascade classifier
+            # batches are occasional, so they never make other cameras wait either)
+            if detector is not active_detector:
+                active_detector.unregister(camera_id)
+                active_detector = detector
+            detector.register(camera_id)
+            
+            if camera.tiled_inference:
+                # Overlapping full-resolution tiles, merged back into crop coordinates;
+                # DeepSort then tracks on the full-resolution crop
+                tiles, detection_frame = tiler.tile(frame, roi_rect)
+                to_display = preprocessor.crop_to_display(frame, roi_rect)
+                to_frame = crop_transform((frame_w, frame_h), roi_rect)
+                tile_results = detector.predict_many(camera_id, tiles)
+                results = [tiler.merge([boxes_to_array(r) for r in tile_results])]
+            else:
+                # Detection frame at this camera's input size, plus the exact
+                # detection -> display coordinate transform used for drawing and persistence
+                preprocessor.set_detection_size((input_size, input_size))
+                detection_frame, to_display = preprocessor.detection(frame, roi_rect)
+                to_frame = crop_transform((frame_w, frame_h), roi_rect, source_size=preprocessor.detection_size)
+                
+                # Run YOLO detection (batched with the other active cameras)
+                results = [boxes_to_array(detector.predict(camera_id, detection_frame))]
+                
+                if camera.auto_input_size and cascade is None:
+                    tuned_size = resolution_tuner.record(results[0], input_size)
+                    if tuned_size is not None:
+                        # Stored even when the round kept the size, so restarts don't sample again right away
+                        Camera.objects.filter(id=camera_id).update(input_size=tuned_size, input_size_tuned_at=timezone.now())
+                        if resolution_tuner.recall:
+                            print(f"[CAMERA {camera_id}] Input size tuned to {tuned_size} (estimated recall: {resolution_tuner.recall})", flush=True)
+                        else:
+                            print(f"[CAMERA {camera_id}] Too few people to tune the input size, keeping {tuned_size}", flush=True)
+            
+            # Class names of the model that is live right now (it can be hot-swapped)
+            model = scheduler.model
+            
+            if tracker is not None:
+                # === YOLOV8 + DEEPSORT TRACKING MODE ===
+                
+                # Prepare detections for DeepSort (format: ([x,y,w,h], confidence, class))
+                detections = []
+                for result in results:
+                    # Each row: [x1, y1, x2, y2, conf, cls]
+                    for box in result:
+                        # Get box coordinates in detection frame size (416x416, or crop pixels when tiled)
+                        x1, y1, x2, y2 = box[:4]
+                        conf = float(box[4])
+                        cls = int(box[5])
+                        
+                        # Drop detections outside the ROI before they cost an embedder crop
+                        if not in_roi(roi, *to_display.map_box(x1, y1, x2, y2)):
+                            continue
+                        
+                        # Convert to [x, y, w, h] format for DeepSort
+                        w = x2 - x1
+                        h = y2 - y1
+                        detections.append(([x1, y1, w, h], conf, cls))
                 
-                # Aggressively clear initial buffer to reduce lag
-                for _ in range(10):
-                    cap.grab()
+                # Update tracker with detections
+                tracks = tracker.update_tracks(detections, frame=detection_frame)
                 
-                print(f"[CAMERA {camera_id}] Starting detection loop", flush=True)
+                if cascade is not None:
+                    # Second stage: classify crops of new/unresolved tracks at full resolution,
+                    # all in one batch; resolved tracks keep their verdict
+                    cascade.prune([track.track_id for track in tracks])
+                    candidates = {
+                        track.track_id: track for track in tracks
+                        if track.is_confirmed() and in_roi(roi, *to_display.map_box(*track.to_ltrb()))
+                    }
+                    to_classify = cascade.pending(candidates.keys())
+                    if to_classify:
+                        crops = cascade.crops(frame, [to_frame.map_box(*candidates[track_id].to_ltrb()) for track_id in to_classify])
+                        verdicts = scheduler.predict_many(camera_id, crops)
+                        for track_id, verdict in zip(to_classify, verdicts):
+                            cascade.update(track_id, boxes_to_array(verdict))
+                rate_controller.record_latency(time.perf_counter() - detect_started)
                 
-                while True:
-                    # Check if stop was requested
-                    if stop_event.is_set():
-                        print(f"[CAMERA {camera_id}] Stop requested, ending stream", flush=True)
-                        break
+                # Process tracks (not raw detections)
+                active_track_count = 0
+                overlays = []
+                predicted_tracks = []  # (track, (color, label_text)) for the skipped frames
+                for track in tracks:
+                    if not track.is_confirmed():
+                        continue
                     
-                    # Check if camera is still active in database
-                    camera.refresh_from_db()
-                    if not camera.is_active:
-                        print(f"[CAMERA {camera_id}] Camera deactivated, ending stream", flush=True)
-                        break
+                    track_id = track.track_id
+                    ltrb = track.to_ltrb()  # Get [left, top, right, bottom]
                     
-                    frame_count += 1
+                    # Scale coordinates to display frame size (800x450)
+                    x1, y1, x2, y2 = to_display.map_box(*ltrb)
                     
-                    # Flush buffer periodically to prevent lag buildup
-                    if frame_count % 100 == 0:
-                        for _ in range(5):
-                            cap.grab()
+                    # Tracks that drifted outside the ROI are ignored
+                    if not in_roi(roi, x1, y1, x2, y2):
+                        continue
+                    active_track_count += 1
                     
-                    # Process every frame for maximum smoothness (no skipping)
-                    # if frame_count % 2 != 0:  # Uncomment to skip every other frame if needed
-                    #     if not cap.grab():
-                    #         break
-                    #     continue
+                    # Get detection class and confidence
+                    if cascade is not None:
+                        # Compliance verdict from the classifier; 'Pending' until resolved
+                        det_class, det_conf = cascade.get(track_id) or (None, 0.0)
+                    else:
+                        det_class = track.det_class if track.det_class is not None else 0
+                        det_conf = track.det_conf if track.det_conf is not None else 0.0
+                    label = model.names[det_class] if det_class is not None else 'Pending'
                     
-                    ret, frame = cap.read()
-                    if not ret:
-                        print(f"[CAMERA {camera_id}] Failed to read frame", flush=True)
-                        break
+                    # Log tracks for debugging (every 60 frames to reduce spam)
+                    if frame_count % 60 == 0:
+                        print(f"[CAMERA {camera_id}] Track ID: {track_id}, {label} (conf: {det_conf:.2f})", flush=True)
                     
-                    # Higher resolution for better quality (800x450)
-                    display_frame = cv2.resize(frame, (800, 450))
-
-                    # Larger detection frame for better accuracy (416x416)
-                    detection_frame = cv2.resize(frame, (416, 416))
+                    # Color based on detection (grey while the cascade has no verdict yet)
+                    if label == 'Pending':
+                        color = (160, 160, 160)
+                    else:
+                        color = (0, 255, 0) if label == 'Compliant' else (0, 0, 255)
                     
-                    # Run YOLO detection
-                    results = model(detection_frame, conf=0.4, verbose=False)
+                    # Draw bounding box
+                    cv2.rectangle(display_frame, (x1, y1), (x2, y2), color, 2)
                     
-                    # Get or initialize DeepSort tracker
-                    tracker = get_deepsort_tracker(camera_id)
+                    # Draw label with track ID
+                    label_text = f"ID:{track_id} {label} {det_conf:.2f}"
+                    (text_width, text_height), baseline = cv2.getTextSize(label_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
                     
-                    if tracker is not None and DEEPSORT_AVAILABLE:
-                        # === YOLOV8 + DEEPSORT TRACKING MODE ===
+                    # Draw background rectangle for text (removed to keep label background transparent)
+                    # rect_x1 = x1
+                    # rect_y1 = y1 - text_height - baseline - 5
+                    # rect_x2 = x1 + text_width + 5
+                    # rect_y2 = y1 - baseline
+                    # cv2.rectangle(display_frame, (rect_x1, rect_y1), (rect_x2, rect_y2), (0, 0, 0), -1)
+                    
+                    # Draw text
+                    text_x = x1 + 2
+                    text_y = y1 - baseline - 2
+                    cv2.putText(display_frame, label_text, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                    overlays.append((x1, y1, x2, y2, color, label_text))
+                    predicted_tracks.append((track, (color, label_text)))
+                    
+                    # === TRACK-BASED CAPTURE LOGIC ===
+                    # Normalize label (Model outputs: {0: 'Compliant', 1: 'Non_compliant'})
+                    label_lower = label.lower().replace('-', '_').replace(' ', '_')
+                    is_compliant = label_lower == 'compliant'
+                    is_non_compliant = label_lower == 'non_compliant'
+                    
+                    if (is_compliant or is_non_compliant) and det_conf > 0.5:
+                        detection_status = 'compliant' if is_compliant else 'non-compliant'
+                        track_key = f"{track_id}_{detection_status}"
                         
-                        # Prepare detections for DeepSort (format: ([x,y,w,h], confidence, class))
-                        detections = []
-                        for result in results:
-                            boxes = result.boxes
-                            for box in boxes:
-                                # Get box coordinates in detection frame size (320x320)
-                                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                                conf = float(box.conf[0])
-                                cls = int(box.cls[0])
+                        # Check if this track_id has already been recorded
+                        if track_key not in _tracked_violations[camera_id]:
+                            try:
+                                snapshot = None
                                 
-                                # Convert to [x, y, w, h] format for DeepSort
-                                w = x2 - x1
-                                h = y2 - y1
-                                detections.append(([x1, y1, w, h], conf, cls))
-                        
-                        # Update tracker with detections
-                        tracks = tracker.update_tracks(detections, frame=detection_frame)
-                        
-                        # Process tracks (not raw detections)
-                        active_track_count = 0
-                        for track in tracks:
-                            if not track.is_confirmed():
-                                continue
-                            
-                            active_track_count += 1
-                            track_id = track.track_id
-                            ltrb = track.to_ltrb()  # Get [left, top, right, bottom]
-                            
-                            # Scale coordinates to display frame size (800x450)
-                            x1 = int(ltrb[0] * (800 / 416))
-                            y1 = int(ltrb[1] * (450 / 416))
-                            x2 = int(ltrb[2] * (800 / 416))
-                            y2 = int(ltrb[3] * (450 / 416))
-                            
-                            # Get detection class and confidence
-                            det_class = track.det_class if track.det_class is not None else 0
-                            det_conf = track.det_conf if track.det_conf is not None else 0.0
-                            label = model.names[det_class]
-                            
-                            # Log tracks for debugging (every 60 frames to reduce spam)
-                            if frame_count % 60 == 0:
-                                print(f"[CAMERA {camera_id}] Track ID: {track_id}, {label} (conf: {det_conf:.2f})", flush=True)
-                            
-                            # Color based on detection
-                            color = (0, 255, 0) if label == 'Compliant' else (0, 0, 255)
-                            
-                            # Draw bounding box
-                            cv2.rectangle(display_frame, (x1, y1), (x2, y2), color, 2)
-                            
-                            # Draw label with track ID
-                            label_text = f"ID:{track_id} {label} {det_conf:.2f}"
-                            (text_width, text_height), baseline = cv2.getTextSize(label_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
-                            
-                            # Draw background rectangle for text (removed to keep label background transparent)
-                            # rect_x1 = x1
-                            # rect_y1 = y1 - text_height - baseline - 5
-                            # rect_x2 = x1 + text_width + 5
-                            # rect_y2 = y1 - baseline
-                            # cv2.rectangle(display_frame, (rect_x1, rect_y1), (rect_x2, rect_y2), (0, 0, 0), -1)
-                            
-                            # Draw text
-                            text_x = x1 + 2
-                            text_y = y1 - baseline - 2
-                            cv2.putText(display_frame, label_text, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-                            
-                            # === TRACK-BASED CAPTURE LOGIC ===
-                            # Normalize label (Model outputs: {0: 'Compliant', 1: 'Non_compliant'})
-                            label_lower = label.lower().replace('-', '_').replace(' ', '_')
-                            is_compliant = label_lower == 'compliant'
-                            is_non_compliant = label_lower == 'non_compliant'
-                            
-                            if (is_compliant or is_non_compliant) and det_conf > 0.5:
-                                detection_status = 'compliant' if is_compliant else 'non-compliant'
-                                track_key = f"{track_id}_{detection_status}"
-                                
-                                # Check if this track_id has already been recorded
-                                if track_key not in _tracked_violations[camera_id]:
+                                # For NON-COMPLIANT: Create violation snapshot and upload to Cloudinary
+                                if is_non_compliant and det_conf > 0.6:
+                                    # Encode frame as JPEG
+                                    _, buffer = cv2.imencode('.jpg', display_frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                                    
                                     try:
-                                        snapshot = None
+                                        # Upload to Cloudinary
+                                        from io import BytesIO
+                                        import cloudinary.uploader
                                         
-                                        # For NON-COMPLIANT: Create violation snapshot and upload to Cloudinary
-                                        if is_non_compliant and det_conf > 0.6:
-                                            # Encode frame as JPEG
-                                            _, buffer = cv2.imencode('.jpg', display_frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                                            
-                                            try:
-                                                # Upload to Cloudinary
-                                                from io import BytesIO
-                                                import cloudinary.uploader
-                                                
-                                                img_bytes = BytesIO(buffer.tobytes())
-                                                upload_result = cloudinary.uploader.upload(
-                                                    img_bytes,
-                                                    folder="gatewatch/violations",
-                                                    resource_type="image",
-                                                    format="jpg",
-                                                    transformation=[
-                                                        {'quality': 'auto:good'},
-                                                        {'fetch_format': 'auto'}
-                                                    ]
-                                                )
-                                                
-                                                # Create violation snapshot with Cloudinary URL ONLY
-                                                snapshot = ViolationSnapshot.objects.create(
-                                                    camera_id=camera_id,
-                                                    confidence=float(det_conf),
-                                                    bbox_x1=x1,
-                                                    bbox_y1=y1,
-                                                    bbox_x2=x2,
-                                                    bbox_y2=y2,
-                                                    image_url=upload_result['secure_url'],
-                                                    cloudinary_public_id=upload_result['public_id']
-                                                )
-                                                
-                                                print(f"[CAMERA {camera_id}] 🚨 Track ID {track_id}: Violation captured! ID: {snapshot.id}, Conf: {det_conf:.2f}", flush=True)
-                                                print(f"[CLOUDINARY] Uploaded: {upload_result['secure_url']}", flush=True)
-                                                
-                                            except Exception as e:
-                                                print(f"[CLOUDINARY] Upload error: {e}", flush=True)
-                                                # Fallback: Create snapshot without image if Cloudinary fails
-                                                snapshot = ViolationSnapshot.objects.create(
-                                                    camera_id=camera_id,
-                                                    confidence=float(det_conf),
-                                                    bbox_x1=x1,
-                                                    bbox_y1=y1,
-                                                    bbox_x2=x2,
-                                                    bbox_y2=y2
-                                                )
-                                                print(f"[CAMERA {camera_id}] ⚠️ Track ID {track_id}: Violation captured without image", flush=True)
+                                        img_bytes = BytesIO(buffer.tobytes())
+                                        upload_result = cloudinary.uploader.upload(
+                                            img_bytes,
+                                            folder="gatewatch/violations",
+                                            resource_type="image",
+                                            format="jpg",
+                                            transformation=[
+                                                {'quality': 'auto:good'},
+                                                {'fetch_format': 'auto'}
+                                            ]
+                                        )
                                         
-                                        # Create compliance detection record
-                                        from .models import ComplianceDetection
-                                        detection = ComplianceDetection.objects.create(
+                                        # Create violation snapshot with Cloudinary URL ONLY
+                                        snapshot = ViolationSnapshot.objects.create(
                                             camera_id=camera_id,
-                                            status=detection_status,
                                             confidence=float(det_conf),
-                                            violation_snapshot=snapshot if is_non_compliant else None
+                                            bbox_x1=x1,
+                                            bbox_y1=y1,
+                                            bbox_x2=x2,
+                                            bbox_y2=y2,
+                                            image_url=upload_result['secure_url'],
+                                            cloudinary_public_id=upload_result['public_id']
                                         )
                                         
-                                        # Mark track as recorded
-                                        _tracked_violations[camera_id][track_key] = detection.id
-                                        
-                                        if is_compliant:
-                                            print(f"[CAMERA {camera_id}] ✅ Track ID {track_id}: Compliant student detected! Conf: {det_conf:.2f}", flush=True)
+                                        print(f"[CAMERA {camera_id}] 🚨 Track ID {track_id}: Violation captured! ID: {snapshot.id}, Conf: {det_conf:.2f}", flush=True)
+                                        print(f"[CLOUDINARY] Uploaded: {upload_result['secure_url']}", flush=True)
                                         
                                     except Exception as e:
-                                        print(f"[CAMERA {camera_id}] Error saving track {track_id}: {str(e)}", flush=True)
-                        
-                        # Add tracking mode overlay
-                        mode_text = f"Mode: YOLOv8 + DeepSort | Active Tracks: {active_track_count}"
-                        cv2.putText(display_frame, mode_text, (10, display_frame.shape[0] - 50),
-                                  cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-                    
-                    else:
-                        # === FALLBACK MODE: YOLOV8 ONLY (COOLDOWN-BASED) ===
-                        
-                        # Process detections without tracking
-                        for result in results:
-                            boxes = result.boxes
-                            for box in boxes:
-                                # Get box coordinates (scale back to display size)
-                                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                                x1 = int(x1 * (800 / 416))
-                                y1 = int(y1 * (450 / 416))
-                                x2 = int(x2 * (800 / 416))
-                                y2 = int(y2 * (450 / 416))
-                                
-                                # Get confidence and class
-                                conf = float(box.conf[0])
-                                cls = int(box.cls[0])
-                                label = model.names[cls]
-                                
-                                # Log detections for debugging (every 60 frames to avoid spam)
-                                if frame_count % 60 == 0:
-                                    print(f"[CAMERA {camera_id}] Detection: {label} (conf: {conf:.2f})", flush=True)
-                                
-                                # Color based on detection
-                                color = (0, 255, 0) if label == 'Compliant' else (0, 0, 255)
-                                
-                                # Draw bounding box
-                                cv2.rectangle(display_frame, (x1, y1), (x2, y2), color, 2)
-                                
-                                # Draw label
-                                label_text = f"{label} {conf:.2f}"
-                                (text_width, text_height), baseline = cv2.getTextSize(label_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
-                                
-                                # Draw background rectangle for text (removed to keep label background transparent)
-                                # rect_x1 = x1
-                                # rect_y1 = y1 - text_height - baseline - 5
-                                # rect_x2 = x1 + text_width + 5
-                                # rect_y2 = y1 - baseline
-                                # cv2.rectangle(display_frame, (rect_x1, rect_y1), (rect_x2, rect_y2), (0, 0, 0), -1)
+                                        print(f"[CLOUDINARY] Upload error: {e}", flush=True)
+                                        # Fallback: Create snapshot without image if Cloudinary fails
+                                        snapshot = ViolationSnapshot.objects.create(
+                                            camera_id=camera_id,
+                                            confidence=float(det_conf),
+                                            bbox_x1=x1,
+                                            bbox_y1=y1,
+                                            bbox_x2=x2,
+                                            bbox_y2=y2
+                                        )
+                                        print(f"[CAMERA {camera_id}] ⚠️ Track ID {track_id}: Violation captured without image", flush=True)
                                 
-                                # Draw text
-                                text_x = x1 + 2
-                                text_y = y1 - baseline - 2
-                                cv2.putText(display_frame, label_text, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                                # Create compliance detection record
+                                from .models import ComplianceDetection
+                                detection = ComplianceDetection.objects.create(
+                                    camera_id=camera_id,
+                                    status=detection_status,
+                                    confidence=float(det_conf),
+                                    violation_snapshot=snapshot if is_non_compliant else None
+                                )
                                 
-                                # === DETECTION CAPTURE LOGIC (BOTH COMPLIANT & NON-COMPLIANT) ===
-                                # Normalize label (Model outputs: {0: 'Compliant', 1: 'Non_compliant'})
-                                label_lower = label.lower().replace('-', '_').replace(' ', '_')
-                                is_compliant = label_lower == 'compliant'
-                                is_non_compliant = label_lower == 'non_compliant'
+                                # Mark track as recorded
+                                _tracked_violations[camera_id][track_key] = detection.id
                                 
-                                # Debug logging for detection
-                                if frame_count % 30 == 0:  # Log every 30 frames to reduce spam
-                                    print(f"[CAMERA {camera_id}] Detected: '{label}' -> normalized: '{label_lower}' | Compliant: {is_compliant}, Non-compliant: {is_non_compliant} | Conf: {conf:.2f}", flush=True)
+                                if is_compliant:
+                                    print(f"[CAMERA {camera_id}] ✅ Track ID {track_id}: Compliant student detected! Conf: {det_conf:.2f}", flush=True)
                                 
-                                if (is_compliant or is_non_compliant) and conf > 0.5:
-                                    # Check cooldown (3 seconds between captures per status)
-                                    detection_status = 'compliant' if is_compliant else 'non-compliant'
-                                    
-                                    from .models import ComplianceDetection
-                                    last_detection = ComplianceDetection.objects.filter(
-                                        camera_id=camera_id,
-                                        status=detection_status
-                                    ).order_by('-timestamp').first()
-                                    
-                                    should_capture = True
-                                    if last_detection:
-                                        time_since_last = timezone.now() - last_detection.timestamp
-                                        if time_since_last < timedelta(seconds=3):
-                                            should_capture = False
-                                            print(f"[CAMERA {camera_id}] ⏳ Cooldown active for {detection_status} (waited {time_since_last.total_seconds():.1f}s / 3s)", flush=True)
+                            except Exception as e:
+                                print(f"[CAMERA {camera_id}] Error saving track {track_id}: {str(e)}", flush=True)
+                
+                last_overlays = overlays
+                track_motion.reset(predicted_tracks, rate_controller.interval)
+                last_to_display = to_display
+                
+                # Add tracking mode overlay
+                mode_text = f"Mode: {'Cascade' if cascade is not None else 'YOLOv8'} + DeepSort | Active Tracks: {active_track_count}"
+                cv2.putText(display_frame, mode_text, (10, display_frame.shape[0] - 50),
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+            
+            else:
+                # === FALLBACK MODE: YOLOV8 ONLY (COOLDOWN-BASED) ===
+                rate_controller.record_latency(time.perf_counter() - detect_started)
+                
+                # Process detections without tracking
+                overlays = []
+                for result in results:
+                    for box in result:
+                        # Get box coordinates (scale back to display size)
+                        x1, y1, x2, y2 = to_display.map_box(*box[:4])
+                        
+                        if not in_roi(roi, x1, y1, x2, y2):
+                            continue
+                        
+                        # Get confidence and class
+                        conf = float(box[4])
+                        cls = int(box[5])
+                        label = model.names[cls]
+                        
+                        # Log detections for debugging (every 60 frames to avoid spam)
+                        if frame_count % 60 == 0:
+                            print(f"[CAMERA {camera_id}] Detection: {label} (conf: {conf:.2f})", flush=True)
+                        
+                        # Color based on detection
+                        color = (0, 255, 0) if label == 'Compliant' else (0, 0, 255)
+                        
+                        # Draw bounding box
+                        cv2.rectangle(display_frame, (x1, y1), (x2, y2), color, 2)
+                        
+                        # Draw label
+                        label_text = f"{label} {conf:.2f}"
+                        (text_width, text_height), baseline = cv2.getTextSize(label_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+                        
+                        # Draw background rectangle for text (removed to keep label background transparent)
+                        # rect_x1 = x1
+                        # rect_y1 = y1 - text_height - baseline - 5
+                        # rect_x2 = x1 + text_width + 5
+                        # rect_y2 = y1 - baseline
+                        # cv2.rectangle(display_frame, (rect_x1, rect_y1), (rect_x2, rect_y2), (0, 0, 0), -1)
+                        
+                        # Draw text
+                        text_x = x1 + 2
+                        text_y = y1 - baseline - 2
+                        cv2.putText(display_frame, label_text, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                        overlays.append((x1, y1, x2, y2, color, label_text))
+                        
+                        # === DETECTION CAPTURE LOGIC (BOTH COMPLIANT & NON-COMPLIANT) ===
+                        # Normalize label (Model outputs: {0: 'Compliant', 1: 'Non_compliant'})
+                        label_lower = label.lower().replace('-', '_').replace(' ', '_')
+                        is_compliant = label_lower == 'compliant'
+                        is_non_compliant = label_lower == 'non_compliant'
+                        
+                        # Debug logging for detection
+                        if frame_count % 30 == 0:  # Log every 30 frames to reduce spam
+                            print(f"[CAMERA {camera_id}] Detected: '{label}' -> normalized: '{label_lower}' | Compliant: {is_compliant}, Non-compliant: {is_non_compliant} | Conf: {conf:.2f}", flush=True)
+                        
+                        if (is_compliant or is_non_compliant) and conf > 0.5:
+                            # Check cooldown (3 seconds between captures per status)
+                            detection_status = 'compliant' if is_compliant else 'non-compliant'
+                            
+                            from .models import ComplianceDetection
+                            last_detection = ComplianceDetection.objects.filter(
+                                camera_id=camera_id,
+                                status=detection_status
+                            ).order_by('-timestamp').first()
+                            
+                            should_capture = True
+                            if last_detection:
+                                time_since_last = timezone.now() - last_detection.timestamp
+                                if time_since_last < timedelta(seconds=3):
+                                    should_capture = False
+                                    print(f"[CAMERA {camera_id}] ⏳ Cooldown active for {detection_status} (waited {time_since_last.total_seconds():.1f}s / 3s)", flush=True)
+                            
+                            if should_capture:
+                                print(f"[CAMERA {camera_id}] 📸 Capturing {detection_status} detection (conf: {conf:.2f})", flush=True)
+                                try:
+                                    snapshot = None
                                     
-                                    if should_capture:
-                                        print(f"[CAMERA {camera_id}] 📸 Capturing {detection_status} detection (conf: {conf:.2f})", flush=True)
+                                    # For NON-COMPLIANT: Create violation snapshot and upload to Cloudinary
+                                    if is_non_compliant and conf > 0.6:
+                                        # Encode frame as JPEG
+                                        _, buffer = cv2.imencode('.jpg', display_frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                                        
                                         try:
-                                            snapshot = None
+                                            # Upload to Cloudinary
+                                            from io import BytesIO
+                                            import cloudinary.uploader
                                             
-                                            # For NON-COMPLIANT: Create violation snapshot and upload to Cloudinary
-                                            if is_non_compliant and conf > 0.6:
-                                                # Encode frame as JPEG
-                                                _, buffer = cv2.imencode('.jpg', display_frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                                                
-                                                try:
-                                                    # Upload to Cloudinary
-                                                    from io import BytesIO
-                                                    import cloudinary.uploader
-                                                    
-                                                    img_bytes = BytesIO(buffer.tobytes())
-                                                    upload_result = cloudinary.uploader.upload(
-                                                        img_bytes,
-                                                        folder="gatewatch/violations",
-                                                        resource_type="image",
-                                                        format="jpg",
-                                                        transformation=[
-                                                            {'quality': 'auto:good'},
-                                                            {'fetch_format': 'auto'}
-                                                        ]
-                                                    )
-                                                    
-                                                    # Create violation snapshot with Cloudinary URL
-                                                    snapshot = ViolationSnapshot.objects.create(
-                                                        camera_id=camera_id,
-                                                        confidence=float(conf),
-                                                        bbox_x1=x1,
-                                                        bbox_y1=y1,
-                                                        bbox_x2=x2,
-                                                        bbox_y2=y2,
-                                                        image_url=upload_result['secure_url'],
-                                                        cloudinary_public_id=upload_result['public_id']
-                                                    )
-                                                    
-                                                    print(f"[CAMERA {camera_id}] 🚨 Violation captured! ID: {snapshot.id}, Conf: {conf:.2f}", flush=True)
-                                                    print(f"[CLOUDINARY] Uploaded: {upload_result['secure_url']}", flush=True)
-                                                    
-                                                except Exception as e:
-                                                    print(f"[CLOUDINARY] Upload error: {e}", flush=True)
-                                                    # Fallback: Create snapshot without image if Cloudinary fails
-                                                    snapshot = ViolationSnapshot.objects.create(
-                                                        camera_id=camera_id,
-                                                        confidence=float(conf),
-                                                        bbox_x1=x1,
-                                                        bbox_y1=y1,
-                                                        bbox_x2=x2,
-                                                        bbox_y2=y2
-                                                    )
-                                                    print(f"[CAMERA {camera_id}] ⚠️ Violation captured without image due to upload error", flush=True)
+                                            img_bytes = BytesIO(buffer.tobytes())
+                                            upload_result = cloudinary.uploader.upload(
+                                                img_bytes,
+                                                folder="gatewatch/violations",
+                                                resource_type="image",
+                                                format="jpg",
+                                                transformation=[
+                                                    {'quality': 'auto:good'},
+                                                    {'fetch_format': 'auto'}
+                                                ]
+                                            )
                                             
-                                            # Create compliance detection record (for BOTH compliant & non-compliant)
-                                            detection = ComplianceDetection.objects.create(
+                                            # Create violation snapshot with Cloudinary URL
+                                            snapshot = ViolationSnapshot.objects.create(
                                                 camera_id=camera_id,
-                                                status=detection_status,
                                                 confidence=float(conf),
-                                                violation_snapshot=snapshot if is_non_compliant else None
+                                                bbox_x1=x1,
+                                                bbox_y1=y1,
+                                                bbox_x2=x2,
+                                                bbox_y2=y2,
+                                                image_url=upload_result['secure_url'],
+                                                cloudinary_public_id=upload_result['public_id']
                                             )
                                             
-                                            if is_compliant:
-                                                print(f"[CAMERA {camera_id}] ✅ Compliant student detected! Conf: {conf:.2f}", flush=True)
+                                            print(f"[CAMERA {camera_id}] 🚨 Violation captured! ID: {snapshot.id}, Conf: {conf:.2f}", flush=True)
+                                            print(f"[CLOUDINARY] Uploaded: {upload_result['secure_url']}", flush=True)
                                             
                                         except Exception as e:
-                                            print(f"[CAMERA {camera_id}] Error saving detection: {str(e)}", flush=True)
-                        
-                        # Add fallback mode overlay
-                        mode_text = f"Mode: YOLOv8 Only (Fallback)"
-                        cv2.putText(display_frame, mode_text, (10, display_frame.shape[0] - 50),
-                                  cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 165, 0), 2)
-                    
-                    # Add status overlay
-                    status_text = f"Camera: {camera.name} | Location: {camera.location}"
-                    cv2.putText(display_frame, status_text, (10, 30),
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                    
-                    # Encode frame to JPEG with high quality for clear visuals
-                    _, buffer = cv2.imencode('.jpg', display_frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                    frame_bytes = buffer.tobytes()
-                    
-                    # Yield frame in MJPEG format
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-                    
-            except Exception as e:
-                print(f"[CAMERA {camera_id}] Error: {str(e)}", flush=True)
-                import traceback
-                traceback.print_exc()
+                                            print(f"[CLOUDINARY] Upload error: {e}", flush=True)
+                                            # Fallback: Create snapshot without image if Cloudinary fails
+                                            snapshot = ViolationSnapshot.objects.create(
+                                                camera_id=camera_id,
+                                                confidence=float(conf),
+                                                bbox_x1=x1,
+                                                bbox_y1=y1,
+                                                bbox_x2=x2,
+                                                bbox_y2=y2
+                                            )
+                                            print(f"[CAMERA {camera_id}] ⚠️ Violation captured without image due to upload error", flush=True)
+                                    
+                                    # Create compliance detection record (for BOTH compliant & non-compliant)
+                                    detection = ComplianceDetection.objects.create(
+                                        camera_id=camera_id,
+                                        status=detection_status,
+                                        confidence=float(conf),
+                                        violation_snapshot=snapshot if is_non_compliant else None
+                                    )
+                                    
+                                    if is_compliant:
+                                        print(f"[CAMERA {camera_id}] ✅ Compliant student detected! Conf: {conf:.2f}", flush=True)
+                                    
+                                except Exception as e:
+                                    print(f"[CAMERA {camera_id}] Error saving detection: {str(e)}", flush=True)
                 
-                # Return error frame
-                error_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-                cv2.putText(error_frame, f"Camera Error: {str(e)}", (50, 240),
-                          cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                _, buffer = cv2.imencode('.jpg', error_frame)
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+                last_overlays = overlays
+                track_motion.clear()
+                
+                # Add fallback mode overlay
+                mode_text = f"Mode: YOLOv8 Only (Fallback)"
+                cv2.putText(display_frame, mode_text, (10, display_frame.shape[0] - 50),
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 165, 0), 2)
             
-            finally:
-                if cap:
-                    cap.release()
-                # Clean up from active streams
-                active_streams.pop(camera_id, None)
-                print(f"[CAMERA {camera_id}] Stream ended and cleaned up", flush=True)
+            if last_overlays:
+                # Someone is in view: keep (or go back to) full decode
+                decode_modes.activity()
+            
+            cv2.putText(display_frame, f"Detection: 1/{rate_controller.interval} frames", (10, display_frame.shape[0] - 20),
+                      cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+            
+            # Add status overlay and yield frame in MJPEG format
+            yield render_frame(display_frame)
+            
+    except Exception as e:
+        print(f"[CAMERA {camera_id}] Error: {str(e)}", flush=True)
+        import traceback
+        traceback.print_exc()
+        
+        # Return error frame
+        error_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.putText(error_frame, f"Camera Error: {str(e)}", (50, 240),
+                  cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+        _, buffer = cv2.imencode('.jpg', error_frame)
+        yield (b'--frame\r\n'
+               b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+    
+    finally:
+        if reader is not None:
+            reader.release()
+        elif cap:
+            cap.release()
+        for size_scheduler in list(_inference_schedulers.values()):
+            size_scheduler.unregister(camera_id)
+        if _person_scheduler is not None:
+            _person_scheduler.unregister(camera_id)
+        # Undo the stream's pinning in case the thread outlives it
+        if previous_affinity:
+            pin_current_thread(previous_affinity)
+        if supervisor is not None:
+            _camera_health.remove(supervisor)
+        # Clean up from active streams (unless a newer pipeline for this camera already took over)
+        if active_streams.get(camera_id, {}).get('stop_event') is stop_event:
+            active_streams.pop(camera_id, None)
+        # The hub thread has its own database connection
+        connection.close()
+        print(f"[CAMERA {camera_id}] Stream ended and cleaned up", flush=True)
+
+
+class CameraStreamWithDetection(APIView):
+    """
+    Stream RTSP cameras with real-time YOLO uniform detection and violation capture
+    """
+    permission_classes = []
+    authentication_classes = []
+    
+    def get(self, request, camera_id):
+        """Stream camera with YOLO detection"""
+        from django.http import StreamingHttpResponse, HttpResponse
+        
+        try:
+            camera = Camera.objects.get(id=camera_id, is_active=True)
+        except Camera.DoesNotExist:
+            return HttpResponse("Camera not found or inactive", status=404)
+        
+        if getattr(settings, 'DETECTION_DAEMON', False):
+            # `manage.py run_detectors` runs the pipeline; just relay its frames
+            return StreamingHttpResponse(
+                detector_frames(camera),
+                content_type='multipart/x-mixed-replace; boundary=frame'
+            )
+        
+        # Join the camera's running pipeline, or start it for the first viewer
+        subscription = _capture_hubs.subscribe(camera_id, lambda: detection_pipeline(camera))
+        print(f"[CAMERA {camera_id}] Viewer joined stream for: {camera.name} ({subscription.hub.subscriber_count} watching)", flush=True)
         
         return StreamingHttpResponse(
-            generate_frames_with_detection(),
+            iter(subscription),
             content_type='multipart/x-mixed-replace; boundary=frame'
         )
 
@@ -0,0 +1,130 @@
+import os
+import sys
+import threading
+import time
+
+from django.conf import settings
+
+_state_lock = threading.Lock()
+_state = {
+    'state': 'cold',          # cold -> warming -> ready | error ('disabled' when preload is off)
+    'embedder_warm': False,
+    'warmup_ms': None,
+    'error': None,
+}
+_warmup_thread = None
+
+
+def should_preload():
+    """
+    Preload only in processes that serve requests: not for manage.py commands
+    like migrate, and not in the autoreloader's parent process of runserver.
+    """
+    if not getattr(settings, 'YOLO_PRELOAD', False):
+        return False
+
+    argv = sys.argv
+    if argv and os.path.basename(argv[0]) == 'manage.py':
+        if len(argv) < 2 or argv[1] != 'runserver':
+            return False
+        # runserver with autoreload: only the child (RUN_MAIN=true) serves requests
+        if '--noreload' not in argv and os.environ.get('RUN_MAIN') != 'true':
+            return False
+    return True
+
+
+def _set_state(**values):
+    with _state_lock:
+        _state.update(values)
+
+
+def warm_up_model(model, imgsz=416):
+    """
+    Dummy inferences at batch size 1 and the max batch size, at the input size
+    a scheduler serves: the first call at each size and shape is the slow one
+    """
+    import numpy as np
+
+    frame = np.zeros((416, 416, 3), dtype=np.uint8)
+    batch_size = max(1, getattr(settings, 'YOLO_BATCH_MAX_SIZE', 8))
+    for _ in range(max(1, getattr(settings, 'YOLO_WARMUP_RUNS', 3))):
+        model([frame], imgsz=imgsz, conf=0.4, verbose=False)
+    if batch_size > 1:
+        model([frame] * batch_size, imgsz=imgsz, conf=0.4, verbose=False)
+
+
+def served_input_sizes():
+    """Model input sizes the streams will run at: the default plus each active camera's own"""
+    from ml_models.resolution import INPUT_SIZES
+    from .models import Camera
+    from .views import DEFAULT_INPUT_SIZE
+
+    sizes = {DEFAULT_INPUT_SIZE}
+    try:
+        sizes.update(size for size in Camera.objects.filter(is_active=True).values_list('input_size', flat=True)
+                     if size in INPUT_SIZES)
+    except Exception as e:
+        print(f"[WARMUP] ⚠️ Could not read camera input sizes, warming {DEFAULT_INPUT_SIZE} only: {str(e)}", flush=True)
+    return sorted(sizes)
+
+
+def warm_up_pipeline():
+    """Load the YOLO model (and optionally DeepSort's embedder) and run dummy inferences"""
+    import numpy as np
+    from . import views
+
+    _set_state(state='warming', error=None)
+    started = time.perf_counter()
+    try:
+        # Inference workers load and warm their own model copy before reporting ready;
+        # each size still gets its first (slow) call here rather than on a stream
+        for input_size in served_input_sizes():
+            scheduler = views.get_inference_scheduler(input_size)
+            warm_up_model(scheduler.model, imgsz=input_size)
+            print(f"[WARMUP] Model warmed up at input size {input_size}", flush=True)
+
+        if getattr(settings, 'YOLO_PRELOAD_EMBEDDER', False) and views.DEEPSORT_AVAILABLE:
+            # Every camera's tracker uses this embedder: load it and run it once now
+            embedder = views.get_deepsort_embedder()
+            embedder.predict([np.zeros((200, 80, 3), dtype=np.uint8)])
+            _set_state(embedder_warm=True)
+            print("[WARMUP] DeepSort embedder warmed up", flush=True)
+
+        warmup_ms = (time.perf_counter() - started) * 1000.0
+        _set_state(state='ready', warmup_ms=round(warmup_ms, 1))
+        print(f"[WARMUP] ✅ Detection pipeline warm in {warmup_ms:.0f} ms", flush=True)
+    except Exception as e:
+        _set_state(state='error', error=str(e))
+        print(f"[WARMUP] ❌ Warm-up failed: {str(e)}", flush=True)
+
+
+def start_warmup():
+    """
+    Called from GatewatchApiConfig.ready(). Warms up in a background thread so
+    server startup is not blocked; /api/health/ready/ reports when it is done.
+    """
+    global _warmup_thread
+
+    if not should_preload():
+        _set_state(state='disabled')
+        return None
+
+    if _warmup_thread is None:
+        _warmup_thread = threading.Thread(target=warm_up_pipeline, name='pipeline-warmup', daemon=True)
+        _warmup_thread.start()
+        print("[WARMUP] Preloading detection pipeline in the background...", flush=True)
+    return _warmup_thread
+
+
+def pipeline_status():
+    """Snapshot of the warm-up state for the readiness endpoint"""
+    from . import views
+
+    with _state_lock:
+        state = dict(_state)
+
+    state['model_loaded'] = views._yolo_model is not None or bool(views._inference_schedulers)
+    state['model_version'] = views.get_model_registry().active_version
+    # Without preload the pipeline counts as ready once a stream has loaded the model lazily
+    state['ready'] = state['state'] == 'ready' or (state['state'] == 'disabled' and state['model_loaded'])
+    return state
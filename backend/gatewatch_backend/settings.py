@@ -300,4 +300,96 @@ VIOLATION_TYPES = [
     'civilian_clothes',
     'missing_uniform_top',
     'other',
-]
\ No newline at end of file
+]
+# Detection Pipeline Configuration
+# Max number of camera frames grouped into a single batched YOLO predict call
+YOLO_BATCH_MAX_SIZE = int(os.getenv('YOLO_BATCH_MAX_SIZE', '8'))
+# Max time (ms) the batch scheduler waits for other cameras before running a partial batch
+YOLO_BATCH_MAX_WAIT_MS = int(os.getenv('YOLO_BATCH_MAX_WAIT_MS', '15'))
+# Inference backend for best.pt: 'torch', 'onnxruntime' or 'openvino' (exported automatically on first use)
+YOLO_BACKEND = os.getenv('YOLO_BACKEND', 'torch')
+# Model precision: 'fp32', 'int8' (needs YOLO_BACKEND=onnxruntime and `python manage.py quantize_detector`)
+# or 'bf16' (bf16 autocast for YOLO_COMPILE variants, on CPUs with native bf16; fp32 elsewhere)
+YOLO_PRECISION = os.getenv('YOLO_PRECISION', 'fp32')
+# Target detection FPS per camera; the detection interval adapts to latency and CPU load to hit it
+DETECTION_TARGET_FPS = float(os.getenv('DETECTION_TARGET_FPS', '8'))
+# Upper bound for the adaptive interval (run detection at least once every N frames)
+DETECTION_MAX_INTERVAL = int(os.getenv('DETECTION_MAX_INTERVAL', '15'))
+# System CPU % above which cameras back off their detection rate
+DETECTION_CPU_HIGH = float(os.getenv('DETECTION_CPU_HIGH', '85'))
+# Load and warm up the YOLO model when the server starts instead of on the first stream
+YOLO_PRELOAD = os.getenv('YOLO_PRELOAD', 'False') == 'True'
+# Also warm up DeepSort's appearance embedder during preload
+YOLO_PRELOAD_EMBEDDER = os.getenv('YOLO_PRELOAD_EMBEDDER', 'False') == 'True'
+# Dummy inferences run during warm-up
+YOLO_WARMUP_RUNS = int(os.getenv('YOLO_WARMUP_RUNS', '3'))
+# Number of inference worker processes (0 = run YOLO inside the Django process)
+INFERENCE_WORKERS = int(os.getenv('INFERENCE_WORKERS', '0'))
+# Seconds an inference worker may take for one batch before it counts as hung and is restarted
+INFERENCE_WORKER_TIMEOUT_SECONDS = float(os.getenv('INFERENCE_WORKER_TIMEOUT_SECONDS', '30'))
+# Tiled inference (per camera): overlap between neighbouring tiles as a fraction of the tile size
+TILED_INFERENCE_OVERLAP = float(os.getenv('TILED_INFERENCE_OVERLAP', '0.2'))
+# Max tiles per frame (also capped by YOLO_BATCH_MAX_SIZE, since all tiles run in one batch)
+TILED_INFERENCE_MAX_TILES = int(os.getenv('TILED_INFERENCE_MAX_TILES', '8'))
+# Compliance cascade (per camera): tiny COCO person detector run on every detection frame
+CASCADE_PERSON_WEIGHTS = os.getenv('CASCADE_PERSON_WEIGHTS', 'yolov8n.pt')
+# Person detector input size
+CASCADE_PERSON_IMGSZ = int(os.getenv('CASCADE_PERSON_IMGSZ', '320'))
+# Compliance confidence on a person crop that settles a track's verdict
+CASCADE_MIN_CONFIDENCE = float(os.getenv('CASCADE_MIN_CONFIDENCE', '0.6'))
+# CPU partitioning: pin inference and camera streams to separate cores and cap library thread pools
+# (process-wide caps; enable only once `python manage.py benchmark_cpu_budget` shows a gain on this host)
+CPU_BUDGET_ENABLED = os.getenv('CPU_BUDGET_ENABLED', 'False') == 'True'
+# Cores left for Django, the database and the OS
+CPU_BUDGET_RESERVED_CORES = int(os.getenv('CPU_BUDGET_RESERVED_CORES', '1'))
+# Share of the remaining cores given to inference (split between INFERENCE_WORKERS processes)
+CPU_BUDGET_INFERENCE_SHARE = float(os.getenv('CPU_BUDGET_INFERENCE_SHARE', '0.5'))
+# Camera core groups; streams are assigned to them round-robin
+CPU_BUDGET_CAMERAS = int(os.getenv('CPU_BUDGET_CAMERAS', '4'))
+# Detector versions (one training run directory per version, with weights/best.pt); hot-swapped via /api/models/activate/
+MODEL_REGISTRY_DIR = Path(os.getenv('MODEL_REGISTRY_DIR', str(BASE_DIR / 'models')))
+# Input-size auto-tuning: share of sampled people that must stay detectable at the chosen size
+INPUT_SIZE_TARGET_RECALL = float(os.getenv('INPUT_SIZE_TARGET_RECALL', '0.95'))
+# Seconds between re-tuning rounds (each round samples detections at 640)
+INPUT_SIZE_RETUNE_SECONDS = int(os.getenv('INPUT_SIZE_RETUNE_SECONDS', '1800'))
+# Ahead-of-time CPU variant of the torch model: 'none', 'torchscript' or 'inductor' (cached next to best.pt;
+# compare with `python manage.py benchmark_compiled`)
+YOLO_COMPILE = os.getenv('YOLO_COMPILE', 'none')
+# Run detection in `python manage.py run_detectors` for every active camera; stream views only relay its frames
+DETECTION_DAEMON = os.getenv('DETECTION_DAEMON', 'False') == 'True'
+# Directory the detection daemon publishes the latest frame of each camera to (default: <tmp>/gatewatch-detectors)
+DETECTOR_OUTPUT_DIR = os.getenv('DETECTOR_OUTPUT_DIR', '')
+# Show a "waiting for detector" frame when the daemon's latest frame is older than this (seconds)
+DETECTOR_STALE_SECONDS = float(os.getenv('DETECTOR_STALE_SECONDS', '5'))
+# Camera decoder: 'opencv' (cv2.VideoCapture) or 'ffmpeg' (ffmpeg subprocess that scales and drops frames natively)
+CAMERA_DECODER = os.getenv('CAMERA_DECODER', 'opencv')
+# ffmpeg decoder output width (height keeps the camera's aspect ratio; 0 = camera resolution)
+FFMPEG_DECODE_WIDTH = int(os.getenv('FFMPEG_DECODE_WIDTH', '1280'))
+# ffmpeg decoder output frame rate (0 = camera frame rate)
+FFMPEG_DECODE_FPS = float(os.getenv('FFMPEG_DECODE_FPS', '15'))
+# RTSP transport for the ffmpeg decoder: 'tcp' or 'udp'
+FFMPEG_RTSP_TRANSPORT = os.getenv('FFMPEG_RTSP_TRANSPORT', 'tcp')
+# Camera reconnect backoff: first retry delay and cap (seconds); each delay gets up to 50% random jitter
+CAMERA_RECONNECT_BASE_SECONDS = float(os.getenv('CAMERA_RECONNECT_BASE_SECONDS', '1'))
+CAMERA_RECONNECT_MAX_SECONDS = float(os.getenv('CAMERA_RECONNECT_MAX_SECONDS', '30'))
+# A live camera is reported as degraded after this many seconds without a frame
+CAMERA_DEGRADED_SECONDS = float(os.getenv('CAMERA_DEGRADED_SECONDS', '3'))
+# Camera config change markers shared by the web server and run_detectors (default: <tmp>/gatewatch-camera-config)
+CAMERA_CONFIG_DIR = os.getenv('CAMERA_CONFIG_DIR', '')
+# Seconds between checks for camera changes made by another process
+CAMERA_CONFIG_POLL_SECONDS = float(os.getenv('CAMERA_CONFIG_POLL_SECONDS', '1'))
+# Running pipelines reload their camera at least this often (catches writes that skip signals, e.g. queryset.update())
+CAMERA_CONFIG_REFRESH_SECONDS = float(os.getenv('CAMERA_CONFIG_REFRESH_SECONDS', '60'))
+# HTTP MJPEG cameras (e.g. Android IP Webcam): demux the stream natively and decode only the frames detection uses
+# (opt-in: off, HTTP cameras keep going through the OpenCV/ffmpeg decoder)
+MJPEG_NATIVE_DEMUX = os.getenv('MJPEG_NATIVE_DEMUX', 'False') == 'True'
+# Decode MJPEG frames at 1/2, 1/4 or 1/8 size while at least this wide (0 = full size; ROI/tiled cameras use full size)
+MJPEG_DECODE_MIN_WIDTH = int(os.getenv('MJPEG_DECODE_MIN_WIDTH', '800'))
+# The camera proxy sends MJPEG cameras to the detection stream instead of relaying them unprocessed
+HTTP_CAMERA_DETECTION = os.getenv('HTTP_CAMERA_DETECTION', 'True') == 'True'
+# Auto decode mode: seconds without motion or detections before a camera drops to keyframe-only decode
+LOW_POWER_IDLE_SECONDS = float(os.getenv('LOW_POWER_IDLE_SECONDS', '60'))
+# Frames ffmpeg skips in low-power mode: 'nokey' (keyframes only), 'nonintra', 'bidir' or 'noref'
+LOW_POWER_SKIP_FRAME = os.getenv('LOW_POWER_SKIP_FRAME', 'nokey')
+# Frames per second the detection loop processes in low-power mode (also caps MJPEG cameras)
+LOW_POWER_MAX_FPS = float(os.getenv('LOW_POWER_MAX_FPS', '1'))
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Supported inference backends -> ultralytics export format
+BACKENDS = {
+    'torch': None,
+    'onnxruntime': 'onnx',
+    'openvino': 'openvino',
+}
+
+
+def weights_hash(weights_path, length=12):
+    """Short SHA-256 of the weights file, used to key exported artifacts"""
+    digest = hashlib.sha256()
+    with open(weights_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
+
+
+def exported_artifact_path(weights_path, backend):
+    """
+    Location of the exported model for a backend, next to the weights and
+    keyed by their hash (e.g. best.3f9a1c2b7d4e.onnx, best.3f9a1c2b7d4e_openvino_model/).
+    A changed best.pt therefore never reuses a stale export.
+    """
+    weights_path = Path(weights_path)
+    stem = f"{weights_path.stem}.{weights_hash(weights_path)}"
+    if backend == 'onnxruntime':
+        return weights_path.with_name(f"{stem}.onnx")
+    if backend == 'openvino':
+        return weights_path.with_name(f"{stem}_openvino_model")
+    raise ValueError(f"Backend '{backend}' has no exported artifact")
+
+
+def quantized_artifact_path(weights_path):
+    """INT8 ONNX model built by `manage.py quantize_detector` (e.g. best.3f9a1c2b7d4e.int8.onnx)"""
+    weights_path = Path(weights_path)
+    return weights_path.with_name(f"{weights_path.stem}.{weights_hash(weights_path)}.int8.onnx")
+
+
+def export_weights(weights_path, backend, imgsz=416):
+    """
+    Export best.pt for the given backend (once) and return the artifact path.
+    Safe across processes: one exports under a file lock while the others
+    wait, and the artifact only appears at its final path once complete.
+    """
+    from filelock import FileLock
+
+    target = exported_artifact_path(weights_path, backend)
+    if target.exists():
+        return target
+
+    with FileLock(f"{target}.lock"):
+        if target.exists():
+            # Exported by another process while we waited
+            return target
+
+        from ultralytics import YOLO
+
+        weights_path = Path(weights_path)
+        print(f"[YOLO] Exporting {weights_path.name} for {backend} (first use)...", flush=True)
+        # ultralytics writes next to the .pt it is given: export a private copy so
+        # nothing else ever sees its half-written output
+        with tempfile.TemporaryDirectory(dir=target.parent, prefix=f".{target.name}.") as workdir:
+            weights_copy = Path(workdir) / weights_path.name
+            shutil.copyfile(weights_path, weights_copy)
+            # dynamic=True keeps the batch dimension free for the batch scheduler
+            exported = YOLO(str(weights_copy)).export(format=BACKENDS[backend], imgsz=imgsz, dynamic=True)
+            os.replace(exported, target)
+        print(f"[YOLO] Exported model saved to: {target}", flush=True)
+    return target
+
+
+def load_detector(weights_path, backend='torch', imgsz=416, precision='fp32', compile_mode='none'):
+    """
+    Load the uniform detector with the requested inference backend.
+    All backends return an ultralytics YOLO object, so callers keep using
+    model(frame, ...), model.predict(...) and model.names unchanged.
+
+    precision='int8' loads the quantized ONNX variant (onnxruntime backend only).
+    compile_mode='torchscript'/'inductor' runs an ahead-of-time compiled,
+    channels_last variant of the PyTorch model (see ml_models/compiled.py);
+    precision='bf16' adds bf16 autocast to it on CPUs that support it.
+    """
+    from ultralytics import YOLO
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown YOLO backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")
+
+    if precision == 'int8':
+        if backend != 'onnxruntime':
+            raise ValueError("INT8 precision requires the 'onnxruntime' backend")
+        artifact = quantized_artifact_path(weights_path)
+        if not artifact.exists():
+            raise FileNotFoundError(f"INT8 model not found at {artifact}. Build it with: python manage.py quantize_detector")
+        return YOLO(str(artifact), task='detect')
+
+    if precision == 'bf16' and (backend != 'torch' or compile_mode == 'none'):
+        raise ValueError("BF16 precision requires the 'torch' backend with a compile mode ('torchscript' or 'inductor')")
+
+    if backend == 'torch':
+        model = YOLO(str(weights_path))
+        if compile_mode != 'none':
+            from ml_models.compiled import compile_detector
+            compile_detector(model, weights_path, mode=compile_mode, bf16=precision == 'bf16')
+        return model
+
+    if compile_mode != 'none':
+        raise ValueError(f"Compile mode '{compile_mode}' is only available for the 'torch' backend")
+
+    artifact = export_weights(weights_path, backend, imgsz=imgsz)
+    return YOLO(str(artifact), task='detect')
+
+
+def boxes_to_array(result):
+    """
+    Detections of one frame as an Nx6 float array [x1, y1, x2, y2, conf, cls].
+    Accepts an ultralytics Results object or an array that is already in that form
+    (e.g. from the inference worker pool).
+    """
+    if isinstance(result, np.ndarray):
+        return result
+    return result.boxes.data.cpu().numpy()[:, :6]
+
+
+def measure_latency(model, frame_size=416, runs=5, imgsz=None):
+    """
+    Average per-frame latency (ms) on a blank detection frame, after one warm-up call.
+    imgsz is the inference size to predict at (the model's default if None).
+    """
+    frame = np.zeros((frame_size, frame_size, 3), dtype=np.uint8)
+    kwargs = {'imgsz': imgsz} if imgsz else {}
+    model(frame, verbose=False, **kwargs)
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        model(frame, verbose=False, **kwargs)
+    return (time.perf_counter() - start) / runs * 1000.0
@@ -0,0 +1,199 @@
+import threading
+import time
+from concurrent.futures import Future
+
+
+class BatchInferenceScheduler:
+    """
+    Central scheduler that groups frames from many camera streams into one
+    batched YOLO predict call per tick.
+
+    Each stream submits its latest detection frame and waits on a Future for
+    its own result. A background thread collects pending frames until either
+    every registered stream has submitted, max_batch_size is reached, or
+    max_wait seconds have passed since the first frame of the tick arrived.
+
+    With concurrency > 1 several dispatcher threads take turns collecting
+    batches, so a model that can run batches in parallel (the inference
+    worker pool) is kept busy.
+
+    A stream can also submit several frames at once (submit_many, e.g. the
+    tiles of one high-resolution frame); they always run in the same batch.
+    """
+    def __init__(self, model, max_batch_size=8, max_wait=0.015, concurrency=1, thread_initializer=None,
+                 **predict_kwargs):
+        self.model = model
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait))
+        self.concurrency = max(1, int(concurrency))
+        # Called as thread_initializer(index) at the start of each dispatcher thread (e.g. CPU pinning)
+        self.thread_initializer = thread_initializer
+        self.predict_kwargs = predict_kwargs
+
+        # key -> [frames, future, many]; dict keeps submission order for fairness
+        self._pending = {}
+        self._streams = set()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._stopped = False
+        self._busy = {}  # id(model) -> batches currently running on it
+
+        # Counters (for logging / health endpoints)
+        self.batches_run = 0
+        self.frames_run = 0
+
+    def register(self, key):
+        """Announce a stream so a tick can fire as soon as all streams have submitted"""
+        with self._cond:
+            self._streams.add(key)
+
+    def unregister(self, key):
+        """Remove a stream; a pending frame for it is still processed"""
+        with self._cond:
+            self._streams.discard(key)
+            self._cond.notify()
+
+    def submit(self, key, frame):
+        """
+        Queue a frame for the next batch and return a Future for its result.
+        If the stream already has a frame waiting, it is replaced by the newer
+        one (latest-frame semantics) and the same Future is returned.
+        """
+        return self._submit(key, [frame], many=False)
+
+    def submit_many(self, key, frames):
+        """
+        Queue several frames that must run in one batch; the Future resolves
+        to the list of their results. Same latest-frame semantics as submit.
+        """
+        frames = list(frames)
+        if len(frames) > self.max_batch_size:
+            raise ValueError(f"{len(frames)} frames exceed the max batch size of {self.max_batch_size}")
+        return self._submit(key, frames, many=True)
+
+    def _submit(self, key, frames, many):
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("Inference scheduler is stopped")
+
+            entry = self._pending.get(key)
+            if entry is not None and entry[2] == many:
+                entry[0] = frames
+                return entry[1]
+            if entry is not None:
+                # Switched between single and multi-frame mode: the old request can't be reused
+                self._pending.pop(key)
+                entry[1].cancel()
+
+            future = Future()
+            self._pending[key] = [frames, future, many]
+            self._cond.notify()
+
+            if not self._threads:
+                for i in range(self.concurrency):
+                    thread = threading.Thread(target=self._run, args=(i,), name=f"yolo-batch-scheduler-{i}", daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+        return future
+
+    def predict(self, key, frame, timeout=None):
+        """Submit a frame and block until its result is ready"""
+        return self.submit(key, frame).result(timeout)
+
+    def predict_many(self, key, frames, timeout=None):
+        """Submit several frames as one batch and block until their results are ready"""
+        return self.submit_many(key, frames).result(timeout)
+
+    def swap_model(self, model):
+        """
+        Point all following batches at a new model. Returns the old model once
+        no batch is running on it any more, so the caller can free it.
+        """
+        with self._cond:
+            old, self.model = self.model, model
+            while self._busy.get(id(old)):
+                self._cond.wait()
+        return old
+
+    def stop(self):
+        """Stop the scheduler threads and fail any frames still waiting"""
+        with self._cond:
+            self._stopped = True
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._cond.notify_all()
+        for _, future, _ in pending:
+            future.set_exception(RuntimeError("Inference scheduler stopped"))
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+
+    def _ready(self):
+        """Whether the pending set can be dispatched without waiting further"""
+        if self._pending_frames() >= self.max_batch_size:
+            return True
+        # Every known stream already has a frame queued
+        return bool(self._streams) and self._streams.issubset(self._pending.keys())
+
+    def _pending_frames(self):
+        return sum(len(entry[0]) for entry in self._pending.values())
+
+    def _collect_batch(self):
+        with self._cond:
+            while not self._pending and not self._stopped:
+                self._cond.wait()
+            if self._stopped:
+                return []
+
+            deadline = time.monotonic() + self.max_wait
+            while not self._ready() and not self._stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            # Take whole entries in submission order until the batch is full
+            batch = []
+            size = 0
+            for key in list(self._pending.keys()):
+                count = len(self._pending[key][0])
+                if batch and size + count > self.max_batch_size:
+                    break
+                batch.append(self._pending.pop(key))
+                size += count
+            return batch
+
+    def _run(self, index=0):
+        if self.thread_initializer is not None:
+            self.thread_initializer(index)
+        while True:
+            batch = self._collect_batch()
+            if not batch:
+                if self._stopped:
+                    return
+                continue
+
+            frames = [frame for entry_frames, _, _ in batch for frame in entry_frames]
+            with self._cond:
+                model = self.model
+                self._busy[id(model)] = self._busy.get(id(model), 0) + 1
+            try:
+                results = list(model(frames, **self.predict_kwargs))
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            finally:
+                with self._cond:
+                    self._busy[id(model)] -= 1
+                    if not self._busy[id(model)]:
+                        del self._busy[id(model)]
+                        self._cond.notify_all()
+
+            with self._cond:
+                self.batches_run += 1
+                self.frames_run += len(frames)
+            start = 0
+            for entry_frames, future, many in batch:
+                entry_results = results[start:start + len(entry_frames)]
+                start += len(entry_frames)
+                future.set_result(entry_results if many else entry_results[0])
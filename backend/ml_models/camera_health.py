@@ -0,0 +1,228 @@
+import json
+import os
+import random
+import threading
+import time
+
+# Health states of a camera connection
+CONNECTING = 'connecting'  # Opening the stream (first time or after losing it)
+LIVE = 'live'              # Frames arriving
+DEGRADED = 'degraded'      # Connected, but frames are late
+DOWN = 'down'              # Several connection attempts in a row failed; still retrying
+
+
+class Backoff:
+    """
+    Exponential backoff with jitter: base, base*factor, base*factor^2, ...
+    capped at maximum, each delay shortened by a random share of up to
+    `jitter` so cameras that dropped together don't all retry together.
+    """
+    def __init__(self, base=1.0, maximum=30.0, factor=2.0, jitter=0.5, rng=random.random):
+        self.base = base
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.rng = rng
+        self.attempts = 0
+
+    def next_delay(self):
+        delay = min(self.maximum, self.base * self.factor ** self.attempts)
+        self.attempts += 1
+        return delay * (1.0 - self.jitter * self.rng())
+
+    def reset(self):
+        self.attempts = 0
+
+
+class CameraSupervisor:
+    """
+    Connection health of one camera, and the decisions of its reconnect
+    loop: how long to wait before the next attempt, when late frames make
+    the connection degraded and when the stream counts as lost.
+
+    The stream loop reports what happens (connect attempts, frames, read
+    timeouts) and the supervisor keeps the state, so the API can show it
+    while the loop is busy.
+    """
+    def __init__(self, camera_id, backoff=None, degraded_after=3.0, lost_after=10.0, down_after_failures=3,
+                 clock=time.time):
+        """
+        Args:
+            camera_id: camera this supervisor watches
+            backoff: Backoff between failed connection attempts
+            degraded_after: seconds without a frame before a live camera is degraded
+            lost_after: seconds without a frame before the connection is dropped and reopened
+            down_after_failures: failed attempts in a row before the camera is down
+            clock: time source (frame timestamps use the same clock)
+        """
+        self.camera_id = camera_id
+        self.backoff = backoff or Backoff()
+        self.degraded_after = degraded_after
+        self.lost_after = lost_after
+        self.down_after_failures = down_after_failures
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self.state = CONNECTING
+        self.since = clock()
+        self.last_frame_at = None
+        self.connected_at = None
+        self.failures = 0      # Failed connection attempts since the last frame
+        self.reconnects = 0    # Connections lost and reopened
+        self.next_attempt_at = None
+        self.last_error = None
+
+    def _set_state(self, state):
+        if state != self.state:
+            self.state = state
+            self.since = self.clock()
+
+    def connect(self, open_capture):
+        """
+        One connection attempt. Returns the opened capture, or None after a
+        failure; the next attempt is due at next_attempt_at.
+        """
+        with self._lock:
+            if self.state != DOWN:
+                self._set_state(CONNECTING)
+            self.next_attempt_at = None
+        try:
+            capture = open_capture()
+            if capture is not None and capture.isOpened():
+                error = None
+            else:
+                error = getattr(capture, 'error', None) or 'Could not open stream'
+        except Exception as e:
+            capture, error = None, str(e)
+
+        if error is None:
+            with self._lock:
+                self.connected_at = self.clock()
+                self.last_error = None
+            return capture
+
+        if capture is not None:
+            capture.release()
+        with self._lock:
+            self._failed(error)
+        return None
+
+    def _failed(self, error):
+        self.failures += 1
+        self.last_error = error
+        self.next_attempt_at = self.clock() + self.backoff.next_delay()
+        self._set_state(DOWN if self.failures >= self.down_after_failures else CONNECTING)
+
+    def retry_in(self):
+        """Seconds until the next connection attempt is due (0 if it's due now)"""
+        with self._lock:
+            if self.next_attempt_at is None:
+                return 0.0
+            return max(0.0, self.next_attempt_at - self.clock())
+
+    def frame_received(self, timestamp=None):
+        """A frame arrived: the camera is live and the backoff starts over"""
+        with self._lock:
+            self.last_frame_at = self.clock() if timestamp is None else timestamp
+            self.failures = 0
+            self.backoff.reset()
+            self._set_state(LIVE)
+
+    def check_stalled(self):
+        """
+        Called when no frame arrived for a while. Marks the camera degraded;
+        returns True once the connection should be dropped and reopened.
+        """
+        with self._lock:
+            since = self.last_frame_at if self.last_frame_at is not None else self.connected_at
+            waited = self.clock() - since if since is not None else 0.0
+            if waited >= self.lost_after:
+                return True
+            if waited >= self.degraded_after and self.state == LIVE:
+                self._set_state(DEGRADED)
+            return False
+
+    def connection_lost(self, reason=None):
+        """
+        The stream broke (read failure or stall). A connection that delivered
+        frames is reopened right away; one that never did counts as a failed
+        attempt, so a camera that accepts connections but sends nothing
+        backs off too.
+        """
+        with self._lock:
+            self.reconnects += 1
+            delivered = (self.last_frame_at is not None and self.connected_at is not None
+                         and self.last_frame_at >= self.connected_at)
+            self.connected_at = None
+            if delivered:
+                self.last_error = reason
+                self.next_attempt_at = None
+                self._set_state(CONNECTING)
+            else:
+                self._failed(reason)
+
+    def status(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'since': self.since,
+                'last_frame_at': self.last_frame_at,
+                'failures': self.failures,
+                'reconnects': self.reconnects,
+                'next_attempt_at': self.next_attempt_at,
+                'last_error': self.last_error,
+            }
+
+
+class CameraHealthRegistry:
+    """Supervisor of each camera whose stream is running (camera id -> CameraSupervisor)"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._supervisors = {}
+
+    def add(self, supervisor):
+        """Register a stream's supervisor, replacing the previous one for that camera"""
+        with self._lock:
+            self._supervisors[supervisor.camera_id] = supervisor
+        return supervisor
+
+    def remove(self, supervisor):
+        """Unregister a supervisor (unless a newer stream of the camera already replaced it)"""
+        with self._lock:
+            if self._supervisors.get(supervisor.camera_id) is supervisor:
+                del self._supervisors[supervisor.camera_id]
+
+    def get(self, camera_id):
+        with self._lock:
+            return self._supervisors.get(camera_id)
+
+    def status(self):
+        """{camera id: supervisor status}"""
+        with self._lock:
+            supervisors = list(self._supervisors.values())
+        return {supervisor.camera_id: supervisor.status() for supervisor in supervisors}
+
+
+def write_health_file(path, health, clock=time.time):
+    """Publish a registry status to another process (replaced atomically, like frame files)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'written_at': clock(), 'cameras': health}, f)
+    try:
+        os.replace(tmp_path, path)
+    except PermissionError:
+        # Windows: a reader has the file open right now; the next write replaces it
+        pass
+
+
+def read_health_file(path, max_age=None, clock=time.time):
+    """Status written by write_health_file(), or {} if missing or older than max_age seconds"""
+    try:
+        with open(path) as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if max_age is not None and clock() - payload.get('written_at', 0) > max_age:
+        return {}
+    # JSON keys are strings; camera ids are ints
+    return {int(camera_id): health for camera_id, health in payload.get('cameras', {}).items()}
@@ -0,0 +1,125 @@
+import threading
+import time
+
+# Reused frame buffers: the one being decoded into, the newest unread one and the one the consumer holds
+BUFFER_POOL_SIZE = 3
+
+
+class LatestFrameReader:
+    """
+    Reads an opened capture (cv2.VideoCapture or anything with read()/release())
+    on a background thread and keeps only the newest frame, stamped with the
+    time it was decoded.
+
+    The capture is drained as fast as the camera delivers, so however slow the
+    consumer is, read() never returns a stale buffered frame and RTSP lag
+    can't build up. Frames the consumer never saw are counted in frames_dropped.
+
+    With reuse_buffers, frames are decoded into preallocated buffers
+    through capture.read(image), which
+    cv2.VideoCapture and FFmpegCapture both support, instead of allocating
+    a new frame per read.
+    """
+    def __init__(self, capture, name='frame-reader', clock=time.time, reuse_buffers=False):
+        """
+        Args:
+            capture: opened capture; released by release()
+            name: reader thread name
+            clock: timestamp source for captured frames
+            reuse_buffers: decode into preallocated buffers via capture.read(image)
+        """
+        self.capture = capture
+        self.clock = clock
+        self.reuse_buffers = reuse_buffers
+        self.frames_captured = 0
+        self.frames_read = 0
+        self.frames_dropped = 0
+        self.failed = False
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._held = None
+        self._buffers = []
+        self._timestamp = None
+        self._seq = 0
+        self._read_seq = 0
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            target = self._next_buffer()
+            ok, frame = self.capture.read(target) if target is not None else self.capture.read()
+            if not ok or frame is None:
+                with self._cond:
+                    self.failed = True
+                    self._cond.notify_all()
+                return
+            timestamp = self.clock()
+            if self.reuse_buffers:
+                self._keep_buffer(frame)
+            with self._cond:
+                if self._seq > self._read_seq:
+                    self.frames_dropped += 1
+                self._frame = frame
+                self._timestamp = timestamp
+                self._seq += 1
+                self.frames_captured += 1
+                self._cond.notify_all()
+
+    def _next_buffer(self):
+        """Buffer to decode the next frame into, or None to let the capture allocate one"""
+        if not self.reuse_buffers:
+            return None
+        with self._cond:
+            busy = (id(self._frame), id(self._held))
+        for buffer in self._buffers:
+            if id(buffer) not in busy:
+                return buffer
+        return None
+
+    def _keep_buffer(self, frame):
+        if any(buffer is frame for buffer in self._buffers):
+            return
+        if self._buffers and self._buffers[0].shape != frame.shape:
+            # Resolution changed: start a new pool
+            self._buffers = []
+        if len(self._buffers) < BUFFER_POOL_SIZE:
+            self._buffers.append(frame)
+
+    @property
+    def running(self):
+        return not self._stopped and not self.failed
+
+    def read(self, timeout=None):
+        """
+        Wait for a frame newer than the last one returned.
+        Returns (ok, frame, timestamp); ok is False on timeout, or once the
+        capture has failed (see `failed`) or the reader was released.
+        The frame is not copied: the reader doesn't write into it again
+        before the next read().
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > self._read_seq or self.failed or self._stopped, timeout)
+            if self._seq > self._read_seq and not self._stopped:
+                self._read_seq = self._seq
+                self.frames_read += 1
+                # Not reused for decoding while the consumer works on it
+                self._held = self._frame
+                return True, self._frame, self._timestamp
+            return False, None, None
+
+    def latest_age(self):
+        """Seconds since the newest frame was decoded (None before the first frame)"""
+        with self._cond:
+            timestamp = self._timestamp
+        return None if timestamp is None else self.clock() - timestamp
+
+    def release(self, timeout=2.0):
+        """Stop the reader thread and release the capture"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self.capture.release()
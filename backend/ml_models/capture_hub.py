@@ -0,0 +1,208 @@
+import threading
+
+
+class Subscription:
+    """
+    One viewer of a CaptureHub. Holds only the newest frame: a slow viewer
+    skips frames (counted in frames_dropped) instead of queueing them or
+    slowing the hub down.
+    """
+    def __init__(self, hub):
+        self.hub = hub
+        self.closed = False
+        self.frames_dropped = 0
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._read_seq = 0
+
+    def _push(self, frame):
+        with self._cond:
+            if self._seq > self._read_seq:
+                self.frames_dropped += 1
+            self._frame = frame
+            self._seq += 1
+            self._cond.notify_all()
+
+    def _end(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """Newest frame not seen yet; None on timeout or once the hub has stopped and everything was read"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > self._read_seq or self.closed, timeout)
+            if self._seq > self._read_seq:
+                self._read_seq = self._seq
+                return self._frame
+            return None
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+    def __iter__(self):
+        """Frames until the hub stops; leaving the loop (e.g. client disconnect) unsubscribes"""
+        try:
+            while True:
+                frame = self.get(timeout=1.0)
+                if frame is not None:
+                    yield frame
+                elif self.closed:
+                    return
+        finally:
+            self.close()
+
+
+class CaptureHub:
+    """
+    Runs one frame source (a generator, e.g. capture + detection + JPEG
+    encoding for a camera) on its own thread and fans every frame out to
+    any number of subscribers. Reference-counted: the source starts with
+    the first subscriber and is closed (running its cleanup) once the last
+    one leaves, or when the source ends by itself.
+
+    The source only notices it should stop between frames. A viewer who
+    subscribes before then revives the hub, so the camera never gets a
+    second source while the first is still busy (in inference, a read or
+    a reconnect backoff). stop() can't be revived.
+    """
+    def __init__(self, source_factory, name='capture-hub'):
+        """
+        Args:
+            source_factory: callable returning the frame generator; called on the hub thread
+            name: thread name
+        """
+        self._source_factory = source_factory
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self._stopping = False
+        self._stop_requested = False  # stop() called: no reviving
+        self._exiting = False         # Source loop left: cleanup running
+        self.finished = False
+        self.frames_published = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    @property
+    def alive(self):
+        return not self._stopping and not self.finished
+
+    def start(self):
+        self._thread.start()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def subscribe(self):
+        """
+        New Subscription, reviving the hub if its last viewer just left;
+        raises RuntimeError once the hub was stopped or its source is closing
+        """
+        with self._lock:
+            if self._stop_requested or self._exiting or self.finished:
+                raise RuntimeError("Capture hub has stopped")
+            # The source hasn't checked since the last viewer left: it just keeps going
+            self._stopping = False
+            subscription = Subscription(self)
+            self._subscribers.append(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+                if not self._subscribers:
+                    # Last viewer gone: the source stops after its current frame
+                    self._stopping = True
+        subscription._end()
+
+    def stop(self):
+        with self._lock:
+            self._stopping = True
+            self._stop_requested = True
+
+    def _run(self):
+        source = None
+        try:
+            source = self._source_factory()
+            for frame in source:
+                with self._lock:
+                    if self._stopping:
+                        self._exiting = True
+                        break
+                    subscribers = list(self._subscribers)
+                for subscription in subscribers:
+                    subscription._push(frame)
+                self.frames_published += 1
+        finally:
+            with self._lock:
+                self._exiting = True
+            if source is not None and hasattr(source, 'close'):
+                # Runs the generator's own cleanup (release capture, unregister, ...)
+                source.close()
+            with self._lock:
+                self._stopping = True
+                self.finished = True
+                subscribers, self._subscribers = self._subscribers, []
+            for subscription in subscribers:
+                subscription._end()
+
+
+class CaptureHubRegistry:
+    """At most one running CaptureHub per key (camera id)"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hubs = {}
+
+    def subscribe(self, key, source_factory):
+        """
+        Subscribe to the running hub for key, or start one from source_factory.
+        Atomic, so two viewers arriving together never start two sources, and
+        a new source only starts once the previous one for the key has
+        finished its cleanup (sources of one camera share its tracker and
+        scheduler registrations).
+        """
+        while True:
+            with self._lock:
+                hub = self._hubs.get(key)
+                if hub is not None:
+                    try:
+                        return hub.subscribe()
+                    except RuntimeError:
+                        pass  # Stopped or closing
+                if hub is None or hub.finished:
+                    hub = CaptureHub(source_factory, name=f"capture-hub-{key}")
+                    subscription = hub.subscribe()
+                    self._hubs[key] = hub
+                    hub.start()
+                    return subscription
+            # Wait outside the lock: other cameras' viewers aren't held up
+            hub.join()
+
+    def get(self, key):
+        """Running hub for key, or None"""
+        with self._lock:
+            hub = self._hubs.get(key)
+        return hub if hub is not None and hub.alive else None
+
+    def stop(self, key):
+        """Stop the hub for key; it stays registered until it finished, so no new one overlaps it"""
+        with self._lock:
+            hub = self._hubs.get(key)
+        if hub is not None:
+            hub.stop()
+        return hub
+
+    def status(self):
+        """{key: {'subscribers': n, 'frames_published': n}} for the running hubs"""
+        with self._lock:
+            hubs = list(self._hubs.items())
+        return {
+            key: {'subscribers': hub.subscriber_count, 'frames_published': hub.frames_published}
+            for key, hub in hubs if hub.alive
+        }
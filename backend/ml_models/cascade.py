@@ -0,0 +1,112 @@
+import cv2
+import numpy as np
+
+
+def use_cascade(cascade_enabled, tracker):
+    """
+    Whether a camera's detection frame goes to the person detector. Person
+    boxes are only classified through tracks, so without a tracker (DeepSort
+    missing or failed to start) the frame must go to the compliance model:
+    the untracked fallback reads compliance class names from the boxes.
+    """
+    return bool(cascade_enabled) and tracker is not None
+
+
+class ComplianceCascade:
+    """
+    Second stage of the person -> compliance cascade for one camera.
+
+    A tiny person detector and DeepSort run on every detection frame; the
+    uniform compliance model only sees higher-resolution crops of tracks that
+    have no verdict yet. A track is resolved once the classifier is confident
+    enough and is never classified again, so classifier cost follows the
+    number of new people rather than frames x resolution.
+    """
+    def __init__(self, crop_size=(416, 416), margin=0.15, min_confidence=0.6,
+                 retry_interval=5, max_attempts=10, max_crops=8):
+        """
+        Args:
+            crop_size: (width, height) the person crops are resized to for the classifier
+            margin: context added around each person box, as a fraction of its size
+            min_confidence: classifier confidence that resolves a track
+            retry_interval: detection frames to wait before re-classifying an unresolved track
+            max_attempts: after this many tries the best verdict so far is accepted
+            max_crops: crops classified per frame (one classifier batch)
+        """
+        self.crop_size = crop_size
+        self.margin = margin
+        self.min_confidence = min_confidence
+        self.retry_interval = retry_interval
+        self.max_attempts = max_attempts
+        self.max_crops = max(1, int(max_crops))
+
+        # track_id -> {'best': (cls, conf) or None, 'attempts': int, 'last_tick': int, 'resolved': bool}
+        self._tracks = {}
+        self._tick = 0
+        self._buffers = np.empty((self.max_crops, crop_size[1], crop_size[0], 3), dtype=np.uint8)
+
+        # Counters
+        self.crops_classified = 0
+        self.tracks_resolved = 0
+
+    def pending(self, track_ids):
+        """Track ids (at most max_crops) that need a classifier pass this frame, new tracks first"""
+        self._tick += 1
+        new, retry = [], []
+        for track_id in track_ids:
+            state = self._tracks.get(track_id)
+            if state is None:
+                new.append(track_id)
+            elif not state['resolved'] and self._tick - state['last_tick'] >= self.retry_interval:
+                retry.append(track_id)
+        return (new + retry)[:self.max_crops]
+
+    def crops(self, frame, boxes):
+        """
+        Crops of frame around each (x1, y1, x2, y2) box (frame pixel coordinates),
+        widened by margin and resized into the reused crop buffers.
+        """
+        frame_h, frame_w = frame.shape[:2]
+        crops = []
+        for i, (x1, y1, x2, y2) in enumerate(boxes[:self.max_crops]):
+            pad_x = (x2 - x1) * self.margin
+            pad_y = (y2 - y1) * self.margin
+            cx1 = int(max(0, min(frame_w - 1, x1 - pad_x)))
+            cy1 = int(max(0, min(frame_h - 1, y1 - pad_y)))
+            cx2 = int(max(cx1 + 1, min(frame_w, x2 + pad_x)))
+            cy2 = int(max(cy1 + 1, min(frame_h, y2 + pad_y)))
+            crops.append(cv2.resize(frame[cy1:cy2, cx1:cx2], self.crop_size, dst=self._buffers[i]))
+        return crops
+
+    def update(self, track_id, boxes):
+        """Record the classifier's Nx6 [x1, y1, x2, y2, conf, cls] output for a track's crop"""
+        state = self._tracks.setdefault(track_id, {'best': None, 'attempts': 0, 'last_tick': 0, 'resolved': False})
+        state['attempts'] += 1
+        state['last_tick'] = self._tick
+        self.crops_classified += 1
+
+        boxes = np.asarray(boxes).reshape(-1, 6)
+        if len(boxes):
+            # The crop is centred on one person: the most confident box is the verdict
+            best = boxes[np.argmax(boxes[:, 4])]
+            verdict = (int(best[5]), float(best[4]))
+            if state['best'] is None or verdict[1] > state['best'][1]:
+                state['best'] = verdict
+
+        if state['best'] is not None and (state['best'][1] >= self.min_confidence or state['attempts'] >= self.max_attempts):
+            state['resolved'] = True
+            self.tracks_resolved += 1
+
+    def get(self, track_id):
+        """(cls, conf) verdict for a resolved track, else None"""
+        state = self._tracks.get(track_id)
+        if state is None or not state['resolved']:
+            return None
+        return state['best']
+
+    def prune(self, active_track_ids):
+        """Forget tracks DeepSort no longer reports"""
+        active = set(active_track_ids)
+        for track_id in list(self._tracks):
+            if track_id not in active:
+                del self._tracks[track_id]
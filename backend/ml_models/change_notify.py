@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class ChangeNotifier:
+    """
+    Version stamps of keyed objects (e.g. camera configs), kept in memory so
+    a hot loop can check for changes with a dict lookup instead of a query.
+
+    notify(key) bumps the key's version in this process and touches a small
+    marker file in `directory`; a watcher thread in every other process
+    stats the directory every poll_interval seconds and bumps the versions
+    of the markers that changed, so other processes see the change within
+    one poll interval.
+    """
+    def __init__(self, directory, poll_interval=1.0):
+        """
+        Args:
+            directory: marker directory shared by the processes of one deployment
+            poll_interval: seconds between checks for other processes' changes
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._markers = self._scan()
+        self._written = 0
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def version(self, key):
+        """Current version of key (starts at 0); changes whenever key is notified, in any process"""
+        return self._versions.get(key, 0)
+
+    def _bump(self, key):
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+    def notify(self, key):
+        """Mark key as changed here and in every other process"""
+        self._bump(key)
+        path = self.directory / f"{key}.version"
+        with self._lock:
+            self._written += 1
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{self._written}.tmp")
+        try:
+            # A fresh file each time: its inode and mtime tell watchers it changed
+            tmp_path.write_text(f"{os.getpid()} {time.time()}")
+            stat = tmp_path.stat()
+            with self._lock:
+                # Our own change is already counted (the rename keeps inode and mtime)
+                self._markers[path.stem] = (stat.st_mtime_ns, stat.st_ino)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Other processes fall back to their periodic refresh
+            pass
+
+    def _scan(self):
+        markers = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return markers
+        for entry in entries:
+            if not entry.name.endswith('.version'):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            markers[entry.name[:-len('.version')]] = (stat.st_mtime_ns, stat.st_ino)
+        return markers
+
+    def poll(self):
+        """Pick up other processes' changes; returns the keys (as strings) that changed"""
+        markers = self._scan()
+        changed = []
+        with self._lock:
+            for name, stamp in markers.items():
+                if self._markers.get(name) != stamp:
+                    self._markers[name] = stamp
+                    changed.append(name)
+        for name in changed:
+            self._bump(int(name) if name.isdigit() else name)
+        return changed
+
+    def start(self):
+        """Start the watcher thread (once)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._watch, name='change-notifier', daemon=True)
+        self._thread.start()
+
+    def _watch(self):
+        while not self._stopped.wait(self.poll_interval):
+            self.poll()
+
+    def stop(self):
+        self._stopped.set()
@@ -0,0 +1,180 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+from ml_models.backends import weights_hash
+
+# Ahead-of-time variants of the PyTorch detector (CPU only)
+COMPILE_MODES = ('none', 'torchscript', 'inductor')
+
+
+def cpu_supports_bf16(cpuinfo_path='/proc/cpuinfo'):
+    """
+    True when the CPU has native bfloat16 instructions (AVX512-BF16 or AMX).
+    Without them bf16 autocast is emulated and slower than fp32.
+    """
+    try:
+        with open(cpuinfo_path) as f:
+            for line in f:
+                if line.startswith('flags'):
+                    flags = set(line.split(':', 1)[1].split())
+                    return bool(flags & {'avx512_bf16', 'amx_bf16'})
+    except OSError:
+        pass
+    return False
+
+
+def compiled_cache_dir(weights_path, mode, bf16=False):
+    """
+    Directory holding the compiled artifacts for a weights file, keyed by its
+    hash like the exported backends (e.g. best.3f9a1c2b7d4e.torchscript-bf16/).
+    TorchScript keeps one frozen module per input shape there; inductor uses
+    it as its code cache.
+    """
+    if mode not in COMPILE_MODES or mode == 'none':
+        raise ValueError(f"Compile mode '{mode}' has no artifacts. Choose one of: {', '.join(COMPILE_MODES[1:])}")
+    weights_path = Path(weights_path)
+    suffix = f"{mode}-bf16" if bf16 else mode
+    return weights_path.with_name(f"{weights_path.stem}.{weights_hash(weights_path)}.{suffix}")
+
+
+def _shape_key(shape):
+    return 'x'.join(str(int(d)) for d in shape)
+
+
+def _inference_module(net, bf16):
+    import torch
+
+    class ChannelsLastInference(torch.nn.Module):
+        """Eval-only forward: channels_last input, optional bf16 autocast, single fp32 output"""
+        def __init__(self):
+            super().__init__()
+            self.net = net
+
+        def forward(self, x):
+            x = x.contiguous(memory_format=torch.channels_last)
+            with torch.autocast('cpu', dtype=torch.bfloat16, enabled=bf16):
+                # predict() rather than forward(): forward is replaced by the compiled variant
+                y = self.net.predict(x)
+            if isinstance(y, (list, tuple)):
+                y = y[0]
+            return y.float()
+
+    return ChannelsLastInference().eval()
+
+
+class CompiledForward:
+    """
+    Replacement for a YOLO DetectionModel's forward that runs an ahead-of-time
+    variant of it. Ultralytics keeps doing pre/post-processing and NMS, so
+    model(frames, ...) and model.names work unchanged.
+
+    - 'torchscript': traced and frozen per input shape (batch, imgsz), saved
+      to the cache dir; later starts load the frozen module instead of tracing
+    - 'inductor': torch.compile with dynamic shapes; generated kernels are
+      cached in the cache dir, so later starts skip most of the compilation
+    """
+    def __init__(self, net, cache_dir, mode='torchscript', bf16=False):
+        import torch
+
+        self.mode = mode
+        self.bf16 = bf16
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._module = _inference_module(net, bf16)
+        self._traced = {}
+        self._lock = threading.Lock()
+        self._compiled = None
+
+        if mode == 'inductor':
+            os.environ.setdefault('TORCHINDUCTOR_CACHE_DIR', str(self.cache_dir))
+            try:
+                import torch._inductor.config as inductor_config
+                inductor_config.fx_graph_cache = True
+            except (ImportError, AttributeError):
+                pass
+            self._compiled = torch.compile(self._module, dynamic=True)
+
+    def __call__(self, x, *args, **kwargs):
+        # augment/visualize/embed from ultralytics are not supported by compiled variants
+        import torch
+
+        with torch.no_grad():
+            if self._compiled is not None:
+                return self._compiled(x)
+            return self._traced_for(x)(x)
+
+    def _traced_for(self, x):
+        key = _shape_key(x.shape)
+        module = self._traced.get(key)
+        if module is not None:
+            return module
+
+        with self._lock:
+            module = self._traced.get(key)
+            if module is None:
+                module = self._load_or_trace(x, key)
+                self._traced[key] = module
+        return module
+
+    def _load_or_trace(self, x, key):
+        import torch
+
+        path = self.cache_dir / f"{key}.pt"
+        if path.exists():
+            try:
+                return torch.jit.load(str(path), map_location='cpu')
+            except Exception as e:
+                print(f"[YOLO] ⚠️ Cached TorchScript module {path.name} unusable, tracing again: {str(e)}", flush=True)
+
+        started = time.perf_counter()
+        example = torch.zeros(tuple(x.shape), dtype=x.dtype)
+        if self.bf16 and hasattr(torch._C, '_jit_set_autocast_mode'):
+            # Keep the autocast casts recorded by the tracer instead of re-applying JIT autocast
+            torch._C._jit_set_autocast_mode(False)
+        with torch.no_grad():
+            traced = torch.jit.trace(self._module, example, check_trace=False)
+            traced = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+            # Run the profiling executor's warm-up passes before the module is shared
+            traced(example)
+            traced(example)
+        torch.jit.save(traced, str(path))
+        print(f"[YOLO] Traced TorchScript module for input {key} in {time.perf_counter() - started:.1f}s "
+              f"(cached at {path})", flush=True)
+        return traced
+
+
+def compile_detector(model, weights_path, mode='torchscript', bf16=False):
+    """
+    Switch an ultralytics YOLO model (PyTorch backend) to an ahead-of-time
+    variant in place: fused, channels_last, optionally bf16 autocast (only
+    used when the CPU supports it natively). Returns the model.
+    """
+    import torch
+
+    if mode not in COMPILE_MODES:
+        raise ValueError(f"Unknown compile mode '{mode}'. Choose one of: {', '.join(COMPILE_MODES)}")
+    if mode == 'none':
+        return model
+    if torch.cuda.is_available():
+        print(f"[YOLO] ⚠️ Compiled CPU variants are skipped on CUDA, using the eager model", flush=True)
+        return model
+
+    if bf16 and not cpu_supports_bf16():
+        print(f"[YOLO] ⚠️ CPU has no native bf16 support, compiling in fp32", flush=True)
+        bf16 = False
+
+    net = model.model
+    net.eval()
+    for parameter in net.parameters():
+        parameter.requires_grad_(False)
+    # Fuse Conv+BN now: ultralytics would otherwise do it on first predict, after compilation
+    if hasattr(net, 'fuse'):
+        net.fuse(verbose=False)
+    net.to(memory_format=torch.channels_last)
+
+    cache_dir = compiled_cache_dir(weights_path, mode, bf16=bf16)
+    net.forward = CompiledForward(net, cache_dir, mode=mode, bf16=bf16)
+    print(f"[YOLO] Using {mode} variant (channels_last{', bf16 autocast' if bf16 else ''}), cache: {cache_dir}", flush=True)
+    return model
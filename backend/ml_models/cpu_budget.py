@@ -0,0 +1,118 @@
+import os
+import threading
+
+
+def available_cores():
+    """CPU ids this process may run on (respects taskset/cgroup affinity where supported)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def pin_current_thread(cores):
+    """
+    Restrict the calling thread (and threads it starts later) to the given
+    CPU ids. Returns the previous affinity so a pooled thread can be restored,
+    or None when pinning is unsupported (non-Linux) or cores is empty.
+    """
+    if not cores or not hasattr(os, 'sched_setaffinity'):
+        return None
+    try:
+        # On Linux a native thread id is a valid target for sched_setaffinity
+        tid = threading.get_native_id()
+        previous = os.sched_getaffinity(tid)
+        os.sched_setaffinity(tid, set(cores))
+        return previous
+    except OSError:
+        return None
+
+
+def limit_library_threads(num_threads):
+    """
+    Cap the intra-op thread pools of the libraries used here. torch and
+    OpenCV pools are process-wide, so call this once per process.
+    OMP_NUM_THREADS also covers libraries that only read it when loaded
+    (onnxruntime, OpenVINO) and processes spawned afterwards.
+    """
+    num_threads = max(1, int(num_threads))
+    os.environ['OMP_NUM_THREADS'] = str(num_threads)
+
+    import cv2
+    # Frame preprocessing is per stream and small: parallelism comes from the streams themselves
+    cv2.setNumThreads(1)
+
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+    except ImportError:
+        pass
+
+
+class CoreBudget:
+    """
+    Static partition of the machine's cores between inference and camera streams.
+
+    Every library defaults to one thread per core, in every stream thread
+    and inference process, which oversubscribes the CPU as soon as a few
+    cameras run. Instead:
+    - `reserved` cores are left to Django, the database and the OS
+    - `inference_share` of the rest is split evenly between the inference
+      pools (one per worker process, or a single in-process pool)
+    - the remaining cores are split into `camera_slots` groups that camera
+      stream threads are pinned to round-robin
+    """
+    def __init__(self, cores=None, inference_pools=1, camera_slots=4, reserved=1, inference_share=0.5):
+        cores = list(cores) if cores is not None else available_cores()
+        self.total = len(cores)
+        inference_pools = max(1, int(inference_pools))
+        camera_slots = max(1, int(camera_slots))
+
+        # Never reserve or hand out more than the machine has
+        reserved = min(max(0, int(reserved)), max(0, len(cores) - 2))
+        usable = cores[reserved:]
+        self.reserved = cores[:reserved]
+
+        inference_count = min(max(inference_pools, int(round(len(usable) * inference_share))), len(usable) - 1)
+        inference_count = max(1, inference_count)
+        inference_cores = usable[:inference_count]
+        stream_cores = usable[inference_count:] or usable
+
+        self.inference = self._split(inference_cores, inference_pools)
+        self.streams = self._split(stream_cores, min(camera_slots, len(stream_cores)))
+
+        self._next_slot = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _split(cores, parts):
+        """Split cores into `parts` contiguous groups; groups share cores if there are too few"""
+        if len(cores) >= parts:
+            size, extra = divmod(len(cores), parts)
+            groups, start = [], 0
+            for i in range(parts):
+                end = start + size + (1 if i < extra else 0)
+                groups.append(cores[start:end])
+                start = end
+            return groups
+        return [[cores[i % len(cores)]] for i in range(parts)]
+
+    def inference_cores(self, pool=0):
+        return self.inference[pool % len(self.inference)]
+
+    def next_stream_cores(self):
+        """Core group for the next camera stream (round-robin over the slots)"""
+        with self._lock:
+            cores = self.streams[self._next_slot % len(self.streams)]
+            self._next_slot += 1
+        return cores
+
+    def report(self):
+        """Human-readable partition, one line per group"""
+        lines = [f"{self.total} cores available"]
+        if self.reserved:
+            lines.append(f"reserved (Django/OS): {self.reserved}")
+        for i, cores in enumerate(self.inference):
+            lines.append(f"inference pool {i}: {cores} ({len(cores)} threads)")
+        for i, cores in enumerate(self.streams):
+            lines.append(f"camera slot {i}: {cores}")
+        return lines
@@ -0,0 +1,167 @@
+import collections
+import subprocess
+import threading
+
+import numpy as np
+
+
+def output_size(source_size, width=None, height=None):
+    """
+    Decoded frame size for the requested width/height. A missing side keeps
+    the source aspect ratio (rounded to even, as most encoders/filters
+    expect); without either the source size is kept.
+    """
+    source_w, source_h = source_size
+    if width and height:
+        return int(width), int(height)
+    if width:
+        return int(width), max(2, int(round(width * source_h / source_w / 2)) * 2)
+    if height:
+        return max(2, int(round(height * source_w / source_h / 2)) * 2), int(height)
+    return int(source_w), int(source_h)
+
+
+def ffmpeg_command(url, size, fps=None, rtsp_transport='tcp', ffmpeg='ffmpeg', skip_frame=None):
+    """
+    ffmpeg arguments that decode url, drop to fps, scale to size and write raw BGR frames to stdout.
+    skip_frame ('nokey', 'nonintra', 'bidir', 'noref') makes the decoder skip those frames entirely.
+    """
+    command = [ffmpeg, '-hide_banner', '-loglevel', 'error', '-nostdin']
+    if url.startswith('rtsp://') or url.startswith('rtsps://'):
+        command += ['-rtsp_transport', rtsp_transport]
+    if skip_frame:
+        command += ['-skip_frame', skip_frame]
+    # Don't buffer input: we want the newest frame, not a smooth playback
+    command += ['-fflags', 'nobuffer', '-flags', 'low_delay', '-i', url]
+
+    filters = []
+    if fps:
+        filters.append(f"fps={fps}")
+    filters.append(f"scale={size[0]}:{size[1]}")
+    command += ['-vf', ','.join(filters), '-an', '-sn']
+    if skip_frame:
+        # Pass the decoded frames through as they come (rawvideo output would otherwise duplicate them to a constant rate)
+        command += ['-vsync', 'passthrough']
+    command += ['-f', 'rawvideo', '-pix_fmt', 'bgr24', 'pipe:1']
+    return command
+
+
+def probe_size(url, ffprobe='ffprobe', timeout=10.0):
+    """(width, height) of the first video stream, or None if ffprobe can't tell"""
+    command = [ffprobe, '-v', 'error', '-select_streams', 'v:0',
+               '-show_entries', 'stream=width,height', '-of', 'csv=p=0:s=x', url]
+    try:
+        output = subprocess.run(command, capture_output=True, text=True, timeout=timeout).stdout
+        width, height = output.strip().splitlines()[0].split('x')[:2]
+        return int(width), int(height)
+    except (OSError, subprocess.SubprocessError, ValueError, IndexError):
+        return None
+
+
+class FFmpegCapture:
+    """
+    Camera capture through an ffmpeg subprocess: decoding, scaling and
+    frame-rate reduction run in native code in another process, and raw
+    BGR frames are read from the pipe straight into numpy buffers.
+
+    Implements the part of cv2.VideoCapture the stream uses (isOpened(),
+    read(image=None), release()). Passing a preallocated `image` to read()
+    fills it in place instead of allocating a frame.
+    """
+    def __init__(self, url, width=None, height=None, fps=None, rtsp_transport='tcp',
+                 ffmpeg='ffmpeg', ffprobe='ffprobe', open_timeout=10.0, skip_frame=None):
+        """
+        Args:
+            url: camera URL (rtsp://, http://, file path, ...)
+            width / height: output size; a missing side keeps the source aspect ratio
+            fps: output frame rate (None keeps the camera's)
+            rtsp_transport: 'tcp' or 'udp' for RTSP sources
+            open_timeout: seconds to wait for the first frame before giving up
+            skip_frame: frames the decoder skips ('nokey' decodes keyframes only; None decodes all)
+        """
+        self.url = url
+        if width and height:
+            size = (int(width), int(height))
+        else:
+            source_size = probe_size(url, ffprobe=ffprobe, timeout=open_timeout)
+            if source_size is None:
+                # Unknown source: assume 16:9 (ffmpeg scales to exactly this size anyway)
+                source_size = (16, 9) if (width or height) else (1280, 720)
+            size = output_size(source_size, width, height)
+        self.width, self.height = size
+        self.shape = (self.height, self.width, 3)
+        self.frame_bytes = self.width * self.height * 3
+
+        self._stderr = collections.deque(maxlen=20)
+        self._first = None
+        try:
+            self._process = subprocess.Popen(
+                ffmpeg_command(url, size, fps=fps, rtsp_transport=rtsp_transport, ffmpeg=ffmpeg, skip_frame=skip_frame),
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0,
+            )
+        except OSError as e:
+            self._process = None
+            self._stderr.append(str(e))
+            return
+        threading.Thread(target=self._drain_stderr, name='ffmpeg-stderr', daemon=True).start()
+
+        # "Opened" means a frame came through, like cv2.VideoCapture connecting
+        opener = threading.Thread(target=self._read_first, daemon=True)
+        opener.start()
+        opener.join(open_timeout)
+        if self._first is None:
+            self.release()
+
+    def _drain_stderr(self):
+        for line in self._process.stderr:
+            self._stderr.append(line.decode(errors='replace').rstrip())
+
+    def _read_first(self):
+        frame = np.empty(self.shape, dtype=np.uint8)
+        if self._read_into(frame):
+            self._first = frame
+
+    @property
+    def error(self):
+        """Last lines ffmpeg wrote to stderr (why it failed, usually)"""
+        return '\n'.join(self._stderr)
+
+    def isOpened(self):
+        return self._process is not None and self._process.poll() is None
+
+    def _read_into(self, frame):
+        view = memoryview(frame.reshape(-1))
+        received = 0
+        while received < self.frame_bytes:
+            count = self._process.stdout.readinto(view[received:])
+            if not count:
+                return False
+            received += count
+        return True
+
+    def read(self, image=None):
+        """(ok, frame); frame is `image` when it is a matching uint8 buffer"""
+        if self._process is None:
+            return False, None
+        if image is None or image.shape != self.shape or image.dtype != np.uint8 or not image.flags.c_contiguous:
+            image = np.empty(self.shape, dtype=np.uint8)
+
+        if self._first is not None:
+            np.copyto(image, self._first)
+            self._first = None
+            return True, image
+        if not self._read_into(image):
+            return False, None
+        return True, image
+
+    def release(self):
+        process, self._process = self._process, None
+        if process is None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        process.stdout.close()
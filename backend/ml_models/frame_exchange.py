@@ -0,0 +1,95 @@
+import os
+import struct
+import time
+from pathlib import Path
+
+# Sequence number and publish time, in front of the frame bytes
+HEADER = struct.Struct('<Qd')
+
+
+def frame_path(directory, key):
+    return Path(directory) / f"{key}.frame"
+
+
+class FrameFileWriter:
+    """
+    Publishes the latest encoded frame of one camera to other processes
+    (e.g. from `manage.py run_detectors` to the web server). Each frame
+    replaces the previous one atomically, so readers never see a torn frame.
+    """
+    def __init__(self, directory, key, clock=time.time):
+        self.path = frame_path(directory, key)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        self.clock = clock
+        self.seq = 0
+
+    def publish(self, data):
+        self.seq += 1
+        with open(self._tmp_path, 'wb') as f:
+            f.write(HEADER.pack(self.seq, self.clock()))
+            f.write(data)
+        try:
+            os.replace(self._tmp_path, self.path)
+        except PermissionError:
+            # Windows: a reader has the file open right now; the next frame replaces it
+            pass
+
+    def close(self):
+        for path in (self._tmp_path, self.path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class FrameFileReader:
+    """Reads frames published by a FrameFileWriter, each one at most once"""
+    def __init__(self, directory, key, poll_interval=0.02, clock=time.time):
+        self.path = frame_path(directory, key)
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.seq = 0
+        self.timestamp = None
+        self._stat = None
+
+    def read(self, timeout=None):
+        """
+        Next frame not read yet, waiting up to timeout seconds.
+        Returns (data, timestamp), or (None, None) if nothing new was published.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            data = self._poll()
+            if data is not None:
+                return data, self.timestamp
+            if deadline is not None and time.monotonic() >= deadline:
+                return None, None
+            time.sleep(self.poll_interval)
+
+    def age(self):
+        """Seconds since the last frame was published (None if none was ever read)"""
+        return None if self.timestamp is None else self.clock() - self.timestamp
+
+    def _poll(self):
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if key == self._stat:
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                payload = f.read()
+        except (FileNotFoundError, PermissionError):
+            return None
+        if len(payload) < HEADER.size:
+            return None
+        seq, timestamp = HEADER.unpack_from(payload)
+        self._stat = key
+        if seq == self.seq and timestamp == self.timestamp:
+            return None
+        self.seq = seq
+        self.timestamp = timestamp
+        return payload[HEADER.size:]
@@ -0,0 +1,232 @@
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MAGIC = 0x47575242  # "GWRB"
+# Header fields (int64): magic, slots, height, width, channels, max_readers, latest_slot, retired
+_HEADER_FIELDS = 8
+_LATEST, _RETIRED = 6, 7
+# Slot sequence number while the writer is filling it
+WRITING = np.iinfo(np.uint64).max
+
+FrameSlot = namedtuple('FrameSlot', ['seq', 'timestamp', 'frame'])
+
+# Rings created by this process (their tracker registration belongs to the creator)
+_created_here = set()
+
+
+def _attach_shared_memory(name):
+    """Open an existing block without letting this process's resource tracker unlink it at exit"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: attaching registers the block with the tracker; undo that
+        shm = shared_memory.SharedMemory(name=name)
+        if name not in _created_here:
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, 'shared_memory')
+            except Exception:
+                pass
+        return shm
+
+
+def _layout(slots, frame_shape, max_readers):
+    """Byte offsets of the header, slot seqs, slot timestamps, reader pins and frame data"""
+    header = 0
+    seqs = header + _HEADER_FIELDS * 8
+    times = seqs + slots * 8
+    pins = times + slots * 8
+    # Frame data starts on a cache line
+    data = -(-(pins + max_readers * 8) // 64) * 64
+    size = data + slots * int(np.prod(frame_shape))
+    return seqs, times, pins, data, size
+
+
+class FrameRing:
+    """
+    Fixed-size ring of frames in shared memory: one writer (capture) and up
+    to max_readers readers in any process (inference, encoder, recorder),
+    none of which copy the frame. Each slot carries a sequence number and
+    the frame's capture timestamp.
+
+    Readers pin the slot they're using (one per reader index, in their own
+    cell, so no locks are needed); the writer skips pinned slots, so a
+    frame stays valid until its reader moves on, however slow it is. The
+    writer marks a slot as WRITING before checking the pins and readers
+    re-check the slot after pinning it, so neither side can miss the other.
+    With slots >= max_readers + 2 the writer always finds a free slot.
+    """
+    def __init__(self, shm, owner):
+        self._shm = shm
+        self.owner = owner
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        if header[0] != MAGIC:
+            raise ValueError(f"Shared memory block '{shm.name}' is not a frame ring")
+        self._header = header
+        self.slots = int(header[1])
+        self.frame_shape = (int(header[2]), int(header[3]), int(header[4]))
+        self.max_readers = int(header[5])
+
+        seqs, times, pins, data, _ = _layout(self.slots, self.frame_shape, self.max_readers)
+        self._seqs = np.ndarray((self.slots,), dtype=np.uint64, buffer=shm.buf, offset=seqs)
+        self._times = np.ndarray((self.slots,), dtype=np.float64, buffer=shm.buf, offset=times)
+        self._pins = np.ndarray((self.max_readers,), dtype=np.uint64, buffer=shm.buf, offset=pins)
+        self._frames = np.ndarray((self.slots,) + self.frame_shape, dtype=np.uint8, buffer=shm.buf, offset=data)
+        self._write_seq = int(self._seqs.max()) if owner else 0
+        self._writing = None
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @classmethod
+    def create(cls, name, frame_shape, slots=8, max_readers=4):
+        """Create the ring (the writer's side); replaces a stale block left by a crashed writer"""
+        frame_shape = tuple(int(d) for d in frame_shape)
+        if len(frame_shape) == 2:
+            frame_shape += (1,)
+        slots = max(int(slots), int(max_readers) + 2)
+        *_, size = _layout(slots, frame_shape, max_readers)
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = (0, slots, *frame_shape, max_readers, -1, 0)
+        seqs, *_ = _layout(slots, frame_shape, max_readers)
+        np.ndarray((slots,), dtype=np.uint64, buffer=shm.buf, offset=seqs)[:] = 0
+        header[0] = MAGIC  # Written last: the ring is complete once attachable
+        _created_here.add(name)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Open an existing ring (a reader's side)"""
+        shm = _attach_shared_memory(name)
+        try:
+            return cls(shm, owner=False)
+        except ValueError:
+            shm.close()
+            raise
+
+    @property
+    def latest_seq(self):
+        slot = int(self._header[_LATEST])
+        if slot < 0:
+            return 0
+        seq = self._seqs[slot]
+        return 0 if seq == WRITING else int(seq)
+
+    @property
+    def retired(self):
+        """True once the writer has replaced this ring (e.g. the camera changed resolution)"""
+        return bool(self._header[_RETIRED])
+
+    # ---- writer ----
+
+    def begin_write(self):
+        """
+        Claim the next free slot and return it as an array to fill in place
+        (a decoder can write straight into it); call commit() when done.
+        """
+        latest = int(self._header[_LATEST])
+        for step in range(1, self.slots + 1):
+            slot = (latest + step) % self.slots
+            if slot == latest:
+                continue
+            previous = self._seqs[slot]
+            self._seqs[slot] = WRITING
+            if previous and previous in self._pins:
+                # A reader still uses this frame: put it back and try the next slot
+                self._seqs[slot] = previous
+                continue
+            self._writing = slot
+            return self._frames[slot]
+        raise RuntimeError(f"Frame ring '{self.name}' has no free slot (more readers than slots?)")
+
+    def commit(self, timestamp=None):
+        """Publish the slot claimed by begin_write(); returns its sequence number"""
+        slot, self._writing = self._writing, None
+        self._write_seq += 1
+        self._times[slot] = time.time() if timestamp is None else timestamp
+        self._seqs[slot] = self._write_seq
+        self._header[_LATEST] = slot
+        return self._write_seq
+
+    def abort_write(self):
+        """Give back the slot claimed by begin_write() without publishing it"""
+        slot, self._writing = self._writing, None
+        if slot is not None:
+            self._seqs[slot] = 0
+
+    def write(self, frame, timestamp=None):
+        """Copy a frame into the next free slot and publish it"""
+        if frame.shape != self.frame_shape:
+            frame = frame.reshape(self.frame_shape)
+        np.copyto(self.begin_write(), frame)
+        return self.commit(timestamp)
+
+    def retire(self):
+        self._header[_RETIRED] = 1
+
+    # ---- readers ----
+
+    def acquire_latest(self, reader, after_seq=0):
+        """
+        Pin and return the newest frame as FrameSlot(seq, timestamp, frame)
+        if it's newer than after_seq, else None. `frame` is a view into
+        shared memory, valid until this reader's next acquire or release.
+        """
+        pins = self._pins
+        for _ in range(self.slots):
+            slot = int(self._header[_LATEST])
+            if slot < 0:
+                return None
+            seq = self._seqs[slot]
+            if seq == WRITING or int(seq) <= after_seq:
+                return None
+            pins[reader] = seq
+            # The writer may have claimed the slot before seeing the pin: check again
+            if self._seqs[slot] == seq:
+                return FrameSlot(int(seq), float(self._times[slot]), self._frames[slot])
+        pins[reader] = 0
+        return None
+
+    def wait_latest(self, reader, after_seq=0, timeout=None, poll_interval=0.002):
+        """acquire_latest(), polling until a newer frame arrives or timeout expires"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            frame_slot = self.acquire_latest(reader, after_seq)
+            if frame_slot is not None:
+                return frame_slot
+            if self.retired or (deadline is not None and time.monotonic() >= deadline):
+                return None
+            time.sleep(poll_interval)
+
+    def release(self, reader):
+        """Unpin this reader's frame"""
+        self._pins[reader] = 0
+
+    # ---- lifetime ----
+
+    def close(self):
+        """Detach; the ring's creator also removes the shared memory block"""
+        self._header = self._seqs = self._times = self._pins = self._frames = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # A caller still holds a frame view; the mapping goes away with it
+            pass
+        if self.owner:
+            _created_here.discard(self._shm.name.lstrip('/'))
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,335 @@
+import threading
+import time
+from urllib.parse import urlparse, urlunparse
+
+import numpy as np
+
+SOI = b'\xff\xd8'
+EOI = b'\xff\xd9'
+# A part that grows past this without completing is garbage: resynchronize
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+# Start-of-frame markers that carry the image size (every SOFn except DHT, JPG and DAC)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def boundary_from_content_type(content_type):
+    """Multipart boundary of a Content-Type header, or None"""
+    for param in (content_type or '').split(';')[1:]:
+        key, _, value = param.strip().partition('=')
+        if key.strip().lower() == 'boundary' and value:
+            return value.strip().strip('"')
+    return None
+
+
+def is_mjpeg(content_type):
+    content_type = (content_type or '').lower()
+    return 'multipart/x-mixed-replace' in content_type or content_type.startswith('image/jpeg')
+
+
+class MJPEGParser:
+    """
+    Incremental parser for an MJPEG (multipart/x-mixed-replace) HTTP body:
+    feed() it chunks as they arrive and it returns the complete JPEG parts,
+    keeping only the unfinished part in memory.
+
+    Parts with a Content-Length header are cut at that length; otherwise
+    the part runs to the next boundary, or ends as soon as the data
+    received so far ends with a JPEG end-of-image marker. Cameras are lax about the boundary
+    (a header value of "--abc" with "--abc" or "----abc" in the body), so
+    the boundary is matched as "--" plus the token without its dashes.
+    Without a boundary, JPEGs are cut at their SOI/EOI markers.
+    """
+    def __init__(self, boundary=None, max_frame_bytes=MAX_FRAME_BYTES):
+        token = (boundary or '').lstrip('-').encode('latin-1')
+        self.delimiter = b'--' + token if token else None
+        self.max_frame_bytes = max_frame_bytes
+        self.parts_skipped = 0  # Resynchronizations on malformed or oversized parts
+        self._buffer = bytearray()
+        self._length = None     # Content-Length of the part whose body we're in
+        self._in_body = False
+
+    def feed(self, data):
+        """Add a chunk; returns the JPEGs completed by it (oldest first)"""
+        self._buffer += data
+        frames = []
+        while True:
+            frame = self._next_marker_frame() if self.delimiter is None else self._next_part()
+            if frame is None:
+                break
+            if frame:
+                frames.append(frame)
+        if len(self._buffer) > self.max_frame_bytes:
+            self._buffer.clear()
+            self._in_body = False
+            self.parts_skipped += 1
+        return frames
+
+    def _next_part(self):
+        buffer = self._buffer
+        if not self._in_body:
+            start = buffer.find(self.delimiter)
+            if start < 0:
+                # Keep a possible partial boundary at the end
+                del buffer[:max(0, len(buffer) - len(self.delimiter))]
+                return None
+            header_end, separator = buffer.find(b'\r\n\r\n', start), 4
+            if header_end < 0:
+                header_end, separator = buffer.find(b'\n\n', start), 2
+                if header_end < 0:
+                    return None
+            self._length = None
+            for line in bytes(buffer[start + len(self.delimiter):header_end]).splitlines():
+                key, _, value = line.partition(b':')
+                if key.strip().lower() == b'content-length':
+                    try:
+                        self._length = int(value.strip())
+                    except ValueError:
+                        pass
+            del buffer[:header_end + separator]
+            self._in_body = True
+
+        if self._length is not None:
+            if len(buffer) < self._length:
+                return None
+            frame = bytes(buffer[:self._length])
+            del buffer[:self._length]
+        else:
+            end = buffer.find(self.delimiter)
+            if end < 0:
+                if not buffer.rstrip(b'\r\n').endswith(EOI):
+                    return None
+                # The JPEG is complete: don't hold it back until the next boundary arrives
+                end = len(buffer)
+            # The part ends with CRLF and the boundary's dashes; a JPEG ends with EOI, never those
+            frame = bytes(buffer[:end]).rstrip(b'-').rstrip(b'\r\n')
+            del buffer[:end]
+        self._in_body = False
+        if not frame.startswith(SOI):
+            # Not a JPEG (or we joined mid-part): skip it
+            self.parts_skipped += 1
+            return b''
+        return frame
+
+    def _next_marker_frame(self):
+        buffer = self._buffer
+        start = buffer.find(SOI)
+        if start < 0:
+            del buffer[:max(0, len(buffer) - 1)]
+            return None
+        end = buffer.find(EOI, start + 2)
+        if end < 0:
+            del buffer[:start]
+            return None
+        frame = bytes(buffer[start:end + 2])
+        del buffer[:end + 2]
+        return frame
+
+
+def jpeg_size(data):
+    """(width, height) from the JPEG's start-of-frame header, without decoding; None if not found"""
+    i = 2
+    length = len(data)
+    while i + 9 <= length:
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1  # Fill byte
+            continue
+        if marker in _SOF_MARKERS:
+            height = (data[i + 5] << 8) | data[i + 6]
+            width = (data[i + 7] << 8) | data[i + 8]
+            return width, height
+        if marker == 0xD8 or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        i += 2 + ((data[i + 2] << 8) | data[i + 3])
+    return None
+
+
+def reduction_factor(size, min_width):
+    """Largest JPEG DCT scale (1, 2, 4 or 8) that keeps the decoded width at or above min_width"""
+    if not min_width or size is None:
+        return 1
+    factor = 1
+    while factor < 8 and size[0] // (factor * 2) >= min_width:
+        factor *= 2
+    return factor
+
+
+def decode_jpeg(data, min_width=0):
+    """
+    Decode a JPEG to BGR, at 1/2, 1/4 or 1/8 scale when the image is wide
+    enough: libjpeg then skips most of the IDCT work, which is most of the
+    decode cost. None if the data doesn't decode.
+    """
+    import cv2
+
+    factor = reduction_factor(jpeg_size(data), min_width)
+    flag = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2,
+            4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}[factor]
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flag)
+
+
+class MJPEGCapture:
+    """
+    MJPEG camera over HTTP, demuxed natively. A background thread splits
+    the multipart body into JPEGs and keeps only the newest one, still
+    compressed; read() decodes that one. JPEGs the consumer never asks for
+    are never decoded (counted in frames_dropped), so a slow detection
+    loop costs no decode work for the frames it skips.
+
+    Offers the interface of LatestFrameReader (read(timeout) returning
+    (ok, frame, timestamp), failed, running, latest_age(), release()) plus
+    isOpened(), so it stands in for both the capture and its reader.
+    """
+    def __init__(self, chunks, content_type=None, min_width=0, close=None, clock=time.time, name='mjpeg-demux'):
+        """
+        Args:
+            chunks: iterable of body chunks (e.g. response.iter_content())
+            content_type: Content-Type of the response (for the boundary)
+            min_width: decode at reduced size while the width stays >= this (0: full size)
+            close: called by release() to close the connection
+            clock: timestamp source for received frames
+        """
+        self.min_width = min_width
+        self.clock = clock
+        self.error = None
+        self.frames_captured = 0
+        self.frames_read = 0
+        self.frames_dropped = 0
+        self.decode_errors = 0
+        self.failed = False
+        self.parser = MJPEGParser(boundary_from_content_type(content_type))
+
+        self._chunks = chunks
+        self._close = close
+        self._cond = threading.Condition()
+        self._jpeg = None
+        self._timestamp = None
+        self._seq = 0
+        self._read_seq = 0
+        self._stopped = False
+        self._thread = None
+        if chunks is not None:
+            self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+            self._thread.start()
+
+    @classmethod
+    def open(cls, url, timeout=15.0, min_width=0, headers=None):
+        """
+        Connect to an HTTP MJPEG camera. Credentials in the URL are tried as
+        basic auth, then as digest auth (Android IP Webcam). Returns a
+        capture; isOpened() is False (and error says why) if it failed.
+        """
+        import requests
+        from requests.auth import HTTPBasicAuth, HTTPDigestAuth
+
+        parsed = urlparse(url)
+        auths = [None]
+        if parsed.username:
+            netloc = parsed.hostname + (f":{parsed.port}" if parsed.port else '')
+            url = urlunparse(parsed._replace(netloc=netloc))
+            credentials = (parsed.username, parsed.password or '')
+            auths = [HTTPBasicAuth(*credentials), HTTPDigestAuth(*credentials)]
+
+        error = None
+        for auth in auths:
+            try:
+                response = requests.get(url, stream=True, timeout=timeout, headers=headers, auth=auth, verify=False)
+            except requests.exceptions.RequestException as e:
+                error = str(e)
+                break
+            if response.status_code == 401:
+                response.close()
+                error = "HTTP 401 (authentication failed)"
+                continue
+            if response.status_code != 200:
+                response.close()
+                error = f"HTTP {response.status_code}"
+                break
+            content_type = response.headers.get('content-type', '')
+            if not is_mjpeg(content_type):
+                response.close()
+                error = f"Not an MJPEG stream ({content_type or 'no content type'})"
+                break
+            return cls(response.iter_content(chunk_size=8192), content_type, min_width=min_width, close=response.close)
+
+        capture = cls(None)
+        capture.error = error
+        capture.failed = True
+        return capture
+
+    def _run(self):
+        try:
+            for chunk in self._chunks:
+                if self._stopped:
+                    return
+                frames = self.parser.feed(chunk)
+                if not frames:
+                    continue
+                timestamp = self.clock()
+                with self._cond:
+                    received = len(frames)
+                    # Unread frames (the previous newest and all but the last of this chunk) are dropped undecoded
+                    self.frames_dropped += received - 1 + (1 if self._seq > self._read_seq else 0)
+                    self._jpeg = frames[-1]
+                    self._timestamp = timestamp
+                    self._seq += 1
+                    self.frames_captured += received
+                    self._cond.notify_all()
+            self.error = "Stream ended"
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            with self._cond:
+                self.failed = True
+                self._cond.notify_all()
+
+    def isOpened(self):
+        return not self.failed and not self._stopped
+
+    @property
+    def running(self):
+        return not self._stopped and not self.failed
+
+    def read(self, timeout=None):
+        """
+        Wait for a JPEG newer than the last one returned and decode it.
+        Returns (ok, frame, timestamp); ok is False on timeout, once the
+        stream has failed (see `failed`) or after release().
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                self._cond.wait_for(lambda: self._seq > self._read_seq or self.failed or self._stopped, remaining)
+                if self._seq <= self._read_seq or self._stopped:
+                    return False, None, None
+                self._read_seq = self._seq
+                jpeg, timestamp = self._jpeg, self._timestamp
+            frame = decode_jpeg(jpeg, self.min_width)
+            if frame is not None:
+                self.frames_read += 1
+                return True, frame, timestamp
+            # Corrupt JPEG: wait for the next one
+            self.decode_errors += 1
+
+    def latest_age(self):
+        """Seconds since the newest JPEG arrived (None before the first one)"""
+        with self._cond:
+            timestamp = self._timestamp
+        return None if timestamp is None else self.clock() - timestamp
+
+    def release(self, timeout=2.0):
+        """Stop the demux thread and close the connection"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._close is not None:
+            try:
+                self._close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,73 @@
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Cheap motion check that runs before YOLO/DeepSort.
+
+    Each frame is shrunk to a tiny blurred grayscale copy and compared with
+    the previous one. Detection only runs while enough pixels change, plus a
+    short hold period afterwards so people who stop at the gate are still
+    classified and tracked.
+    """
+    def __init__(self, sensitivity=0.5, size=(64, 36), pixel_threshold=25, hold_frames=15):
+        """
+        Args:
+            sensitivity: 0-1, higher means less motion is needed to wake detection
+            size: (width, height) of the grayscale copy used for differencing
+            pixel_threshold: grayscale delta (0-255) for a pixel to count as changed
+            hold_frames: frames to keep detecting after the last motion
+        """
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.hold_frames = hold_frames
+        self.sensitivity = sensitivity
+
+        self._previous = None
+        self._hold = 0
+
+        # Counters
+        self.frames_gated = 0
+        self.frames_processed = 0
+
+    @property
+    def sensitivity(self):
+        return self._sensitivity
+
+    @sensitivity.setter
+    def sensitivity(self, value):
+        self._sensitivity = min(max(float(value), 0.0), 1.0)
+        # Fraction of the tiny frame that must change: 5% at sensitivity 0, 0.05% at 1
+        self.min_changed_fraction = 0.05 * (1.0 - self._sensitivity) + 0.0005
+
+    def motion_score(self, frame):
+        """Fraction of pixels that changed since the previous frame (1.0 on the first frame)"""
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        gray = cv2.GaussianBlur(gray, (3, 3), 0)
+
+        previous, self._previous = self._previous, gray
+        if previous is None:
+            return 1.0
+        changed = cv2.absdiff(gray, previous) > self.pixel_threshold
+        return float(np.count_nonzero(changed)) / changed.size
+
+    def check(self, frame):
+        """Return True if detection should run on this frame, and update the counters"""
+        if self.motion_score(frame) >= self.min_changed_fraction:
+            self._hold = self.hold_frames
+        elif self._hold > 0:
+            self._hold -= 1
+        else:
+            self.frames_gated += 1
+            return False
+
+        self.frames_processed += 1
+        return True
+
+    def stats(self):
+        return {
+            'frames_gated': self.frames_gated,
+            'frames_processed': self.frames_processed,
+        }
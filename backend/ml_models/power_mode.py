@@ -0,0 +1,113 @@
+import time
+from datetime import timedelta
+
+# Decode modes
+FULL = 'full'            # Every frame decoded
+LOW_POWER = 'low_power'  # Keyframes only (or another subset, see LOW_POWER_SKIP_FRAME), fewer frames processed
+AUTO = 'auto'            # Low power while idle, full on motion or detections
+
+DECODE_MODES = (AUTO, FULL, LOW_POWER)
+
+
+def _minutes(value):
+    hours, _, minutes = str(value).partition(':')
+    hours, minutes = int(hours), int(minutes or 0)
+    if not (0 <= hours <= 24 and 0 <= minutes < 60) or hours * 60 + minutes > 24 * 60:
+        raise ValueError(f"Invalid time '{value}' (expected HH:MM)")
+    return hours * 60 + minutes
+
+
+def parse_schedule(entries):
+    """
+    Validate a decode schedule: a list of
+    {"start": "HH:MM", "end": "HH:MM", "mode": "full" | "low_power", "days": [0-6]}
+    windows (days optional, Monday = 0; a window ending before it starts runs
+    past midnight and belongs to the day it starts). Returns the windows as
+    (start_minute, end_minute, mode, days) tuples; raises ValueError.
+    """
+    if not entries:
+        return []
+    if not isinstance(entries, list):
+        raise ValueError("A decode schedule is a list of windows")
+    windows = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise ValueError("Each schedule window needs start, end and mode")
+        try:
+            start, end, mode = _minutes(entry['start']), _minutes(entry['end']), entry['mode']
+        except KeyError as e:
+            raise ValueError(f"Schedule window is missing '{e.args[0]}'")
+        if mode not in (FULL, LOW_POWER):
+            raise ValueError(f"Schedule mode must be '{FULL}' or '{LOW_POWER}', not '{mode}'")
+        days = entry.get('days')
+        if days is not None:
+            if not isinstance(days, list) or not all(isinstance(day, int) and 0 <= day <= 6 for day in days):
+                raise ValueError("Schedule days must be a list of weekdays 0-6 (Monday = 0)")
+            days = frozenset(days)
+        windows.append((start, end, mode, days))
+    return windows
+
+
+def scheduled_mode(entries, now):
+    """Mode the schedule forces at datetime `now` (first matching window), or None"""
+    if not entries:
+        return None
+    try:
+        windows = parse_schedule(entries)
+    except ValueError:
+        return None
+    minute = now.hour * 60 + now.minute
+    yesterday = (now - timedelta(days=1)).weekday()
+    for start, end, mode, days in windows:
+        if start <= end:
+            if start <= minute < end and (days is None or now.weekday() in days):
+                return mode
+        elif minute >= start:
+            if days is None or now.weekday() in days:
+                return mode
+        elif minute < end:
+            # Early-morning part of a window that started the evening before
+            if days is None or yesterday in days:
+                return mode
+    return None
+
+
+class DecodeModeController:
+    """
+    Decode mode of one camera. In auto mode the camera drops to low power
+    after idle_after seconds without motion or detections, and goes back to
+    full decode as soon as either shows up; a forced mode (the camera's
+    setting or its schedule) overrides that.
+    """
+    def __init__(self, idle_after=60.0, clock=time.monotonic):
+        """
+        Args:
+            idle_after: seconds without activity before an auto camera goes low power
+            clock: monotonic time source
+        """
+        self.idle_after = idle_after
+        self.clock = clock
+        self.mode = FULL
+        self.switches = 0
+        self._last_activity = clock()
+
+    def activity(self):
+        """Motion or a detection was seen"""
+        self._last_activity = self.clock()
+
+    @property
+    def idle_for(self):
+        return self.clock() - self._last_activity
+
+    def update(self, camera_mode=AUTO, scheduled=None):
+        """Mode to decode in now, given the camera's mode setting and the schedule's mode (if any)"""
+        mode = scheduled or camera_mode
+        if mode not in (FULL, LOW_POWER):
+            mode = LOW_POWER if self.idle_for >= self.idle_after else FULL
+        if mode != self.mode:
+            self.mode = mode
+            self.switches += 1
+            if mode == FULL:
+                # Don't drop straight back to low power when the schedule/setting releases the camera
+                self._last_activity = self.clock()
+        return mode
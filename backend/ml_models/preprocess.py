@@ -0,0 +1,99 @@
+import cv2
+import numpy as np
+
+
+class CoordinateTransform:
+    """
+    Affine mapping (scale + offset per axis) from one frame's pixel
+    coordinates to another's, e.g. from the 416x416 detection crop to the
+    800x450 display frame.
+    """
+    def __init__(self, scale_x=1.0, scale_y=1.0, offset_x=0.0, offset_y=0.0):
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+
+    def map_point(self, x, y):
+        return self.offset_x + x * self.scale_x, self.offset_y + y * self.scale_y
+
+    def map_box(self, x1, y1, x2, y2):
+        """Map an [x1, y1, x2, y2] box and round to integer pixels"""
+        mx1, my1 = self.map_point(x1, y1)
+        mx2, my2 = self.map_point(x2, y2)
+        return int(round(mx1)), int(round(my1)), int(round(mx2)), int(round(my2))
+
+    def inverse(self):
+        return CoordinateTransform(
+            1.0 / self.scale_x, 1.0 / self.scale_y,
+            -self.offset_x / self.scale_x, -self.offset_y / self.scale_y,
+        )
+
+    def __repr__(self):
+        return (f"CoordinateTransform(scale=({self.scale_x:.4f}, {self.scale_y:.4f}), "
+                f"offset=({self.offset_x:.1f}, {self.offset_y:.1f}))")
+
+
+class FramePreprocessor:
+    """
+    Per-camera preprocessing stage with preallocated output buffers.
+
+    The display and detection resizes are written in place (cv2.resize dst=),
+    so a long-running stream does not allocate two new frames per iteration.
+    The returned arrays are reused on the next call: finish with them (draw,
+    encode, run detection) before preparing the next frame.
+    """
+    def __init__(self, display_size=(800, 450), detection_size=(416, 416)):
+        self.display_size = display_size
+        self.detection_size = detection_size
+        self._display_buffer = np.empty((display_size[1], display_size[0], 3), dtype=np.uint8)
+        self._detection_buffer = np.empty((detection_size[1], detection_size[0], 3), dtype=np.uint8)
+
+    def set_detection_size(self, detection_size):
+        """Switch the model input size (reallocates the detection buffer only when it changes)"""
+        if tuple(detection_size) != tuple(self.detection_size):
+            self.detection_size = tuple(detection_size)
+            self._detection_buffer = np.empty((detection_size[1], detection_size[0], 3), dtype=np.uint8)
+
+    def display(self, frame):
+        """Resize the full frame into the display buffer"""
+        return cv2.resize(frame, self.display_size, dst=self._display_buffer)
+
+    def detection(self, frame, rect=None):
+        """
+        Resize frame (or the rect=(x1, y1, x2, y2) crop of it) into the detection
+        buffer. Returns the detection frame and the exact transform from
+        detection coordinates to display coordinates.
+        """
+        frame_h, frame_w = frame.shape[:2]
+        x1, y1, x2, y2 = rect if rect is not None else (0, 0, frame_w, frame_h)
+
+        detection_frame = cv2.resize(frame[y1:y2, x1:x2], self.detection_size, dst=self._detection_buffer)
+        return detection_frame, self.crop_to_display(frame, rect, source_size=self.detection_size)
+
+    def crop_to_display(self, frame, rect=None, source_size=None):
+        """
+        Transform from pixel coordinates of the rect crop of frame (resized to
+        source_size, if given) to display coordinates.
+        """
+        frame_h, frame_w = frame.shape[:2]
+        return crop_transform((frame_w, frame_h), rect, source_size, self.display_size)
+
+
+def crop_transform(frame_size, rect=None, source_size=None, target_size=None):
+    """
+    Transform from pixel coordinates of the rect crop of a frame_size (w, h)
+    frame, resized to source_size, to the full frame resized to target_size.
+    source_size defaults to the crop's own size, target_size to frame_size.
+    """
+    frame_w, frame_h = frame_size
+    x1, y1, x2, y2 = rect if rect is not None else (0, 0, frame_w, frame_h)
+    source_w, source_h = source_size if source_size is not None else (x2 - x1, y2 - y1)
+    target_w, target_h = target_size if target_size is not None else frame_size
+
+    return CoordinateTransform(
+        scale_x=(x2 - x1) / source_w * target_w / frame_w,
+        scale_y=(y2 - y1) / source_h * target_h / frame_h,
+        offset_x=x1 * target_w / frame_w,
+        offset_y=y1 * target_h / frame_h,
+    )
@@ -0,0 +1,139 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def list_calibration_images(image_dir, limit=None):
+    """All gate frames under image_dir (e.g. media/violations/), oldest first"""
+    images = sorted(p for p in Path(image_dir).rglob('*') if p.suffix.lower() in IMAGE_EXTENSIONS)
+    return images[:limit] if limit else images
+
+
+def preprocess(image, frame_size=416, imgsz=416):
+    """
+    Turn a BGR frame into the NCHW float tensor the exported model sees in
+    production: the stream squashes frames to frame_size x frame_size and
+    ultralytics then scales that square to imgsz (the inference size the
+    detector is served at, so calibration sees the same activation ranges).
+    """
+    detection_frame = cv2.resize(image, (frame_size, frame_size))
+    if imgsz != frame_size:
+        detection_frame = cv2.resize(detection_frame, (imgsz, imgsz))
+    rgb = cv2.cvtColor(detection_frame, cv2.COLOR_BGR2RGB)
+    return np.ascontiguousarray(rgb.transpose(2, 0, 1)[None], dtype=np.float32) / 255.0
+
+
+def quantize_onnx_model(fp32_path, int8_path, images, frame_size=416, imgsz=416):
+    """
+    Static INT8 quantization (QDQ, per-channel weights) of an exported ONNX
+    detector, with activation ranges calibrated on the given images.
+    """
+    import onnx
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    input_name = onnx.load(str(fp32_path), load_external_data=False).graph.input[0].name
+
+    class FrameCalibrationReader(CalibrationDataReader):
+        def __init__(self):
+            self._iter = None
+            self.rewind()
+
+        def get_next(self):
+            for path in self._iter:
+                image = cv2.imread(str(path))
+                if image is not None:
+                    return {input_name: preprocess(image, frame_size, imgsz)}
+            return None
+
+        def rewind(self):
+            self._iter = iter(images)
+
+    quantize_static(
+        str(fp32_path),
+        str(int8_path),
+        FrameCalibrationReader(),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+    )
+
+    # Keep the ultralytics metadata (class names, stride, imgsz) so YOLO() can load the result
+    fp32_model = onnx.load(str(fp32_path))
+    int8_model = onnx.load(str(int8_path))
+    del int8_model.metadata_props[:]
+    int8_model.metadata_props.extend(fp32_model.metadata_props)
+    onnx.save(int8_model, str(int8_path))
+    return Path(int8_path)
+
+
+def box_iou(boxes_a, boxes_b):
+    """Pairwise IoU between two sets of [x1, y1, x2, y2] boxes"""
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+    tl = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    br = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    inter = np.clip(br - tl, 0, None).prod(axis=2)
+    area_a = (boxes_a[:, 2:] - boxes_a[:, :2]).prod(axis=1)
+    area_b = (boxes_b[:, 2:] - boxes_b[:, :2]).prod(axis=1)
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def average_precision(predictions, references, cls, iou_threshold=0.5):
+    """
+    All-point interpolated AP for one class.
+
+    predictions: per-image (boxes, scores, classes); references: per-image (boxes, classes).
+    """
+    scored = []
+    total_refs = 0
+    for (p_boxes, p_scores, p_classes), (r_boxes, r_classes) in zip(predictions, references):
+        p_mask = np.asarray(p_classes) == cls
+        r_mask = np.asarray(r_classes) == cls
+        ref_boxes = np.asarray(r_boxes, dtype=np.float32).reshape(-1, 4)[r_mask]
+        total_refs += len(ref_boxes)
+
+        pred_boxes = np.asarray(p_boxes, dtype=np.float32).reshape(-1, 4)[p_mask]
+        pred_scores = np.asarray(p_scores, dtype=np.float32)[p_mask]
+        order = np.argsort(-pred_scores)
+        ious = box_iou(pred_boxes[order], ref_boxes) if len(ref_boxes) else np.zeros((len(order), 0))
+        matched = np.zeros(len(ref_boxes), dtype=bool)
+
+        for i, score in enumerate(pred_scores[order]):
+            hit = False
+            if ious.shape[1]:
+                candidates = np.where((ious[i] >= iou_threshold) & ~matched)[0]
+                if len(candidates):
+                    matched[candidates[np.argmax(ious[i][candidates])]] = True
+                    hit = True
+            scored.append((score, hit))
+
+    if total_refs == 0:
+        return None
+    if not scored:
+        return 0.0
+
+    scored.sort(key=lambda item: -item[0])
+    hits = np.array([hit for _, hit in scored], dtype=np.float32)
+    tp = np.cumsum(hits)
+    fp = np.cumsum(1 - hits)
+    recall = tp / total_refs
+    precision = tp / np.maximum(tp + fp, 1e-9)
+
+    # Precision envelope, integrated over recall
+    recall = np.concatenate(([0.0], recall, [1.0]))
+    precision = np.concatenate(([1.0], precision, [0.0]))
+    precision = np.maximum.accumulate(precision[::-1])[::-1]
+    steps = np.where(recall[1:] != recall[:-1])[0]
+    return float(np.sum((recall[steps + 1] - recall[steps]) * precision[steps + 1]))
+
+
+def mean_average_precision(predictions, references, iou_threshold=0.5):
+    """mAP over all classes that appear in the references (None if there are none)"""
+    classes = sorted({int(c) for _, r_classes in references for c in np.asarray(r_classes).ravel()})
+    aps = [average_precision(predictions, references, cls, iou_threshold) for cls in classes]
+    aps = [ap for ap in aps if ap is not None]
+    return float(np.mean(aps)) if aps else None
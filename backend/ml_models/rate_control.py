@@ -0,0 +1,125 @@
+import math
+import threading
+import time
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+_cpu_lock = threading.Lock()
+_cpu_sample = (0.0, None)  # (sampled_at, percent)
+
+
+def system_cpu_percent(max_age=1.0):
+    """
+    System-wide CPU load (0-100), shared by all cameras and resampled at most
+    once per max_age seconds. Returns None when psutil is not installed.
+    """
+    global _cpu_sample
+
+    if not PSUTIL_AVAILABLE:
+        return None
+
+    with _cpu_lock:
+        sampled_at, percent = _cpu_sample
+        now = time.monotonic()
+        if percent is None or now - sampled_at >= max_age:
+            # interval=None compares against the previous call, so it never blocks
+            percent = psutil.cpu_percent(interval=None)
+            _cpu_sample = (now, percent)
+        return percent
+
+
+class AdaptiveRateController:
+    """
+    Closed-loop controller for how often a camera runs detection.
+
+    Once per adjust_period it compares the camera's frame rate, the measured
+    detection latency and the CPU load, then moves the detection interval
+    (run detection on 1 of every N frames) one step towards the value that
+    hits target_fps. Single steps keep the slowdown smooth under load, and the
+    latency bound keeps detection from ever falling behind the live feed.
+    """
+    def __init__(self, target_fps=8.0, min_interval=1, max_interval=15,
+                 cpu_high=85.0, adjust_period=1.0, smoothing=0.3, cpu_reader=system_cpu_percent,
+                 clock=time.monotonic):
+        self.target_fps = target_fps
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.cpu_high = cpu_high
+        self.adjust_period = adjust_period
+        self.smoothing = smoothing
+        self.cpu_reader = cpu_reader
+        self.clock = clock
+
+        self.interval = min_interval
+        self.frame_fps = None
+        self.latency = None
+        self.cpu = None
+
+        self._frames_since_detection = 0
+        self._window_frames = 0
+        self._window_start = clock()
+
+    def _ema(self, previous, value):
+        return value if previous is None else previous + self.smoothing * (value - previous)
+
+    def on_frame(self):
+        """Count a frame read from the camera (call for every frame, detected or not)"""
+        self._window_frames += 1
+        now = self.clock()
+        elapsed = now - self._window_start
+        if elapsed >= self.adjust_period:
+            self.frame_fps = self._ema(self.frame_fps, self._window_frames / elapsed)
+            self._window_frames = 0
+            self._window_start = now
+            self._adjust()
+
+    def set_interval_bounds(self, min_interval, max_interval):
+        """Change the allowed interval range (equal bounds pin a fixed detection interval)"""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min(max(self.interval, min_interval), max_interval)
+
+    def should_detect(self):
+        """True on the frames where detection should run"""
+        self._frames_since_detection += 1
+        if self._frames_since_detection >= self.interval:
+            self._frames_since_detection = 0
+            return True
+        return False
+
+    def record_latency(self, seconds):
+        """Report how long detection (inference + tracking) took on this frame"""
+        self.latency = self._ema(self.latency, seconds)
+
+    def desired_interval(self):
+        """Interval that meets the FPS budget, keeps up with the feed and backs off on high CPU"""
+        if not self.frame_fps:
+            return self.interval
+
+        desired = self.frame_fps / self.target_fps if self.target_fps > 0 else self.max_interval
+        if self.latency:
+            # Frames that arrive while one detection runs, with 20% headroom
+            desired = max(desired, self.latency * self.frame_fps * 1.2)
+
+        if self.cpu is not None and self.cpu > self.cpu_high:
+            desired = max(desired, self.interval + 1)
+
+        # Small tolerance so measurement noise (e.g. 30.1 FPS) doesn't add a whole frame
+        return min(max(int(math.ceil(desired - 0.05)), self.min_interval), self.max_interval)
+
+    def _adjust(self):
+        self.cpu = self.cpu_reader() if self.cpu_reader else None
+        desired = self.desired_interval()
+        if desired > self.interval:
+            self.interval += 1
+        elif desired < self.interval:
+            self.interval -= 1
+
+    @property
+    def detection_fps(self):
+        """Effective detection rate at the current interval"""
+        return (self.frame_fps or 0.0) / self.interval
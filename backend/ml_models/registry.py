@@ -0,0 +1,146 @@
+import threading
+import time
+from pathlib import Path
+
+ACTIVE_FILE = 'ACTIVE'
+DEFAULT_VERSION = 'default'
+
+
+class ModelRegistry:
+    """
+    Versions of the uniform detector kept under a models/ directory, one
+    ultralytics run directory per version (<models_dir>/<version>/weights/best.pt
+    or <models_dir>/<version>/best.pt), plus the bundled default weights.
+
+    activate() loads and warms up a version in a background thread while
+    streams keep using the current model, then hands the ready model to
+    `swap` (which replaces it between batches). The active version is
+    written to <models_dir>/ACTIVE so a restart comes back on it.
+    """
+    def __init__(self, models_dir, default_weights, load, swap):
+        """
+        Args:
+            models_dir: directory holding one subdirectory per model version
+            default_weights: weights used when no version has been activated
+            load: load(weights_path) -> warmed-up model, run in the background thread
+            swap: swap(model, version) installs the model; called once it is ready
+        """
+        self.models_dir = Path(models_dir)
+        self.default_weights = Path(default_weights)
+        self._load = load
+        self._swap = swap
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self.active_version = self._read_active()
+        self.activated_at = None
+        self.loading_version = None
+        self.last_error = None
+        self.last_swap_ms = None
+
+    def versions(self):
+        """Available versions, newest first, with the weights file each one uses"""
+        found = []
+        if self.models_dir.is_dir():
+            for path in self.models_dir.iterdir():
+                weights = self._find_weights(path)
+                if weights is not None:
+                    found.append({'version': path.name, 'weights': str(weights), 'modified': weights.stat().st_mtime})
+        found.sort(key=lambda v: v['modified'], reverse=True)
+        if self.default_weights.exists():
+            found.append({'version': DEFAULT_VERSION, 'weights': str(self.default_weights),
+                          'modified': self.default_weights.stat().st_mtime})
+        return found
+
+    @staticmethod
+    def _find_weights(path):
+        for candidate in (path / 'weights' / 'best.pt', path / 'best.pt'):
+            if candidate.is_file():
+                return candidate
+        return None
+
+    def weights_for(self, version):
+        if version == DEFAULT_VERSION:
+            return self.default_weights
+        if not version or Path(version).name != version:
+            raise ValueError(f"Invalid model version: {version!r}")
+        weights = self._find_weights(self.models_dir / version)
+        if weights is None:
+            raise FileNotFoundError(f"No weights found for model version '{version}' in {self.models_dir}")
+        return weights
+
+    def active_weights(self):
+        """Weights of the active version (falls back to the default if it has disappeared)"""
+        try:
+            return self.weights_for(self.active_version)
+        except (ValueError, FileNotFoundError):
+            self.active_version = DEFAULT_VERSION
+            return self.default_weights
+
+    def _read_active(self):
+        try:
+            version = (self.models_dir / ACTIVE_FILE).read_text().strip()
+        except OSError:
+            return DEFAULT_VERSION
+        return version or DEFAULT_VERSION
+
+    def _write_active(self, version):
+        try:
+            self.models_dir.mkdir(parents=True, exist_ok=True)
+            (self.models_dir / ACTIVE_FILE).write_text(version + '\n')
+        except OSError as e:
+            print(f"[MODELS] ⚠️ Could not persist active version: {str(e)}", flush=True)
+
+    def select(self, version):
+        """Make `version` active without loading it (for when no model is loaded yet)"""
+        self.weights_for(version)
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                raise RuntimeError(f"Model version '{self.loading_version}' is still loading")
+            self.active_version = version
+            self.activated_at = time.time()
+            self._write_active(version)
+
+    def activate(self, version):
+        """
+        Start loading `version` in the background. Returns the loader thread;
+        raises if the version doesn't exist or another swap is in progress.
+        """
+        weights = self.weights_for(version)
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                raise RuntimeError(f"Model version '{self.loading_version}' is still loading")
+            self.loading_version = version
+            self.last_error = None
+            self._thread = threading.Thread(target=self._activate, args=(version, weights),
+                                            name='model-hot-swap', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def _activate(self, version, weights):
+        started = time.perf_counter()
+        try:
+            print(f"[MODELS] Loading version '{version}' from {weights}...", flush=True)
+            model = self._load(weights)
+            self._swap(model, version)
+            self.last_swap_ms = round((time.perf_counter() - started) * 1000.0, 1)
+            self.active_version = version
+            self.activated_at = time.time()
+            self._write_active(version)
+            print(f"[MODELS] ✅ Version '{version}' is now active ({self.last_swap_ms:.0f} ms)", flush=True)
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"[MODELS] ❌ Hot swap to '{version}' failed, keeping '{self.active_version}': {str(e)}", flush=True)
+        finally:
+            self.loading_version = None
+
+    def status(self):
+        return {
+            'active_version': self.active_version,
+            'active_weights': str(self.active_weights()),
+            'activated_at': self.activated_at,
+            'loading_version': self.loading_version,
+            'last_error': self.last_error,
+            'last_swap_ms': self.last_swap_ms,
+            'versions': [{'version': v['version'], 'modified': v['modified']} for v in self.versions()],
+        }
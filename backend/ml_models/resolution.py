@@ -0,0 +1,108 @@
+import time
+
+import numpy as np
+
+INPUT_SIZES = (320, 416, 512, 640)
+
+
+class ResolutionTuner:
+    """
+    Picks the smallest model input size that still finds the people a camera sees.
+
+    While sampling, the camera runs at the largest size and the tuner records
+    each detection's height (as a fraction of the input) and confidence. A
+    person stays detectable at size s while its box is at least min_box_px
+    tall there, so the estimated recall at s is the share of confident
+    samples that clear that bar. The smallest size whose recall meets
+    target_recall wins. Sampling repeats every retune_interval seconds,
+    because traffic and lighting change over the day.
+    """
+    def __init__(self, sizes=INPUT_SIZES, target_recall=0.95, min_box_px=32, min_confidence=0.5,
+                 min_samples=40, max_sample_frames=600, retune_interval=1800.0,
+                 initial_size=None, tuned_at=None, clock=time.time):
+        """
+        Args:
+            sizes: candidate input sizes, any order
+            target_recall: share of sampled people that must stay detectable
+            min_box_px: box height (pixels at the model input) below which a person counts as missed
+            min_confidence: detections below this confidence are not sampled
+            min_samples: detections needed before deciding
+            max_sample_frames: give up sampling after this many frames (keeps the current size)
+            retune_interval: seconds between sampling rounds
+            initial_size / tuned_at: stored result of the previous tuning (epoch seconds)
+        """
+        self.sizes = sorted(sizes)
+        self.target_recall = target_recall
+        self.min_box_px = min_box_px
+        self.min_confidence = min_confidence
+        self.min_samples = min_samples
+        self.max_sample_frames = max_sample_frames
+        self.retune_interval = retune_interval
+        self.clock = clock
+
+        self.tuned_size = initial_size if initial_size in self.sizes else self.sizes[-1]
+        self.tuned_at = tuned_at
+        self.recall = {}
+        self._heights = []
+        self._sample_frames = 0
+        self.sampling = tuned_at is None or clock() - tuned_at >= retune_interval
+
+    @property
+    def input_size(self):
+        """Size to run detection at right now"""
+        return self.sizes[-1] if self.sampling else self.tuned_size
+
+    def record(self, boxes, input_size):
+        """
+        Feed the Nx6 [x1, y1, x2, y2, conf, cls] detections of one frame run at
+        input_size. Returns the tuned size when a sampling round ends, else
+        None. A round that saw too few people to decide returns the size it
+        keeps (with an empty `recall`), so callers store that round too.
+        """
+        if not self.sampling:
+            if self.clock() - self.tuned_at >= self.retune_interval:
+                self._start_sampling()
+            return None
+
+        if input_size != self.sizes[-1]:
+            # Frame was prepared before sampling started: its boxes aren't comparable
+            return None
+
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 6)
+        confident = boxes[boxes[:, 4] >= self.min_confidence]
+        self._heights.extend(((confident[:, 3] - confident[:, 1]) / input_size).tolist())
+        self._sample_frames += 1
+
+        if len(self._heights) >= self.min_samples:
+            return self._decide()
+        if self._sample_frames >= self.max_sample_frames:
+            # Too few people to judge: keep the current size and try again next round
+            self.recall = {}
+            self._finish(self.tuned_size)
+            return self.tuned_size
+        return None
+
+    def estimate_recall(self, size, heights=None):
+        """Share of sampled people whose box would be at least min_box_px tall at this input size"""
+        heights = np.asarray(self._heights if heights is None else heights)
+        if len(heights) == 0:
+            return 1.0
+        return float(np.count_nonzero(heights * size >= self.min_box_px)) / len(heights)
+
+    def _decide(self):
+        self.recall = {size: round(self.estimate_recall(size), 3) for size in self.sizes}
+        chosen = next((size for size in self.sizes if self.recall[size] >= self.target_recall), self.sizes[-1])
+        self._finish(chosen)
+        return chosen
+
+    def _finish(self, size):
+        self.tuned_size = size
+        self.tuned_at = self.clock()
+        self.sampling = False
+        self._heights = []
+        self._sample_frames = 0
+
+    def _start_sampling(self):
+        self.sampling = True
+        self._heights = []
+        self._sample_frames = 0
@@ -0,0 +1,49 @@
+import numpy as np
+
+
+class RegionOfInterest:
+    """
+    Polygon region of interest in normalized (0-1) frame coordinates.
+
+    Detection crops the frame to the polygon's bounding rectangle before
+    resizing to the model input, and detections/tracks whose centroid falls
+    outside the polygon are dropped.
+    """
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(self.points) < 3:
+            raise ValueError("A region of interest needs at least 3 points")
+        if self.points.min() < 0.0 or self.points.max() > 1.0:
+            raise ValueError("Region of interest points must be normalized to 0-1")
+
+    @classmethod
+    def from_points(cls, points):
+        """ROI from a stored polygon, or None if the camera has no (valid) ROI"""
+        if not points:
+            return None
+        try:
+            return cls(points)
+        except (TypeError, ValueError):
+            return None
+
+    def bounding_rect(self, width, height):
+        """Pixel bounding rectangle (x1, y1, x2, y2) of the polygon in a width x height frame"""
+        x1 = int(np.floor(self.points[:, 0].min() * width))
+        y1 = int(np.floor(self.points[:, 1].min() * height))
+        x2 = int(np.ceil(self.points[:, 0].max() * width))
+        y2 = int(np.ceil(self.points[:, 1].max() * height))
+        # Always keep at least one pixel so the crop can be resized
+        return x1, y1, max(x2, x1 + 1), max(y2, y1 + 1)
+
+    def contains(self, x, y):
+        """Whether a normalized point lies inside the polygon (ray casting)"""
+        inside = False
+        xs, ys = self.points[:, 0], self.points[:, 1]
+        j = len(self.points) - 1
+        for i in range(len(self.points)):
+            if (ys[i] > y) != (ys[j] > y):
+                x_cross = xs[i] + (y - ys[i]) * (xs[j] - xs[i]) / (ys[j] - ys[i])
+                if x < x_cross:
+                    inside = not inside
+            j = i
+        return inside
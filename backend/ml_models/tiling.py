@@ -0,0 +1,141 @@
+import math
+
+import cv2
+import numpy as np
+
+
+def choose_grid(width, height, tile_size=416, max_scale=3.0, max_tiles=8):
+    """
+    Tiling grid (cols, rows) for a width x height frame: enough tiles that
+    each one is downscaled at most max_scale times to reach tile_size, capped
+    at max_tiles. Frames that already fit return (1, 1).
+    """
+    tile_source = tile_size * max_scale
+    cols = max(1, math.ceil(width / tile_source))
+    rows = max(1, math.ceil(height / tile_source))
+
+    # Over budget: drop tiles along the axis whose tiles are currently smallest
+    while cols * rows > max(1, max_tiles):
+        if width / cols <= height / rows and cols > 1:
+            cols -= 1
+        elif rows > 1:
+            rows -= 1
+        else:
+            cols -= 1
+    return cols, rows
+
+
+def tile_rects(width, height, cols, rows, overlap=0.2):
+    """
+    Pixel rectangles (x1, y1, x2, y2) of a cols x rows grid over a width x
+    height frame, each tile grown by overlap (fraction of the tile size) so
+    a person cut by one tile border is whole in the neighbouring tile.
+    """
+    tile_w = width / cols
+    tile_h = height / rows
+    pad_x = tile_w * overlap / 2.0
+    pad_y = tile_h * overlap / 2.0
+
+    rects = []
+    for row in range(rows):
+        for col in range(cols):
+            x1 = max(0, int(math.floor(col * tile_w - pad_x)))
+            y1 = max(0, int(math.floor(row * tile_h - pad_y)))
+            x2 = min(width, int(math.ceil((col + 1) * tile_w + pad_x)))
+            y2 = min(height, int(math.ceil((row + 1) * tile_h + pad_y)))
+            rects.append((x1, y1, x2, y2))
+    return rects
+
+
+def merge_detections(boxes, iou_threshold=0.5, ios_threshold=0.8):
+    """
+    Class-aware NMS over Nx6 [x1, y1, x2, y2, conf, cls] boxes gathered from
+    overlapping tiles. Besides IoU, a box mostly contained in a stronger box
+    of the same class (intersection over the smaller area) is dropped: that
+    is the partial body a tile border cut off.
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 6)
+    if len(boxes) == 0:
+        return boxes
+
+    order = np.argsort(-boxes[:, 4])
+    boxes = boxes[order]
+    areas = np.maximum(boxes[:, 2] - boxes[:, 0], 0) * np.maximum(boxes[:, 3] - boxes[:, 1], 0)
+    keep = []
+    suppressed = np.zeros(len(boxes), dtype=bool)
+
+    for i in range(len(boxes)):
+        if suppressed[i]:
+            continue
+        keep.append(i)
+
+        rest = np.arange(i + 1, len(boxes))
+        rest = rest[~suppressed[rest] & (boxes[rest, 5] == boxes[i, 5])]
+        if len(rest) == 0:
+            continue
+
+        iw = np.clip(np.minimum(boxes[i, 2], boxes[rest, 2]) - np.maximum(boxes[i, 0], boxes[rest, 0]), 0, None)
+        ih = np.clip(np.minimum(boxes[i, 3], boxes[rest, 3]) - np.maximum(boxes[i, 1], boxes[rest, 1]), 0, None)
+        inter = iw * ih
+        iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-9)
+        ios = inter / np.maximum(np.minimum(areas[i], areas[rest]), 1e-9)
+        suppressed[rest[(iou > iou_threshold) | (ios > ios_threshold)]] = True
+
+    return boxes[keep]
+
+
+class FrameTiler:
+    """
+    Splits a high-resolution frame (or a crop of it) into overlapping tiles
+    at the model input size, so distant people keep enough pixels to be
+    detected without running the whole frame at a large input size.
+
+    Tile buffers are preallocated and reused like FramePreprocessor's: run
+    the tiles through the model before tiling the next frame. The grid is
+    recomputed only when the frame size changes.
+    """
+    def __init__(self, tile_size=(416, 416), overlap=0.2, max_scale=3.0, max_tiles=8):
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.max_scale = max_scale
+        self.max_tiles = max(1, int(max_tiles))
+        self.grid = (1, 1)
+        self._rects = []
+        self._source_size = None
+        self._buffers = np.empty((self.max_tiles, tile_size[1], tile_size[0], 3), dtype=np.uint8)
+
+    def _update_grid(self, width, height):
+        if self._source_size == (width, height):
+            return
+        self._source_size = (width, height)
+        self.grid = choose_grid(width, height, min(self.tile_size), self.max_scale, self.max_tiles)
+        self._rects = tile_rects(width, height, *self.grid, overlap=self.overlap)
+
+    def tile(self, frame, rect=None):
+        """
+        Tiles of frame (or its rect=(x1, y1, x2, y2) crop) resized to tile_size.
+        Returns the tile list and the crop it covers, whose pixel coordinates
+        merge() maps detections into.
+        """
+        frame_h, frame_w = frame.shape[:2]
+        x1, y1, x2, y2 = rect if rect is not None else (0, 0, frame_w, frame_h)
+        crop = frame[y1:y2, x1:x2]
+        self._update_grid(x2 - x1, y2 - y1)
+
+        tiles = []
+        for i, (tx1, ty1, tx2, ty2) in enumerate(self._rects):
+            tiles.append(cv2.resize(crop[ty1:ty2, tx1:tx2], self.tile_size, dst=self._buffers[i]))
+        return tiles, crop
+
+    def merge(self, results, iou_threshold=0.5, ios_threshold=0.8):
+        """Map per-tile Nx6 detections into crop coordinates and merge duplicates"""
+        tile_w, tile_h = self.tile_size
+        merged = []
+        for (tx1, ty1, tx2, ty2), boxes in zip(self._rects, results):
+            boxes = np.array(boxes, dtype=np.float32).reshape(-1, 6)
+            boxes[:, [0, 2]] = boxes[:, [0, 2]] * ((tx2 - tx1) / tile_w) + tx1
+            boxes[:, [1, 3]] = boxes[:, [1, 3]] * ((ty2 - ty1) / tile_h) + ty1
+            merged.append(boxes)
+        if not merged:
+            return np.zeros((0, 6), dtype=np.float32)
+        return merge_detections(np.concatenate(merged), iou_threshold, ios_threshold)
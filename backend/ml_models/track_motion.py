@@ -0,0 +1,57 @@
+import numpy as np
+
+
+def predicted_ltrb(track, steps):
+    """
+    [left, top, right, bottom] of a DeepSort track extrapolated `steps`
+    (possibly fractional) Kalman steps past its last update, using the
+    track's constant-velocity state. The tracker itself is not modified.
+    """
+    mean = getattr(track, 'mean', None)
+    if mean is None:
+        return track.to_ltrb()
+
+    # State: [x, y, a, h, vx, vy, va, vh] (centre, aspect ratio, height)
+    mean = np.asarray(mean, dtype=np.float64).reshape(-1)
+    x, y, a, h = mean[:4] + mean[4:8] * steps
+    h = max(h, 1.0)
+    w = max(a, 0.0) * h
+    return x - w / 2, y - h / 2, x + w / 2, y + h / 2
+
+
+class TrackExtrapolator:
+    """
+    Keeps track boxes moving on frames where detection is skipped.
+
+    DeepSort advances its Kalman filters once per detection, so its velocity
+    is per detection step. k frames after a detection at interval N a track
+    has moved k/N of a step; the box is extrapolated by that much, capped at
+    max_steps so a stalled detector doesn't send boxes flying off.
+    """
+    def __init__(self, max_steps=1.5):
+        self.max_steps = max_steps
+        self._entries = []
+        self._interval = 1
+        self._frames = 0
+
+    @property
+    def active(self):
+        return bool(self._entries)
+
+    def reset(self, entries, interval):
+        """
+        Start from a detection frame. entries is a list of (track, payload),
+        where payload is whatever the caller needs to draw the track again.
+        """
+        self._entries = list(entries)
+        self._interval = max(1, int(interval))
+        self._frames = 0
+
+    def clear(self):
+        self._entries = []
+
+    def advance(self):
+        """Move to the next (skipped) frame; returns [(ltrb, payload), ...]"""
+        self._frames += 1
+        steps = min(self._frames / self._interval, self.max_steps)
+        return [(predicted_ltrb(track, steps), payload) for track, payload in self._entries]
@@ -0,0 +1,238 @@
+import multiprocessing
+import queue
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def _worker_main(conn, shm_name, max_batch, frame_shape, weights_path, backend, precision, compile_mode, cores, predict_kwargs,
+                 loader=None):
+    """
+    Inference worker process: owns its own model, reads frames from its shared
+    memory block and sends Nx6 box arrays ([x1, y1, x2, y2, conf, cls]) back over the pipe.
+    frame_shape is the largest frame the block holds; each request says which
+    shape its frames actually have.
+    """
+    if cores:
+        # Pin before the model loads so every inference thread stays on this worker's cores
+        from ml_models.cpu_budget import limit_library_threads, pin_current_thread
+        pin_current_thread(cores)
+        limit_library_threads(len(cores))
+
+    from ml_models.backends import boxes_to_array, load_detector
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = None
+    try:
+        try:
+            model = (loader or load_detector)(weights_path, backend=backend, precision=precision, compile_mode=compile_mode)
+            # Warm up before reporting ready
+            model(np.zeros(frame_shape, dtype=np.uint8), verbose=False)
+        except Exception as e:
+            conn.send(('error', str(e)))
+            return
+        conn.send(('ready', dict(model.names)))
+
+        while True:
+            request = conn.recv()
+            if request is None:
+                break
+            count, shape, call_kwargs = request
+            try:
+                frames = np.ndarray((count,) + tuple(shape), dtype=np.uint8, buffer=shm.buf)
+                results = model([frames[i] for i in range(count)], **{**predict_kwargs, **call_kwargs})
+                conn.send(('ok', [boxes_to_array(r) for r in results]))
+            except Exception as e:
+                conn.send(('error', str(e)))
+            finally:
+                frames = None
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        frames = None  # release the buffer view before closing the block
+        shm.close()
+
+
+class _Worker:
+    """One worker process and its shared memory block; the process can be restarted on the same block"""
+    def __init__(self, ctx, index, max_batch, frame_shape, worker_args):
+        self.ctx = ctx
+        self.index = index
+        self.frames_capacity = max_batch
+        nbytes = max_batch * int(np.prod(frame_shape))
+        self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.conn = None
+        self.process = None
+        self._args = (max_batch, frame_shape) + tuple(worker_args)
+        self.start()
+
+    def start(self):
+        self.conn, child_conn = self.ctx.Pipe()
+        self.process = self.ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.shm.name) + self._args,
+            name=f"inference-worker-{self.index}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def wait_ready(self, timeout=None):
+        """Class names once the model is loaded; raises RuntimeError if the worker failed to start"""
+        try:
+            if timeout is not None and not self.conn.poll(timeout):
+                raise RuntimeError(f"Inference worker {self.index} did not start within {timeout:.0f}s")
+            kind, payload = self.conn.recv()
+        except (EOFError, OSError):
+            raise RuntimeError(f"Inference worker {self.index} exited while starting (exit code {self.process.exitcode})")
+        if kind != 'ready':
+            raise RuntimeError(f"Inference worker {self.index} failed to start: {payload}")
+        return payload
+
+    def kill(self):
+        """Stop a dead or hung process for good (it may still be using the block)"""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+        self.shm.close()
+        self.shm.unlink()
+
+
+class InferenceWorkerPool:
+    """
+    Pool of inference processes, each holding its own model, so pre/post-
+    processing and inference run outside the Django process's GIL.
+
+    Frames are copied once into the chosen worker's shared memory block;
+    only the batch size goes down the pipe and only small box arrays come back.
+    Calling the pool like a model (pool(frames, **predict_kwargs)) blocks
+    until an idle worker has processed the batch, so it can stand in for the
+    YOLO model behind the batch scheduler. Thread-safe: concurrent callers use
+    different workers. frame_shape is the largest frame size accepted; all
+    frames of one call must share a shape.
+
+    A worker that dies (OOM, crash in the runtime) or doesn't answer within
+    `timeout` seconds fails its batch and is restarted; one that can't be
+    restarted leaves the pool, and calls fail once no worker is left.
+
+    core_sets optionally gives each worker its own CPU ids (see
+    ml_models/cpu_budget.py); the worker pins itself and sizes its thread
+    pools to match. loader replaces load_detector in the workers (a
+    module-level function with the same signature).
+    """
+    def __init__(self, weights_path, num_workers=2, backend='torch', precision='fp32', compile_mode='none',
+                 max_batch=8, frame_shape=(640, 640, 3), core_sets=None, timeout=30.0, start_timeout=300.0,
+                 loader=None, **predict_kwargs):
+        self.num_workers = max(1, int(num_workers))
+        self.max_batch = max(1, int(max_batch))
+        self.frame_shape = tuple(frame_shape)
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.names = {}
+        self.restarts = 0
+
+        from ml_models.backends import BACKENDS, export_weights
+        if loader is None and BACKENDS.get(backend) and precision != 'int8':
+            # Export here, once: workers starting together would each find no artifact and export it
+            export_weights(weights_path, backend)
+
+        # spawn: never fork a process that already holds torch/OpenCV threads
+        ctx = multiprocessing.get_context('spawn')
+        self._lock = threading.Lock()
+        self._workers = [
+            _Worker(ctx, i, self.max_batch, self.frame_shape,
+                    (str(weights_path), backend, precision, compile_mode,
+                     list(core_sets[i % len(core_sets)]) if core_sets else None, predict_kwargs, loader))
+            for i in range(self.num_workers)
+        ]
+        self._idle = queue.Queue()
+
+        try:
+            for worker in self._workers:
+                self.names = worker.wait_ready(start_timeout)
+                self._idle.put(worker)
+        except Exception:
+            self.close()
+            raise
+
+    def __call__(self, frames, **kwargs):
+        """Run a batch (list of same-shape uint8 arrays) on the next idle worker"""
+        if len(frames) > self.max_batch:
+            raise ValueError(f"Batch of {len(frames)} exceeds worker capacity {self.max_batch}")
+        if not frames:
+            return []
+        shape = frames[0].shape
+        if any(frame.shape != shape for frame in frames):
+            raise ValueError("All frames of a batch must have the same shape")
+        if np.prod(shape) > np.prod(self.frame_shape):
+            raise ValueError(f"Frame shape {shape} exceeds pool frame shape {self.frame_shape}")
+
+        worker = self._idle.get()
+        if worker is None:
+            self._idle.put(None)  # Wake the next caller too
+            raise RuntimeError("No inference workers left: every worker died and could not be restarted")
+        try:
+            if not worker.process.is_alive():
+                raise EOFError("process exited")
+            batch = np.ndarray((len(frames),) + shape, dtype=np.uint8, buffer=worker.shm.buf)
+            for i, frame in enumerate(frames):
+                np.copyto(batch[i], frame)
+            del batch
+            worker.conn.send((len(frames), shape, kwargs))
+            if self.timeout is not None and not worker.conn.poll(self.timeout):
+                raise TimeoutError(f"no reply within {self.timeout:.0f}s")
+            kind, payload = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            # Dead or hung: never hand this process out again
+            reason = str(e) or 'process exited'
+            self._restart(worker, reason)
+            raise RuntimeError(f"Inference worker {worker.index} lost ({reason}); batch dropped") from e
+        except BaseException:
+            self._idle.put(worker)
+            raise
+        self._idle.put(worker)
+
+        if kind != 'ok':
+            raise RuntimeError(f"Inference worker {worker.index} error: {payload}")
+        return payload
+
+    def _restart(self, worker, reason):
+        """Replace a lost worker's process and put it back in rotation, or drop it if it can't start"""
+        print(f"[YOLO] ⚠️ Inference worker {worker.index} lost ({reason}, exit code {worker.process.exitcode}), "
+              f"restarting...", flush=True)
+        worker.kill()
+        try:
+            worker.start()
+            worker.wait_ready(self.start_timeout)
+        except Exception as e:
+            print(f"[YOLO] ❌ Inference worker {worker.index} could not be restarted: {str(e)}", flush=True)
+            worker.kill()
+            worker.shm.close()
+            worker.shm.unlink()
+            with self._lock:
+                self._workers.remove(worker)
+                if not self._workers:
+                    self._idle.put(None)
+            return
+        with self._lock:
+            self.restarts += 1
+        print(f"[YOLO] ✅ Inference worker {worker.index} restarted", flush=True)
+        self._idle.put(worker)
+
+    def close(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()